@@ -25,7 +25,13 @@ You are encouraged to write your own algorithms in order to make them do what
 you really want them to do.
 """
 
+import Queue
 import random
+import time
+
+from collections import deque
+
+import numpy
 
 import tools
 
@@ -82,8 +88,21 @@ def varAnd(population, toolbox, cxpb, mutpb):
     return offspring
 
 
+def _evaluate(toolbox, individuals, cache=None):
+    """Evaluate the *individuals* with :meth:`toolbox.evaluate` through
+    :meth:`toolbox.map`, or through the *cache* if one is given. Returns the
+    fitness values and the cache counters to record in the logbook.
+    """
+    if cache is None:
+        return toolbox.map(toolbox.evaluate, individuals), {}
+    hits, misses = cache.hits, cache.misses
+    fitnesses = cache.map(toolbox.map, toolbox.evaluate, individuals)
+    return fitnesses, dict(hits=cache.hits - hits, misses=cache.misses - misses)
+
+
 def eaSimple(population, toolbox, cxpb, mutpb, ngen, stats=None,
-             halloffame=None, verbose=__debug__):
+             halloffame=None, verbose=__debug__, cache=None,
+             checkpoint=None):
     """This algorithm reproduce the simplest evolutionary algorithm as
     presented in chapter 7 of [Back2000]_.
 
@@ -98,6 +117,10 @@ def eaSimple(population, toolbox, cxpb, mutpb, ngen, stats=None,
     :param halloffame: A :class:`~deap.tools.HallOfFame` object that will
                        contain the best individuals, optional.
     :param verbose: Whether or not to log the statistics.
+    :param cache: A :class:`~deap.tools.EvaluationCache` object that provides
+                  the fitness of already evaluated genotypes, optional.
+    :param checkpoint: A :class:`~deap.tools.Checkpoint` object used to save
+                       the evolution periodically and to resume it, optional.
     :returns: The final population
     :returns: A class:`~deap.tools.Logbook` with the statistics of the
               evolution
@@ -143,24 +166,39 @@ def eaSimple(population, toolbox, cxpb, mutpb, ngen, stats=None,
        Basic Algorithms and Operators", 2000.
     """
     logbook = tools.Logbook()
-    logbook.header = ['gen', 'nevals'] + (stats.fields if stats else [])
+    logbook.header = ['gen', 'nevals'] + (['hits', 'misses'] if cache is not None else []) + \
+        (stats.fields if stats else [])
 
-    # Evaluate the individuals with an invalid fitness
-    invalid_ind = [ind for ind in population if not ind.fitness.valid]
-    fitnesses = toolbox.map(toolbox.evaluate, invalid_ind)
-    for ind, fit in zip(invalid_ind, fitnesses):
-        ind.fitness.values = fit
+    # Resume the evolution from the last checkpoint, if any
+    state = None
+    if checkpoint is not None:
+        state = checkpoint.restore(halloffame=halloffame, cache=cache)
 
-    if halloffame is not None:
-        halloffame.update(population)
+    if state is None:
+        # Evaluate the individuals with an invalid fitness
+        invalid_ind = [ind for ind in population if not ind.fitness.valid]
+        fitnesses, counters = _evaluate(toolbox, invalid_ind, cache)
+        for ind, fit in zip(invalid_ind, fitnesses):
+            ind.fitness.values = fit
 
-    record = stats.compile(population) if stats else {}
-    logbook.record(gen=0, nevals=len(invalid_ind), **record)
-    if verbose:
-        print logbook.stream
+        if halloffame is not None:
+            halloffame.update(population)
+
+        record = stats.compile(population) if stats else {}
+        record.update(counters)
+        logbook.record(gen=0, nevals=len(invalid_ind), **record)
+        if verbose:
+            print logbook.stream
+        if checkpoint is not None:
+            checkpoint.update(0, population, logbook, halloffame=halloffame, cache=cache)
+        start_gen = 1
+    else:
+        population[:] = state["population"]
+        logbook = state["logbook"]
+        start_gen = state["generation"] + 1
 
     # Begin the generational process
-    for gen in range(1, ngen + 1):
+    for gen in range(start_gen, ngen + 1):
         # Select the next generation individuals
         offspring = toolbox.select(population, len(population))
 
@@ -169,7 +207,7 @@ def eaSimple(population, toolbox, cxpb, mutpb, ngen, stats=None,
 
         # Evaluate the individuals with an invalid fitness
         invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
-        fitnesses = toolbox.map(toolbox.evaluate, invalid_ind)
+        fitnesses, counters = _evaluate(toolbox, invalid_ind, cache)
         for ind, fit in zip(invalid_ind, fitnesses):
             ind.fitness.values = fit
 
@@ -182,10 +220,14 @@ def eaSimple(population, toolbox, cxpb, mutpb, ngen, stats=None,
 
         # Append the current generation statistics to the logbook
         record = stats.compile(population) if stats else {}
+        record.update(counters)
         logbook.record(gen=gen, nevals=len(invalid_ind), **record)
         if verbose:
             print logbook.stream
 
+        if checkpoint is not None:
+            checkpoint.update(gen, population, logbook, halloffame=halloffame, cache=cache)
+
     return population, logbook
 
 
@@ -246,7 +288,8 @@ def varOr(population, toolbox, lambda_, cxpb, mutpb):
 
 
 def eaMuPlusLambda(population, toolbox, mu, lambda_, cxpb, mutpb, ngen,
-                   stats=None, halloffame=None, verbose=__debug__):
+                   stats=None, halloffame=None, verbose=__debug__, cache=None,
+                   checkpoint=None):
     """This is the :math:`(\mu + \lambda)` evolutionary algorithm.
 
     :param population: A list of individuals.
@@ -262,6 +305,10 @@ def eaMuPlusLambda(population, toolbox, mu, lambda_, cxpb, mutpb, ngen,
     :param halloffame: A :class:`~deap.tools.HallOfFame` object that will
                        contain the best individuals, optional.
     :param verbose: Whether or not to log the statistics.
+    :param cache: A :class:`~deap.tools.EvaluationCache` object that provides
+                  the fitness of already evaluated genotypes, optional.
+    :param checkpoint: A :class:`~deap.tools.Checkpoint` object used to save
+                       the evolution periodically and to resume it, optional.
     :returns: The final population
     :returns: A class:`~deap.tools.Logbook` with the statistics of the
               evolution.
@@ -294,30 +341,45 @@ def eaMuPlusLambda(population, toolbox, mu, lambda_, cxpb, mutpb, ngen,
     variation.
     """
     logbook = tools.Logbook()
-    logbook.header = ['gen', 'nevals'] + (stats.fields if stats else [])
+    logbook.header = ['gen', 'nevals'] + (['hits', 'misses'] if cache is not None else []) + \
+        (stats.fields if stats else [])
 
-    # Evaluate the individuals with an invalid fitness
-    invalid_ind = [ind for ind in population if not ind.fitness.valid]
-    fitnesses = toolbox.map(toolbox.evaluate, invalid_ind)
-    for ind, fit in zip(invalid_ind, fitnesses):
-        ind.fitness.values = fit
+    # Resume the evolution from the last checkpoint, if any
+    state = None
+    if checkpoint is not None:
+        state = checkpoint.restore(halloffame=halloffame, cache=cache)
 
-    if halloffame is not None:
-        halloffame.update(population)
+    if state is None:
+        # Evaluate the individuals with an invalid fitness
+        invalid_ind = [ind for ind in population if not ind.fitness.valid]
+        fitnesses, counters = _evaluate(toolbox, invalid_ind, cache)
+        for ind, fit in zip(invalid_ind, fitnesses):
+            ind.fitness.values = fit
 
-    record = stats.compile(population) if stats is not None else {}
-    logbook.record(gen=0, nevals=len(invalid_ind), **record)
-    if verbose:
-        print logbook.stream
+        if halloffame is not None:
+            halloffame.update(population)
+
+        record = stats.compile(population) if stats is not None else {}
+        record.update(counters)
+        logbook.record(gen=0, nevals=len(invalid_ind), **record)
+        if verbose:
+            print logbook.stream
+        if checkpoint is not None:
+            checkpoint.update(0, population, logbook, halloffame=halloffame, cache=cache)
+        start_gen = 1
+    else:
+        population[:] = state["population"]
+        logbook = state["logbook"]
+        start_gen = state["generation"] + 1
 
     # Begin the generational process
-    for gen in range(1, ngen + 1):
+    for gen in range(start_gen, ngen + 1):
         # Vary the population
         offspring = varOr(population, toolbox, lambda_, cxpb, mutpb)
 
         # Evaluate the individuals with an invalid fitness
         invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
-        fitnesses = toolbox.map(toolbox.evaluate, invalid_ind)
+        fitnesses, counters = _evaluate(toolbox, invalid_ind, cache)
         for ind, fit in zip(invalid_ind, fitnesses):
             ind.fitness.values = fit
 
@@ -330,15 +392,20 @@ def eaMuPlusLambda(population, toolbox, mu, lambda_, cxpb, mutpb, ngen,
 
         # Update the statistics with the new population
         record = stats.compile(population) if stats is not None else {}
+        record.update(counters)
         logbook.record(gen=gen, nevals=len(invalid_ind), **record)
         if verbose:
             print logbook.stream
 
+        if checkpoint is not None:
+            checkpoint.update(gen, population, logbook, halloffame=halloffame, cache=cache)
+
     return population, logbook
 
 
 def eaMuCommaLambda(population, toolbox, mu, lambda_, cxpb, mutpb, ngen,
-                    stats=None, halloffame=None, verbose=__debug__):
+                    stats=None, halloffame=None, verbose=__debug__, cache=None,
+                    checkpoint=None):
     """This is the :math:`(\mu~,~\lambda)` evolutionary algorithm.
 
     :param population: A list of individuals.
@@ -354,6 +421,10 @@ def eaMuCommaLambda(population, toolbox, mu, lambda_, cxpb, mutpb, ngen,
     :param halloffame: A :class:`~deap.tools.HallOfFame` object that will
                        contain the best individuals, optional.
     :param verbose: Whether or not to log the statistics.
+    :param cache: A :class:`~deap.tools.EvaluationCache` object that provides
+                  the fitness of already evaluated genotypes, optional.
+    :param checkpoint: A :class:`~deap.tools.Checkpoint` object used to save
+                       the evolution periodically and to resume it, optional.
     :returns: The final population
     :returns: A class:`~deap.tools.Logbook` with the statistics of the
               evolution
@@ -394,31 +465,46 @@ def eaMuCommaLambda(population, toolbox, mu, lambda_, cxpb, mutpb, ngen,
     """
     assert lambda_ >= mu, "lambda must be greater or equal to mu."
 
-    # Evaluate the individuals with an invalid fitness
-    invalid_ind = [ind for ind in population if not ind.fitness.valid]
-    fitnesses = toolbox.map(toolbox.evaluate, invalid_ind)
-    for ind, fit in zip(invalid_ind, fitnesses):
-        ind.fitness.values = fit
+    # Resume the evolution from the last checkpoint, if any
+    state = None
+    if checkpoint is not None:
+        state = checkpoint.restore(halloffame=halloffame, cache=cache)
 
-    if halloffame is not None:
-        halloffame.update(population)
+    if state is None:
+        # Evaluate the individuals with an invalid fitness
+        invalid_ind = [ind for ind in population if not ind.fitness.valid]
+        fitnesses, counters = _evaluate(toolbox, invalid_ind, cache)
+        for ind, fit in zip(invalid_ind, fitnesses):
+            ind.fitness.values = fit
 
-    logbook = tools.Logbook()
-    logbook.header = ['gen', 'nevals'] + (stats.fields if stats else [])
+        if halloffame is not None:
+            halloffame.update(population)
 
-    record = stats.compile(population) if stats is not None else {}
-    logbook.record(gen=0, nevals=len(invalid_ind), **record)
-    if verbose:
-        print logbook.stream
+        logbook = tools.Logbook()
+        logbook.header = ['gen', 'nevals'] + (['hits', 'misses'] if cache is not None else []) + \
+            (stats.fields if stats else [])
+
+        record = stats.compile(population) if stats is not None else {}
+        record.update(counters)
+        logbook.record(gen=0, nevals=len(invalid_ind), **record)
+        if verbose:
+            print logbook.stream
+        if checkpoint is not None:
+            checkpoint.update(0, population, logbook, halloffame=halloffame, cache=cache)
+        start_gen = 1
+    else:
+        population[:] = state["population"]
+        logbook = state["logbook"]
+        start_gen = state["generation"] + 1
 
     # Begin the generational process
-    for gen in range(1, ngen + 1):
+    for gen in range(start_gen, ngen + 1):
         # Vary the population
         offspring = varOr(population, toolbox, lambda_, cxpb, mutpb)
 
         # Evaluate the individuals with an invalid fitness
         invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
-        fitnesses = toolbox.map(toolbox.evaluate, invalid_ind)
+        fitnesses, counters = _evaluate(toolbox, invalid_ind, cache)
         for ind, fit in zip(invalid_ind, fitnesses):
             ind.fitness.values = fit
 
@@ -431,14 +517,18 @@ def eaMuCommaLambda(population, toolbox, mu, lambda_, cxpb, mutpb, ngen,
 
         # Update the statistics with the new population
         record = stats.compile(population) if stats is not None else {}
+        record.update(counters)
         logbook.record(gen=gen, nevals=len(invalid_ind), **record)
         if verbose:
             print logbook.stream
+
+        if checkpoint is not None:
+            checkpoint.update(gen, population, logbook, halloffame=halloffame, cache=cache)
     return population, logbook
 
 
 def eaGenerateUpdate(toolbox, ngen, halloffame=None, stats=None,
-                     verbose=__debug__):
+                     verbose=__debug__, checkpoint=None):
     """This is algorithm implements the ask-tell model proposed in
     [Colette2010]_, where ask is called `generate` and tell is called `update`.
 
@@ -450,6 +540,10 @@ def eaGenerateUpdate(toolbox, ngen, halloffame=None, stats=None,
     :param halloffame: A :class:`~deap.tools.HallOfFame` object that will
                        contain the best individuals, optional.
     :param verbose: Whether or not to log the statistics.
+    :param checkpoint: A :class:`~deap.tools.Checkpoint` object used to save
+                       the evolution periodically and to resume it, optional.
+                       The strategy must be given to the checkpoint as a
+                       named object for its state to be saved.
     :returns: The final population
     :returns: A class:`~deap.tools.Logbook` with the statistics of the
               evolution
@@ -481,7 +575,16 @@ def eaGenerateUpdate(toolbox, ngen, halloffame=None, stats=None,
     logbook = tools.Logbook()
     logbook.header = ['gen', 'nevals'] + (stats.fields if stats else [])
 
-    for gen in xrange(ngen):
+    # Resume the evolution from the last checkpoint, if any
+    start_gen = 0
+    if checkpoint is not None:
+        state = checkpoint.restore(halloffame=halloffame)
+        if state is not None:
+            population = state["population"]
+            logbook = state["logbook"]
+            start_gen = state["generation"] + 1
+
+    for gen in xrange(start_gen, ngen):
         # Generate a new population
         population = toolbox.generate()
         # Evaluate the individuals
@@ -500,4 +603,268 @@ def eaGenerateUpdate(toolbox, ngen, halloffame=None, stats=None,
         if verbose:
             print logbook.stream
 
+        if checkpoint is not None:
+            checkpoint.update(gen, population, logbook, halloffame=halloffame)
+
+    return population, logbook
+
+
+def _timedEvaluate(evaluate, individual):
+    """Return the result of *evaluate* on the *individual* and the time
+    spent evaluating it.
+    """
+    start = time.time()
+    fitness = evaluate(individual)
+    return fitness, time.time() - start
+
+
+def eaSteadyState(population, toolbox, cxpb, mutpb, nevals, executor,
+                  inflight, stats=None, halloffame=None, verbose=__debug__):
+    """This is an asynchronous steady-state evolutionary algorithm where the
+    evaluations are run on an *executor* with at most *inflight* of them
+    running at once. There is no barrier between generations, each
+    offspring is inserted in the population as soon as its evaluation is
+    done and a new offspring is submitted in its place.
+
+    :param population: A list of individuals.
+    :param toolbox: A :class:`~deap.base.Toolbox` that contains the evolution
+                    operators.
+    :param cxpb: The probability that an offspring is produced by crossover.
+    :param mutpb: The probability that an offspring is produced by mutation.
+    :param nevals: The number of offspring to evaluate.
+    :param executor: An executor having a :meth:`submit` method returning
+                     futures, such as the executors of
+                     :mod:`concurrent.futures` or the :mod:`scoop.futures`
+                     module.
+    :param inflight: The maximum number of evaluations submitted at once,
+                     usually the number of workers of the executor.
+    :param stats: A :class:`~deap.tools.Statistics` object that is updated
+                  inplace, optional.
+    :param halloffame: A :class:`~deap.tools.HallOfFame` object that will
+                       contain the best individuals, optional.
+    :param verbose: Whether or not to log the statistics.
+    :returns: The final population
+    :returns: A class:`~deap.tools.Logbook` with the statistics of the
+              evolution
+
+    The pseudocode goes as follow ::
+
+        evaluate(population)
+        submit inflight offspring produced by varOr(population, toolbox, 1, cxpb, mutpb)
+        while evaluations are pending:
+            wait for the first evaluation done
+            population = select(population + [offspring], len(population))
+            submit a new offspring if less than nevals were submitted
+
+    The offspring are produced by the :func:`varOr` function, without the
+    reproduction case since a plain copy is not worth an evaluation. The
+    registered :meth:`toolbox.select` is used to choose the survivors among
+    the population and the evaluated offspring. Each time as many offspring
+    as the population size have been evaluated, a generation is recorded in
+    the logbook with the number of evaluations, the throughput in evaluations
+    per second and the utilization of the workers, that is the fraction of
+    their time spent evaluating individuals. Since the order of insertion
+    depends on the evaluation times, the evolution is not reproducible.
+
+    This function expects :meth:`toolbox.mate`, :meth:`toolbox.mutate`,
+    :meth:`toolbox.select` and :meth:`toolbox.evaluate` aliases to be
+    registered in the toolbox.
+    """
+    assert cxpb + mutpb > 0.0, (
+        "The sum of the crossover and mutation probabilities must be greater "
+        "than 0.0.")
+    assert inflight >= 1, "At least one evaluation must be in flight."
+
+    logbook = tools.Logbook()
+    logbook.header = ['gen', 'nevals', 'throughput', 'utilization'] + \
+        (stats.fields if stats else [])
+
+    mu = len(population)
+    done = Queue.Queue()
+    pending = dict()
+
+    def submit(individual):
+        future = executor.submit(_timedEvaluate, toolbox.evaluate, individual)
+        pending[future] = individual
+        future.add_done_callback(done.put)
+
+    def produce():
+        offspring, = varOr(population, toolbox, 1, cxpb, mutpb)
+        while offspring.fitness.valid:
+            # Reproductions are not evaluated
+            offspring, = varOr(population, toolbox, 1, cxpb, mutpb)
+        return offspring
+
+    def record(gen, count, elapsed, busy):
+        entry = stats.compile(population) if stats else {}
+        logbook.record(gen=gen, nevals=count,
+                       throughput=count / elapsed if elapsed > 0 else 0.0,
+                       utilization=busy / (elapsed * inflight) if elapsed > 0 else 0.0,
+                       **entry)
+        if verbose:
+            print logbook.stream
+
+    # Evaluate the individuals with an invalid fitness
+    start, busy = time.time(), 0.0
+    invalid_ind = deque(ind for ind in population if not ind.fitness.valid)
+    ninvalid = len(invalid_ind)
+    while invalid_ind or pending:
+        while invalid_ind and len(pending) < inflight:
+            submit(invalid_ind.popleft())
+        future = done.get()
+        ind = pending.pop(future)
+        ind.fitness.values, duration = future.result()
+        busy += duration
+
+    if halloffame is not None:
+        halloffame.update(population)
+
+    record(0, ninvalid, time.time() - start, busy)
+
+    # Begin the steady-state process
+    start, busy = time.time(), 0.0
+    submitted = evaluated = 0
+    while submitted < nevals and len(pending) < inflight:
+        submit(produce())
+        submitted += 1
+
+    while pending:
+        future = done.get()
+        ind = pending.pop(future)
+        ind.fitness.values, duration = future.result()
+        busy += duration
+        evaluated += 1
+
+        if halloffame is not None:
+            halloffame.update([ind])
+
+        # Insert the evaluated offspring in the population
+        population[:] = toolbox.select(population + [ind], mu)
+
+        if submitted < nevals:
+            submit(produce())
+            submitted += 1
+
+        if evaluated % mu == 0 or evaluated == nevals:
+            now = time.time()
+            record((evaluated - 1) // mu + 1, (evaluated - 1) % mu + 1, now - start, busy)
+            start, busy = now, 0.0
+
+    return population, logbook
+
+
+def varAndBatch(population, toolbox, cxpb, mutpb):
+    """Batched version of :func:`varAnd` working on a
+    :class:`~deap.tools.MatrixPopulation`. The population is copied, then
+    the crossover is applied at once on every pair of consecutive
+    individuals drawn with probability *cxpb* and the mutation on every
+    individual drawn with probability *mutpb*. The modified individuals have
+    their fitness invalidated.
+
+    :param population: A :class:`~deap.tools.MatrixPopulation` to vary.
+    :param toolbox: A :class:`~deap.base.Toolbox` that contains the batched
+                    evolution operators.
+    :param cxpb: The probability of mating two individuals.
+    :param mutpb: The probability of mutating an individual.
+    :returns: A new :class:`~deap.tools.MatrixPopulation` of varied
+              individuals.
+
+    The :meth:`toolbox.mate` operator receives two 2-D arrays of genotypes
+    to cross row by row and :meth:`toolbox.mutate` a 2-D array of genotypes
+    to mutate, such as :func:`~deap.tools.cxTwoPointBatch` and
+    :func:`~deap.tools.mutGaussianBatch`. The random draws are made with
+    the :mod:`numpy.random` module.
+    """
+    offspring = population.copy()
+    genotypes = offspring.genotypes
+
+    # Apply crossover and mutation on the offspring
+    first = 2 * numpy.flatnonzero(numpy.random.random(len(offspring) // 2) < cxpb)
+    if len(first) > 0:
+        genotypes[first], genotypes[first + 1] = \
+            toolbox.mate(genotypes[first], genotypes[first + 1])
+        offspring.invalidate(first)
+        offspring.invalidate(first + 1)
+
+    mutants = numpy.flatnonzero(numpy.random.random(len(offspring)) < mutpb)
+    if len(mutants) > 0:
+        genotypes[mutants], = toolbox.mutate(genotypes[mutants])
+        offspring.invalidate(mutants)
+
+    return offspring
+
+
+def eaSimpleBatch(population, toolbox, cxpb, mutpb, ngen, stats=None,
+                  halloffame=None, verbose=__debug__):
+    """Batched version of :func:`eaSimple` evolving a
+    :class:`~deap.tools.MatrixPopulation` in place with whole matrix
+    operations.
+
+    :param population: A :class:`~deap.tools.MatrixPopulation`.
+    :param toolbox: A :class:`~deap.base.Toolbox` that contains the batched
+                    evolution operators.
+    :param cxpb: The probability of mating two individuals.
+    :param mutpb: The probability of mutating an individual.
+    :param ngen: The number of generation.
+    :param stats: A :class:`~deap.tools.Statistics` object that is updated
+                  inplace, optional.
+    :param halloffame: A :class:`~deap.tools.HallOfFame` object that will
+                       contain the best individuals, optional.
+    :param verbose: Whether or not to log the statistics.
+    :returns: The final population
+    :returns: A class:`~deap.tools.Logbook` with the statistics of the
+              evolution
+
+    The algorithm is the same as :func:`eaSimple` with the variation made by
+    :func:`varAndBatch`. The :meth:`toolbox.evaluate` function receives the
+    2-D array of the genotypes having an invalid fitness and returns the
+    2-D array of their fitness values, one row per individual. The
+    :meth:`toolbox.select` operator receives the population and the number of
+    individuals to select and returns a new population, such as
+    :func:`~deap.tools.selTournamentBatch`. The statistics and the hall of
+    fame see the rows of the population as individuals.
+    """
+    logbook = tools.Logbook()
+    logbook.header = ['gen', 'nevals'] + (stats.fields if stats else [])
+
+    # Evaluate the individuals with an invalid fitness
+    invalid_ind = numpy.flatnonzero(~population.valid)
+    if len(invalid_ind) > 0:
+        population.fitnesses[invalid_ind] = toolbox.evaluate(population.genotypes[invalid_ind])
+
+    if halloffame is not None:
+        halloffame.update(population)
+
+    record = stats.compile(population) if stats else {}
+    logbook.record(gen=0, nevals=len(invalid_ind), **record)
+    if verbose:
+        print logbook.stream
+
+    # Begin the generational process
+    for gen in range(1, ngen + 1):
+        # Select the next generation individuals
+        offspring = toolbox.select(population, len(population))
+
+        # Vary the pool of individuals
+        offspring = varAndBatch(offspring, toolbox, cxpb, mutpb)
+
+        # Evaluate the individuals with an invalid fitness
+        invalid_ind = numpy.flatnonzero(~offspring.valid)
+        if len(invalid_ind) > 0:
+            offspring.fitnesses[invalid_ind] = toolbox.evaluate(offspring.genotypes[invalid_ind])
+
+        # Update the hall of fame with the generated individuals
+        if halloffame is not None:
+            halloffame.update(offspring)
+
+        # Replace the current population by the offspring
+        population.genotypes[:] = offspring.genotypes
+        population.fitnesses[:] = offspring.fitnesses
+
+        # Append the current generation statistics to the logbook
+        record = stats.compile(population) if stats else {}
+        logbook.record(gen=gen, nevals=len(invalid_ind), **record)
+        if verbose:
+            print logbook.stream
+
     return population, logbook
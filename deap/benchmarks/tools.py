@@ -20,6 +20,8 @@ except ImportError:
     # fallback on python version
     from ..tools._hypervolume import pyhv as hv
 
+from ..tools._hypervolume.pyhv import hypervolume_approximation
+
 class translate(object):
     """Decorator for evaluation functions, it translates the objective
     function by *vector* which should be the same length as the individual
@@ -294,18 +296,27 @@ def convergence(first_front, optimal_front):
     return sum(distances) / len(distances)
 
 
-def hypervolume(front, ref=None):
+def hypervolume(front, ref=None, samples=None, seed=None, error=None):
     """Return the hypervolume of a *front*. If the *ref* point is not
-    given, the worst value for each objective +1 is used.
+    given, the worst value for each objective +1 is used. When a number of
+    *samples* is given, the hypervolume is estimated by Monte Carlo sampling
+    instead of being computed exactly, which remains tractable for many
+    objectives.
 
     :param front: The population (usually a list of undominated individuals)
                   on which to compute the hypervolume.
     :param ref: A point of the same dimensionality as the individuals in *front*.
+    :param samples: The maximum number of Monte Carlo samples, optional.
+    :param seed: The seed of the sampling, optional.
+    :param error: A bound on the standard error of the estimate at which the
+                  sampling stops early, optional.
     """
     # Must use wvalues * -1 since hypervolume use implicit minimization
     wobj = numpy.array([ind.fitness.wvalues for ind in front]) * -1
     if ref is None:
         ref = numpy.max(wobj, axis=0) + 1
+    if samples is not None:
+        return hypervolume_approximation(wobj, ref, samples, seed, error)
     return hv.hypervolume(wobj, ref)
 
 
@@ -24,14 +24,25 @@ import math
 import random
 import re
 import sys
+import threading
+import time
 import warnings
+import weakref
 
-from collections import defaultdict, deque
+from array import array
+from collections import defaultdict, deque, OrderedDict
 from functools import partial, wraps
 from inspect import isclass
+from itertools import chain
 from operator import eq, lt
 
 import tools  # Needed by HARM-GP
+from .base import Fitness
+
+try:
+    import numpy
+except ImportError:
+    numpy = False
 
 ######################################
 # GP Data structure                  #
@@ -54,8 +65,10 @@ class PrimitiveTree(list):
         list.__init__(self, content)
 
     def __deepcopy__(self, memo):
-        new = self.__class__(self)
-        new.__dict__.update(copy.deepcopy(self.__dict__, memo))
+        # The nodes are immutable, they are shared by the copies
+        new = self.__class__.__new__(self.__class__)
+        list.__init__(new, self)
+        new.__dict__.update(_copyAttributes(self.__dict__, memo))
         return new
 
     def __setitem__(self, key, val):
@@ -182,6 +195,358 @@ class PrimitiveTree(list):
         return slice(begin, end)
 
 
+def _copyAttributes(attributes, memo):
+    """Deep copy the attributes of a tree. The fitnesses that rely on
+    :meth:`~deap.base.Fitness.__deepcopy__` are copied by calling it directly,
+    without going through the dispatch of :func:`copy.deepcopy`.
+    """
+    copy_ = dict()
+    for name, value in attributes.iteritems():
+        if getattr(type(value), "__deepcopy__", None) == Fitness.__deepcopy__:
+            copy_[name] = value.__deepcopy__(memo)
+        else:
+            copy_[name] = copy.deepcopy(value, memo)
+    return copy_
+
+
+class NodeTable(object):
+    """Table interning the nodes of a primitive set, so that a
+    :class:`CompactTree` stores the integer id of its nodes. The primitives
+    and the terminals are interned on their type, return type and name. The
+    ephemeral constants are not interned, the trees keep them inline.
+
+    :param name: The name of the primitive set of the table, optional.
+
+    The last table created with a given name is the one the unpickled
+    :class:`CompactTree` of a class without :attr:`~CompactTree.pset` are
+    attached to.
+    """
+    _named = weakref.WeakValueDictionary()
+
+    def __init__(self, name=None):
+        self.name = name
+        self.nodes = []
+        self.arities = array("i")
+        self._ids = dict()
+        self._objects = dict()
+        if name is not None:
+            NodeTable._named[name] = self
+
+    @classmethod
+    def named(cls, name):
+        """Return the last table created with *name*, or a new one."""
+        table = cls._named.get(name)
+        if table is None:
+            table = cls(name)
+        return table
+
+    def intern(self, node):
+        """Return the id of *node*, adding it to the table if needed."""
+        # The interned nodes are kept alive by the table, their identity
+        # is a valid shortcut to their id
+        id_ = self._objects.get(id(node))
+        if id_ is not None and self.nodes[id_] is node:
+            return id_
+
+        key = (type(node), node.ret, node.name if node.arity > 0 else node.format())
+        id_ = self._ids.get(key)
+        if id_ is None:
+            id_ = self._ids[key] = len(self.nodes)
+            self._objects[id(node)] = id_
+            self.nodes.append(node)
+            self.arities.append(node.arity)
+        return id_
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __getstate__(self):
+        return (self.nodes, self.name)
+
+    def __setstate__(self, state):
+        self.__init__(state[1])
+        for node in state[0]:
+            self.intern(node)
+
+
+class CompactTree(object):
+    """Tree represented by the ids of its nodes in the :class:`NodeTable` of
+    a primitive set, along with their arity and the end offset of their
+    subtree, all stored in compact integer arrays in depth-first order. The
+    ephemeral constants are kept in a list of the tree, in order of
+    appearance, with the negative ids -1, -2, etc. The tree provides the same
+    interface as :class:`PrimitiveTree` and can be used with the same
+    operators, while :meth:`searchSubtree` is a lookup and copying the tree
+    copies three arrays.
+
+    :param content: A :class:`PrimitiveTree`, a list of nodes or another
+                    :class:`CompactTree`.
+    :param pset: The primitive set of the nodes, optional if the class has a
+                 :attr:`pset` attribute, as given when creating it with the
+                 :mod:`~deap.creator`, or if *content* is a
+                 :class:`CompactTree`.
+
+    ::
+
+        creator.create("Individual", gp.CompactTree, fitness=creator.FitnessMin,
+                       pset=pset)
+
+    A pickled tree holds its ids along with the few nodes of the table it
+    uses. Once unpickled, these are interned again in the table of the
+    :attr:`pset` of the class or, when the class has none, in the last table
+    created for a primitive set of the same name, see :class:`NodeTable`.
+
+    The tree is converted back with ``PrimitiveTree(compact)``. Indexing the
+    tree with a slice returns a list of nodes. Replacing a slice of the tree
+    requires the slice to be a subtree, as returned by :meth:`searchSubtree`.
+    """
+    pset = None
+
+    def __init__(self, content, pset=None):
+        if isinstance(content, CompactTree) and pset is None:
+            self.table = content.table
+            self.ids = content.ids[:]
+            self.arities = content.arities[:]
+            self.ends = content.ends[:]
+            self.constants = content.constants[:]
+            self._height = content._height
+            return
+
+        pset = pset if pset is not None else self.pset
+        if pset is None:
+            raise TypeError("A primitive set is required to build a CompactTree"
+                            " from %s." % type(content).__name__)
+        self.table = pset.node_table
+        self.constants = []
+        self.ids = array("i", map(self._intern, content))
+        self.arities = self._arities(self.ids)
+        self.ends = self._extents(self.arities, 0)
+        self._height = None
+
+    def _intern(self, node):
+        """Return the id of *node*, appending it to the constants of the tree
+        if it is an ephemeral constant.
+        """
+        if isinstance(node, Ephemeral):
+            self.constants.append(node)
+            return -len(self.constants)
+        return self.table.intern(node)
+
+    def _arities(self, ids):
+        arities = self.table.arities
+        return array("i", [arities[id_] if id_ >= 0 else 0 for id_ in ids])
+
+    def _renumber(self):
+        """Number the constants in order of appearance and drop the unused
+        ones.
+        """
+        constants = []
+        ids = self.ids
+        for i in xrange(len(ids)):
+            if ids[i] < 0:
+                constants.append(self.constants[-ids[i] - 1])
+                ids[i] = -len(constants)
+        self.constants = constants
+
+    @staticmethod
+    def _extents(arities, offset):
+        """Return the array of the end offsets of the subtrees rooted at each
+        node of the depth-first sequence *arities*, shifted by *offset*.
+        """
+        ends = array("i", [0]) * len(arities)
+        stack = []
+        for i in xrange(len(arities) - 1, -1, -1):
+            arity = arities[i]
+            if arity == 0:
+                ends[i] = i + 1 + offset
+            else:
+                # The last child is the deepest one on the stack
+                ends[i] = ends[stack[-arity]]
+                del stack[-arity:]
+            stack.append(i)
+        return ends
+
+    def __deepcopy__(self, memo):
+        state = dict(self.__dict__)
+        new = self.__class__.__new__(self.__class__)
+        new.table = state.pop("table")
+        new.ids = state.pop("ids")[:]
+        new.arities = state.pop("arities")[:]
+        new.ends = state.pop("ends")[:]
+        new.constants = state.pop("constants")[:]
+        new._height = state.pop("_height")
+        new.__dict__.update(_copyAttributes(state, memo))
+        return new
+
+    def __getstate__(self):
+        # The ids are stored relative to the list of the distinct nodes of
+        # the table used by the tree, the arities and extents follow
+        local = dict()
+        nodes = []
+        ids = array("i", self.ids)
+        for i, id_ in enumerate(ids):
+            if id_ >= 0:
+                if id_ not in local:
+                    local[id_] = len(nodes)
+                    nodes.append(self.table.nodes[id_])
+                ids[i] = local[id_]
+        if len(ids) == 0 or (min(ids) >= -128 and max(ids) < 128):
+            ids = array("b", ids)
+
+        attributes = dict(self.__dict__)
+        for name in ("table", "ids", "arities", "ends", "constants", "_height"):
+            del attributes[name]
+        # The constants are stored by class and value
+        classes = [type(constant) for constant in self.constants]
+        values = [constant.value for constant in self.constants]
+        return (ids.typecode, ids.tostring(), nodes, classes, values,
+                self.table.name, attributes)
+
+    def __setstate__(self, state):
+        typecode, string, nodes, classes, values, name, attributes = state
+        self.__dict__.update(attributes)
+        self.constants = []
+        for class_, value in zip(classes, values):
+            constant = class_.__new__(class_)
+            Terminal.__init__(constant, value, False, class_.ret)
+            self.constants.append(constant)
+        if self.pset is not None:
+            self.table = self.pset.node_table
+        else:
+            self.table = NodeTable.named(name)
+
+        local = [self.table.intern(node) for node in nodes]
+        ids = array(typecode)
+        ids.fromstring(string)
+        self.ids = array("i", [local[id_] if id_ >= 0 else id_ for id_ in ids])
+        self.arities = self._arities(self.ids)
+        self.ends = self._extents(self.arities, 0)
+        self._height = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        nodes, constants = self.table.nodes, self.constants
+        for id_ in self.ids:
+            yield nodes[id_] if id_ >= 0 else constants[-id_ - 1]
+
+    def __reversed__(self):
+        nodes, constants = self.table.nodes, self.constants
+        for id_ in reversed(self.ids):
+            yield nodes[id_] if id_ >= 0 else constants[-id_ - 1]
+
+    def __getitem__(self, key):
+        nodes, constants = self.table.nodes, self.constants
+        if isinstance(key, slice):
+            return [nodes[id_] if id_ >= 0 else constants[-id_ - 1] for id_ in self.ids[key]]
+        id_ = self.ids[key]
+        return nodes[id_] if id_ >= 0 else constants[-id_ - 1]
+
+    def __setitem__(self, key, val):
+        if not isinstance(key, slice):
+            old = self.ids[key]
+            if isinstance(val, Ephemeral) and old < 0:
+                # The constant takes the place of the replaced one
+                self.constants[-old - 1] = val
+                return
+            id_ = self._intern(val)
+            if (self.table.arities[id_] if id_ >= 0 else 0) != self.arities[key]:
+                if id_ < 0:
+                    self.constants.pop()
+                raise ValueError("Invalid node replacement with a node of a"
+                                 " different arity.")
+            self.ids[key] = id_
+            if id_ < 0 or old < 0:
+                self._renumber()
+            return
+
+        begin, end, _ = key.indices(len(self))
+        if begin >= len(self) or end != self.ends[begin]:
+            raise IndexError("Invalid slice object (try to assign a %s in a"
+                             " tree of size %d). Only a subtree, as given by"
+                             " searchSubtree, can be replaced in a CompactTree."
+                             % (key, len(self)))
+
+        count = len(self.constants)
+        if isinstance(val, CompactTree) and val.table is self.table:
+            ids = array("i", [id_ if id_ >= 0 else id_ - count for id_ in val.ids])
+            arities = val.arities
+            ends = array("i", [e + begin for e in val.ends])
+            self.constants.extend(val.constants)
+        else:
+            ids = array("i", map(self._intern, val))
+            arities = self._arities(ids)
+            if sum(arities) != len(arities) - 1:
+                del self.constants[count:]
+                raise ValueError("Invalid slice assignation : insertion of an"
+                                 " incomplete subtree is not allowed in"
+                                 " CompactTree.")
+            ends = self._extents(arities, begin)
+
+        # The ancestors of the subtree and the following nodes are shifted
+        delta = len(ids) - (end - begin)
+        if delta != 0:
+            for i in xrange(begin):
+                if self.ends[i] >= end:
+                    self.ends[i] += delta
+            self.ends[end:] = array("i", [e + delta for e in self.ends[end:]])
+        self.ids[begin:end] = ids
+        self.arities[begin:end] = arities
+        self.ends[begin:end] = ends
+        self._height = None
+        if self.constants:
+            self._renumber()
+
+    def __eq__(self, other):
+        if isinstance(other, CompactTree) and other.table is self.table:
+            return self.ids == other.ids and self.constants == other.constants
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __str__(self):
+        return str(PrimitiveTree(self))
+
+    @classmethod
+    def from_string(cls, string, pset):
+        """Convert a string expression into a CompactTree given a
+        PrimitiveSet *pset*, see :meth:`PrimitiveTree.from_string`.
+        """
+        return cls(PrimitiveTree.from_string(string, pset), pset)
+
+    @property
+    def height(self):
+        """Return the height of the tree, or the depth of the
+        deepest node.
+        """
+        if self._height is None:
+            stack = [0]
+            max_depth = 0
+            for arity in self.arities:
+                depth = stack.pop()
+                max_depth = max(max_depth, depth)
+                stack.extend([depth + 1] * arity)
+            self._height = max_depth
+        return self._height
+
+    @property
+    def root(self):
+        """Root of the tree, the element 0 of the list.
+        """
+        return self[0]
+
+    def searchSubtree(self, begin):
+        """Return a slice object that corresponds to the
+        range of values that defines the subtree which has the
+        element with index *begin* as its root.
+        """
+        return slice(begin, self.ends[begin])
+
+
 class Primitive(object):
     """Class that encapsulates a primitive and when called with arguments it
     returns the Python code to call the primitive with the arguments.
@@ -272,6 +637,11 @@ class PrimitiveSetTyped(object):
         self.mapping = dict()
         self.terms_count = 0
         self.prims_count = 0
+        self.compile_cache = None
+        self.node_table = NodeTable(name)
+        self.rewrite_rules = defaultdict(list)
+        self._heights = None
+        self._lookups = dict()
 
         self.name = name
         self.ret = ret_type
@@ -293,6 +663,83 @@ class PrimitiveSetTyped(object):
                 self.mapping[new_name] = self.mapping[old_name]
                 self.mapping[new_name].value = new_name
                 del self.mapping[old_name]
+        self._clearCache()
+
+    def _clearCache(self):
+        # The compiled expressions depend on the names and the context
+        if getattr(self, "compile_cache", None) is not None:
+            self.compile_cache.clear()
+        # The generation tables depend on the primitives and terminals
+        self._heights = None
+        self._lookups = dict()
+
+    def _buildHeights(self):
+        """Compute the minimum height of a complete subtree returning each
+        type, and of the subtrees rooted at each primitive, by fixed point.
+        """
+        inf = float("inf")
+        types = set(self.primitives) | set(self.terminals)
+        heights = dict((type_, 0 if len(self.terminals.get(type_, ())) > 0 else inf)
+                       for type_ in types)
+        changed = True
+        while changed:
+            changed = False
+            for type_, prims in self.primitives.items():
+                for prim in prims:
+                    height = 1 + max(heights.get(arg, inf) for arg in prim.args)
+                    if height < heights[type_]:
+                        heights[type_] = height
+                        changed = True
+        self._heights = heights
+
+    def minHeight(self, type_):
+        """Return the minimum height of a complete tree returning *type_*,
+        infinite if no such tree can be built.
+        """
+        if self._heights is None:
+            self._buildHeights()
+        return self._heights.get(type_, float("inf"))
+
+    def feasibilityTable(self, type_):
+        """Return the table of the primitives returning *type_* that root a
+        complete subtree of height at most *depth*, indexed by *depth*, in
+        the order of :attr:`primitives`. The last entry holds all the
+        primitives that can be completed and applies to the greater depths.
+        The table is computed once per type.
+        """
+        key = ("feasible", type_)
+        if key not in self._lookups:
+            heights = [(1 + max(self.minHeight(arg) for arg in prim.args), prim)
+                       for prim in self.primitives.get(type_, ())]
+            finite = [height for height, _ in heights if height < float("inf")]
+            self._lookups[key] = [[prim for height, prim in heights if height <= depth]
+                                  for depth in xrange(max(finite + [0]) + 1)]
+        return self._lookups[key]
+
+    def feasiblePrimitives(self, type_, depth):
+        """Return the primitives returning *type_* that root a complete
+        subtree of height at most *depth*, see :meth:`feasibilityTable`.
+        """
+        table = self.feasibilityTable(type_)
+        return table[min(depth, len(table) - 1)] if depth >= 0 else []
+
+    def replacementPrimitives(self, prim):
+        """Return the primitives having the same signature as *prim*."""
+        key = ("signature", prim.ret, tuple(prim.args))
+        if key not in self._lookups:
+            self._lookups[key] = [p for p in self.primitives.get(prim.ret, ())
+                                  if p.args == prim.args]
+        return self._lookups[key]
+
+    def insertionPrimitives(self, type_):
+        """Return the primitives returning *type_* that take an argument of
+        *type_*.
+        """
+        key = ("insertion", type_)
+        if key not in self._lookups:
+            self._lookups[key] = [p for p in self.primitives.get(type_, ())
+                                  if type_ in p.args]
+        return self._lookups[key]
 
     def _add(self, prim):
         def addType(dict_, ret_type):
@@ -308,6 +755,7 @@ class PrimitiveSetTyped(object):
         addType(self.primitives, prim.ret)
         addType(self.terminals, prim.ret)
 
+        self._clearCache()
         self.mapping[prim.name] = prim
         if isinstance(prim, Primitive):
             for type_ in prim.args:
@@ -419,6 +867,64 @@ class PrimitiveSetTyped(object):
         self._add(prim)
         self.prims_count += 1
 
+    def addRewriteRule(self, pattern, replacement):
+        """Add a rule rewriting the subtrees matching *pattern* into
+        *replacement* when a tree is passed through :func:`simplify`. Both
+        are string expressions made of the primitives and terminals of the
+        set, of constants and of variables, the names unknown to the set,
+        which match any subtree. A variable appearing more than once in the
+        pattern matches identical subtrees. ::
+
+            >>> import operator
+            >>> pset = PrimitiveSet("MAIN", 1)
+            >>> pset.addPrimitive(operator.sub, 2)
+            >>> pset.addPrimitive(operator.mul, 2)
+            >>> pset.addRewriteRule("sub(X, X)", "0")
+            >>> pset.addRewriteRule("mul(X, 1)", "X")
+
+        :param pattern: String expression rooted at a primitive.
+        :param replacement: String expression using the variables of the
+                            pattern.
+
+        A rule is only applied when the replacement is smaller than the
+        matched subtree, so that the simplification always terminates.
+        """
+        pattern = self._parseRule(pattern)
+        replacement = self._parseRule(replacement)
+        if pattern[0][0] != "node" or pattern[0][1].arity == 0:
+            raise ValueError("The pattern of a rewrite rule must be rooted "
+                             "at a primitive.")
+        variables = set(token for kind, token in pattern if kind == "var")
+        unknown = set(token for kind, token in replacement if kind == "var") - variables
+        if len(unknown) > 0:
+            raise ValueError("The replacement uses the variables %s that are "
+                             "not in the pattern." % ", ".join(sorted(unknown)))
+        self.rewrite_rules[pattern[0][1].name].append((pattern, replacement))
+
+    def _parseRule(self, string):
+        rule = []
+        total = 1
+        for token in re.split("[ \t\n\r\f\v(),]", string):
+            if token == '':
+                continue
+            if token in self.mapping:
+                node = self.mapping[token]
+                if isclass(node):
+                    raise ValueError("Ephemeral constant %s cannot be part of "
+                                     "a rewrite rule." % token)
+                rule.append(("node", node))
+                total += node.arity - 1
+            elif re.match("[A-Za-z_][A-Za-z0-9_]*$", token):
+                rule.append(("var", token))
+                total -= 1
+            else:
+                rule.append(("const", eval(token)))
+                total -= 1
+        if total != 0 or len(rule) == 0:
+            raise ValueError("Invalid rewrite rule expression %r, it is not a "
+                             "complete tree." % string)
+        return rule
+
     @property
     def terminalRatio(self):
         """Return the ratio of the number of terminals on the number of all
@@ -457,6 +963,98 @@ class PrimitiveSet(PrimitiveSetTyped):
 ######################################
 # GP Tree compilation functions      #
 ######################################
+_MISSING = object()
+
+class CompileCache(object):
+    """Bounded cache of the functions compiled from the trees of a primitive
+    set. When assigned to the :attr:`compile_cache` attribute of a
+    primitive set, :func:`compile` looks the :class:`PrimitiveTree` up in
+    the cache before building and evaluating their code, so that identical
+    trees, like those produced by cloning and selection, are compiled once.
+    ::
+
+        pset.compile_cache = gp.CompileCache(maxsize=10000)
+        toolbox.register("compile", gp.compile, pset=pset)
+
+    The trees are identified by the sequence of their primitive names and
+    formatted terminals, including the value of the ephemeral constants.
+    The cache is emptied when the primitive set is modified. The trees of a
+    primitive set without arguments are not cached, their compilation
+    evaluates them and gives a result instead of a function. The caches of
+    the primitive sets given to :func:`compileADF` hold the compiled ADFs.
+    The cache can be shared by threads evaluating in parallel.
+
+    :param maxsize: The maximum number of compiled functions kept, the least
+                    recently used are discarded first, optional. The cache
+                    is unbounded if not provided.
+    """
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(expr):
+        """Return the key identifying the code of the tree *expr*."""
+        return tuple(node.name if node.arity > 0 else node.format() for node in expr)
+
+    def compile(self, expr, pset):
+        """Return the compiled *expr* from the cache, compiling it against
+        *pset* if it is not in the cache yet.
+        """
+        if len(pset.arguments) == 0:
+            return _compile(str(expr), pset)
+        return self.lookup(self.key(expr), lambda: _compile(str(expr), pset))
+
+    def lookup(self, key, build):
+        """Return the function cached under *key*, calling *build* to
+        produce it if it is not in the cache yet.
+        """
+        with self._lock:
+            func = self.entries.pop(key, _MISSING)
+            if func is not _MISSING:
+                self.hits += 1
+                self.entries[key] = func
+                return func
+            self.misses += 1
+
+        # Compile outside of the lock, a concurrent miss compiles twice
+        func = build()
+        with self._lock:
+            self.entries[key] = func
+            if self.maxsize is not None and len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return func
+
+    @property
+    def hit_rate(self):
+        """Ratio of the lookups found in the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / float(lookups) if lookups > 0 else 0.0
+
+    def clear(self):
+        """Remove all the compiled functions and reset the statistics."""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getstate__(self):
+        # Compiled lambdas cannot be pickled, the entries are not kept
+        state = self.__dict__.copy()
+        state["entries"] = OrderedDict()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
 def compile(expr, pset):
     """Compile the expression *expr*.
 
@@ -467,15 +1065,31 @@ def compile(expr, pset):
     :param pset: Primitive set against which the expression is compile.
     :returns: a function if the primitive set has 1 or more arguments,
               or return the results produced by evaluating the tree.
+
+    When the primitive set has a :class:`CompileCache` as
+    :attr:`compile_cache` attribute, the compiled trees are cached.
     """
-    code = str(expr)
+    cache = getattr(pset, "compile_cache", None)
+    if cache is not None and isinstance(expr, PrimitiveTree):
+        return cache.compile(expr, pset)
+    return _compile(str(expr), pset)
+
+
+def _compile(code, pset, functions=None):
+    """Compile the string of Python *code* against *pset*, the *functions*
+    dictionary adding names to the context of *pset* for this code only.
+    """
+    context = pset.context
+    if functions:
+        context = dict(context)
+        context.update(functions)
     if len(pset.arguments) > 0:
         # This section is a stripped version of the lambdify
         # function of SymPy 0.6.6.
         args = ",".join(arg for arg in pset.arguments)
         code = "lambda {args}: {code}".format(args=args, code=code)
     try:
-        return eval(code, pset.context, {})
+        return eval(code, context, {})
     except MemoryError:
         _, _, traceback = sys.exc_info()
         raise MemoryError, ("DEAP : Error in tree evaluation :"
@@ -501,16 +1115,289 @@ def compileADF(expr, psets):
                   and should contain reference to the preceding ADFs.
     :returns: a function if the main primitive set has 1 or more arguments,
               or return the results produced by evaluating the tree.
+
+    Each tree is compiled against the context of its primitive set extended
+    with the ADFs it can call, the contexts are not modified so that the
+    individuals can be compiled by concurrent threads. When a primitive set
+    has a :class:`CompileCache` as :attr:`compile_cache` attribute, the
+    function compiled from its tree is cached, identified by the tree and
+    the trees of the ADFs it can call. The trees of the primitive sets
+    without arguments are evaluated and never cached. ::
+
+        for pset in psets:
+            pset.compile_cache = gp.CompileCache(maxsize=10000)
     """
     adfdict = {}
     func = None
+    key = ()
     for pset, subexpr in reversed(zip(psets, expr)):
-        pset.context.update(adfdict)
-        func = compile(subexpr, pset)
-        adfdict.update({pset.name: func})
+        cache = getattr(pset, "compile_cache", None)
+        if (cache is not None and isinstance(subexpr, PrimitiveTree)
+                and len(pset.arguments) > 0):
+            key = (pset.name, CompileCache.key(subexpr), key)
+            func = cache.lookup(key, lambda: _compile(str(subexpr), pset, adfdict))
+        else:
+            code = str(subexpr)
+            key = (pset.name, code, key)
+            func = _compile(code, pset, adfdict)
+        adfdict[pset.name] = func
     return func
 
 
+def interpret(expr, pset):
+    """Build an interpreter of the tree *expr*, an alternative to
+    :func:`compile` that neither generates nor parses any code. The nodes
+    are executed in reverse prefix order on a value stack, so there is no
+    limit on the height of the tree. It is especially suited to primitives
+    working on whole :mod:`numpy` arrays, where each node computes its
+    result for every fitness case at once. ::
+
+        toolbox.register("compile", gp.interpret, pset=pset)
+        func = toolbox.compile(expr=individual)
+        errors = func(samples) - values
+
+    :param expr: The :class:`PrimitiveTree` to interpret.
+    :param pset: Primitive set against which the expression is interpreted.
+    :returns: a function if the primitive set has 1 or more arguments,
+              or return the results produced by evaluating the tree.
+    """
+    arguments = dict((name, i) for i, name in enumerate(pset.arguments))
+    program = [_instruction(node, pset, arguments) for node in reversed(expr)]
+
+    def run(*args):
+        stack = []
+        for arity, obj in program:
+            if arity == 0:
+                stack.append(obj)
+            elif arity < 0:
+                stack.append(args[obj])
+            else:
+                # The first argument is on the top of the stack
+                values = stack[:-arity - 1:-1]
+                del stack[-arity:]
+                stack.append(obj(*values))
+        return stack[0]
+
+    if len(pset.arguments) > 0:
+        return run
+    return run()
+
+def _instruction(node, pset, arguments):
+    """Return the instruction executing *node*, a tuple of the arity and the
+    primitive for the primitives, 0 and the value for the terminals, or -1
+    and the index of the argument for the arguments.
+    """
+    if node.arity > 0:
+        return node.arity, pset.context[node.name]
+    elif node.conv_fct is str and node.value in arguments:
+        return -1, arguments[node.value]
+    elif node.conv_fct is str:
+        return 0, pset.context[node.value]
+    return 0, node.value
+
+
+def evaluatePopulation(population, pset, args, maxbytes=2**28):
+    """Evaluate the trees of *population* on the arguments *args*, executing
+    each distinct subtree of the population only once. It is an
+    alternative to interpreting each tree independently with
+    :func:`interpret` when the trees share many subtrees, as they do after
+    crossovers. ::
+
+        def evalPopulation(individuals):
+            outputs = gp.evaluatePopulation(individuals, pset, (samples,))
+            return [(numpy.sum((out - values)**2),) for out in outputs]
+
+    :param population: A list of :class:`PrimitiveTree`.
+    :param pset: Primitive set against which the trees are evaluated.
+    :param args: The sequence of the arguments of the trees, usually the
+                 :mod:`numpy` arrays of the fitness cases.
+    :param maxbytes: The maximum number of bytes of the intermediate results
+                     kept for reuse, the least recently used are dropped
+                     first and computed again if needed. :data:`None` keeps
+                     every result.
+    :returns: The list of the outputs of the trees, in order.
+
+    The subtrees are identified bottom-up by their root and the identifiers
+    of their children, so that identical subtrees at any position of any
+    tree share their result. The primitives must be deterministic.
+    """
+    arguments = dict((name, i) for i, name in enumerate(pset.arguments))
+    subtrees = dict()
+    instructions = []
+    results = OrderedDict()
+    size = 0
+
+    outputs = []
+    for expr in population:
+        # Identify the subtrees, the children are on the top of the stack
+        ids = [None] * len(expr)
+        children = [()] * len(expr)
+        stack = []
+        for i in xrange(len(expr) - 1, -1, -1):
+            node = expr[i]
+            if node.arity > 0:
+                children[i] = stack[:-node.arity - 1:-1]
+                del stack[-node.arity:]
+                key = (node.name,) + tuple(ids[child] for child in children[i])
+            else:
+                key = node.format()
+            ids[i] = subtrees.get(key)
+            if ids[i] is None:
+                ids[i] = subtrees[key] = len(instructions)
+                instructions.append(_instruction(node, pset, arguments))
+            stack.append(i)
+
+        # Reuse the known results and find the subtrees left to execute
+        values = dict()
+        needed = [False] * len(expr)
+        needed[0] = True
+        for i in xrange(len(expr)):
+            if needed[i]:
+                if ids[i] in results:
+                    values[i] = results[ids[i]] = results.pop(ids[i])
+                else:
+                    for child in children[i]:
+                        needed[child] = True
+
+        # Execute the subtrees in reverse prefix order
+        for i in xrange(len(expr) - 1, -1, -1):
+            if not needed[i] or i in values:
+                continue
+            arity, obj = instructions[ids[i]]
+            if arity == 0:
+                values[i] = obj
+            elif arity < 0:
+                values[i] = args[obj]
+            else:
+                values[i] = obj(*[values[child] for child in children[i]])
+
+            if ids[i] not in results:
+                results[ids[i]] = values[i]
+                size += getattr(values[i], "nbytes", 0)
+                while maxbytes is not None and size > maxbytes and len(results) > 0:
+                    _, value = results.popitem(last=False)
+                    size -= getattr(value, "nbytes", 0)
+
+        outputs.append(values[0])
+    return outputs
+
+_NOVALUE = object()
+
+def _constantValue(node, pset):
+    """Return the value of the terminal *node*, or :data:`_NOVALUE` if it
+    is an argument.
+    """
+    if node.conv_fct is not str:
+        return node.value
+    elif node.value in pset.arguments:
+        return _NOVALUE
+    return pset.context.get(node.value, _NOVALUE)
+
+def _isLiteral(value):
+    """Tell if *value* can be written in a tree as a constant terminal."""
+    if isinstance(value, float):
+        return not (math.isinf(value) or math.isnan(value))
+    return isinstance(value, (int, long))
+
+def _matchRule(pattern, nodes):
+    """Return the bindings of the variables of *pattern* matching the
+    subtree *nodes*, or :data:`None` if they do not match.
+    """
+    bindings = dict()
+    i = 0
+    for kind, token in pattern:
+        node = nodes[i]
+        if kind == "var":
+            end, total = i + 1, node.arity
+            while total > 0:
+                total += nodes[end].arity - 1
+                end += 1
+            if bindings.setdefault(token, nodes[i:end]) != nodes[i:end]:
+                return None
+            i = end
+            continue
+        elif kind == "const":
+            if node.arity != 0 or node.conv_fct is str or node.value != token:
+                return None
+        elif node.arity != token.arity or node.name != token.name:
+            return None
+        i += 1
+    return bindings
+
+def _applyRule(replacement, bindings, ret):
+    """Build the nodes of *replacement*, a subtree returning *ret*, from the
+    subtrees bound to its variables.
+    """
+    nodes = []
+    types = [ret]
+    for kind, token in replacement:
+        type_ = types.pop()
+        if kind == "var":
+            nodes.extend(bindings[token])
+        elif kind == "const":
+            nodes.append(Terminal(token, False, type_))
+        else:
+            nodes.append(token)
+            if token.arity > 0:
+                types.extend(reversed(token.args))
+    return nodes
+
+def _simplify(expr, pset, fold):
+    stack = []
+    for node in reversed(expr):
+        if node.arity == 0:
+            stack.append(([node], _constantValue(node, pset)))
+            continue
+
+        children = [stack.pop() for _ in xrange(node.arity)]
+        values = [value for _, value in children]
+        if fold and _NOVALUE not in values:
+            try:
+                value = pset.context[node.name](*values)
+            except Exception:
+                value = _NOVALUE
+            if _isLiteral(value):
+                stack.append(([Terminal(value, False, node.ret)], value))
+                continue
+
+        nodes = [node]
+        for child, _ in children:
+            nodes.extend(child)
+        result = (nodes, _NOVALUE)
+        for pattern, replacement in pset.rewrite_rules.get(node.name, ()):
+            bindings = _matchRule(pattern, nodes)
+            if bindings is not None:
+                rewritten = _applyRule(replacement, bindings, node.ret)
+                if len(rewritten) < len(nodes):
+                    result = _simplify(rewritten, pset, fold)
+                    break
+        stack.append(result)
+    return stack[0]
+
+def simplify(expr, pset, fold=True):
+    """Return a simplified copy of the tree *expr*, computing the same
+    function with fewer nodes. The subtrees without arguments are folded
+    into a constant terminal and the rewrite rules added to *pset* with
+    :meth:`~deap.gp.PrimitiveSetTyped.addRewriteRule`, such as identity
+    eliminations, are applied bottom-up. The tree *expr* is not modified,
+    so that the simplification can be done before compiling the
+    individuals without changing their genotype. ::
+
+        toolbox.register("compile", lambda expr: gp.compile(gp.simplify(expr, pset), pset))
+
+    :param expr: Tree to simplify.
+    :param pset: Primitive set against which the tree is simplified.
+    :param fold: Whether the constant subtrees are folded.
+    :returns: A :class:`PrimitiveTree`.
+
+    The folding evaluates the primitives on the constants of the tree, it
+    assumes that the primitives are deterministic. Only the integer and
+    finite float results are folded, the subtrees raising an exception are
+    kept as is.
+    """
+    nodes, _ = _simplify(expr, pset, fold)
+    return PrimitiveTree(nodes)
+
 ######################################
 # GP Program generation functions    #
 ######################################
@@ -600,17 +1487,35 @@ def generate(pset, min_, max_, condition, type_=None):
                   is assumed.
     :returns: A grown tree with leaves at possibly different depths
               depending on the condition function.
+
+    The primitives are chosen among those that can be completed within the
+    height of the tree, according to the feasibility tables of *pset*, see
+    :meth:`~deap.gp.PrimitiveSetTyped.feasibilityTable`. A terminal is
+    used when no primitive is feasible and, when a type has no terminal,
+    the branch is completed with the shortest primitives available.
     """
     if type_ is None:
         type_ = pset.ret
     expr = []
     height = random.randint(min_, max_)
+    tables = dict()
     stack = [(0, type_)]
     while len(stack) != 0:
         depth, type_ = stack.pop()
-        if condition(height, depth):
+        terminals = pset.terminals[type_]
+        if condition(height, depth) and len(terminals) > 0:
+            primitives = ()
+        else:
+            table = tables.get(type_)
+            if table is None:
+                table = tables[type_] = pset.feasibilityTable(type_)
+            primitives = table[min(height - depth, len(table) - 1)] if depth <= height else ()
+            if len(primitives) == 0 and len(terminals) == 0:
+                primitives = pset.feasiblePrimitives(type_, pset.minHeight(type_))
+
+        if len(primitives) == 0:
             try:
-                term = random.choice(pset.terminals[type_])
+                term = random.choice(terminals)
             except IndexError:
                 _, _, traceback = sys.exc_info()
                 raise IndexError, "The gp.generate function tried to add " \
@@ -620,13 +1525,7 @@ def generate(pset, min_, max_, condition, type_=None):
                 term = term()
             expr.append(term)
         else:
-            try:
-                prim = random.choice(pset.primitives[type_])
-            except IndexError:
-                _, _, traceback = sys.exc_info()
-                raise IndexError, "The gp.generate function tried to add " \
-                                  "a primitive of type '%s', but there is " \
-                                  "none available." % (type_,), traceback
+            prim = random.choice(primitives)
             expr.append(prim)
             for arg in reversed(prim.args):
                 stack.append((depth + 1, arg))
@@ -772,8 +1671,7 @@ def mutNodeReplacement(individual, pset):
             term = term()
         individual[index] = term
     else:  # Primitive
-        prims = [p for p in pset.primitives[node.ret] if p.args == node.args]
-        individual[index] = random.choice(prims)
+        individual[index] = random.choice(pset.replacementPrimitives(node))
 
     return individual,
 
@@ -824,7 +1722,7 @@ def mutInsert(individual, pset):
 
     # As we want to keep the current node as children of the new one,
     # it must accept the return value of the current node
-    primitives = [p for p in pset.primitives[node.ret] if node.ret in p.args]
+    primitives = pset.insertionPrimitives(node.ret)
 
     if len(primitives) == 0:
         return individual,
@@ -877,6 +1775,22 @@ def mutShrink(individual):
     return individual,
 
 
+def mutSimplify(individual, pset, fold=True):
+    """Replace the *individual* by its simplified version, see
+    :func:`simplify`. The genotype is shrunk without changing the function
+    it computes.
+
+    :param individual: The tree to be simplified.
+    :param pset: Primitive set against which the tree is simplified.
+    :param fold: Whether the constant subtrees are folded.
+    :returns: A tuple of one tree.
+    """
+    simplified = simplify(individual, pset, fold)
+    if len(simplified) < len(individual):
+        individual[0:len(individual)] = simplified
+    return individual,
+
+
 ######################################
 # GP bloat control decorators        #
 ######################################
@@ -932,7 +1846,7 @@ def staticLimit(key, max_value):
 
 def harm(population, toolbox, cxpb, mutpb, ngen,
          alpha, beta, gamma, rho, nbrindsmodel=-1, mincutoff=20,
-         stats=None, halloffame=None, verbose=__debug__):
+         stats=None, halloffame=None, verbose=__debug__, checkpoint=None):
     """Implement bloat control on a GP evolution using HARM-GP, as defined in
     [Gardner2015]. It is implemented in the form of an evolution algorithm
     (similar to :func:`~deap.algorithms.eaSimple`).
@@ -961,6 +1875,8 @@ def harm(population, toolbox, cxpb, mutpb, ngen,
     :param halloffame: A :class:`~deap.tools.HallOfFame` object that will
                        contain the best individuals, optional.
     :param verbose: Whether or not to log the statistics.
+    :param checkpoint: A :class:`~deap.tools.Checkpoint` object used to save
+                       the evolution periodically and to resume it, optional.
     :returns: The final population
     :returns: A class:`~deap.tools.Logbook` with the statistics of the
               evolution
@@ -969,6 +1885,12 @@ def harm(population, toolbox, cxpb, mutpb, ngen,
     :meth:`toolbox.select` and :meth:`toolbox.evaluate` aliases to be
     registered in the toolbox.
 
+    The size histograms are computed with :mod:`numpy` and the individuals
+    generated to model the natural distribution are the first aspirants of
+    the offspring. The time spent modelling the distribution and producing
+    the offspring, and the time spent evaluating them, are recorded in the
+    logbook under the ``modelling`` and ``evaluation`` fields.
+
     .. note::
        The recommended values for the HARM-GP parameters are *alpha=0.05*,
        *beta=10*, *gamma=0.25*, *rho=0.9*. However, these parameters can be
@@ -984,58 +1906,32 @@ def harm(population, toolbox, cxpb, mutpb, ngen,
 
     """
 
-    def _genpop(n, pickfrom=[], acceptfunc=lambda s: True, producesizes=False):
-        # Generate a population of n individuals, using individuals in
-        # *pickfrom* if possible, with a *acceptfunc* acceptance function.
-        # If *producesizes* is true, also return a list of the produced
-        # individuals sizes.
-        # This function is used 1) to generate the natural distribution
-        # (in this case, pickfrom and acceptfunc should be let at their
-        # default values) and 2) to generate the final population, in which
-        # case pickfrom should be the natural population previously generated
-        # and acceptfunc a function implementing the HARM-GP algorithm.
-        producedpop = []
-        producedpopsizes = []
-        while len(producedpop) < n:
-            if len(pickfrom) > 0:
-                # If possible, use the already generated
-                # individuals (more efficient)
-                aspirant = pickfrom.pop()
-                if acceptfunc(len(aspirant)):
-                    producedpop.append(aspirant)
-                    if producesizes:
-                        producedpopsizes.append(len(aspirant))
+    def _natural(n):
+        # Generate a population of n individuals with the variation
+        # operators, without acceptance, following the natural distribution
+        # of sizes.
+        produced = []
+        while len(produced) < n:
+            opRandom = random.random()
+            if opRandom < cxpb:
+                # Crossover
+                aspirant1, aspirant2 = toolbox.mate(*map(toolbox.clone,
+                                                         toolbox.select(population, 2)))
+                del aspirant1.fitness.values, aspirant2.fitness.values
+                produced.append(aspirant1)
+                if len(produced) < n:
+                    produced.append(aspirant2)
             else:
-                opRandom = random.random()
-                if opRandom < cxpb:
-                    # Crossover
-                    aspirant1, aspirant2 = toolbox.mate(*map(toolbox.clone,
-                                                             toolbox.select(population, 2)))
-                    del aspirant1.fitness.values, aspirant2.fitness.values
-                    if acceptfunc(len(aspirant1)):
-                        producedpop.append(aspirant1)
-                        if producesizes:
-                            producedpopsizes.append(len(aspirant1))
-
-                    if len(producedpop) < n and acceptfunc(len(aspirant2)):
-                        producedpop.append(aspirant2)
-                        if producesizes:
-                            producedpopsizes.append(len(aspirant2))
-                else:
-                    aspirant = toolbox.clone(toolbox.select(population, 1)[0])
-                    if opRandom - cxpb < mutpb:
-                        # Mutation
-                        aspirant = toolbox.mutate(aspirant)[0]
-                        del aspirant.fitness.values
-                    if acceptfunc(len(aspirant)):
-                        producedpop.append(aspirant)
-                        if producesizes:
-                            producedpopsizes.append(len(aspirant))
-
-        if producesizes:
-            return producedpop, producedpopsizes
-        else:
-            return producedpop
+                aspirant = toolbox.clone(toolbox.select(population, 1)[0])
+                if opRandom - cxpb < mutpb:
+                    # Mutation
+                    aspirant = toolbox.mutate(aspirant)[0]
+                    del aspirant.fitness.values
+                produced.append(aspirant)
+        return produced
+
+    def _sizes(individuals):
+        return numpy.fromiter(map(len, individuals), dtype=int, count=len(individuals))
 
     def halflifefunc(x):
         return x * float(alpha) + beta
@@ -1043,76 +1939,106 @@ def harm(population, toolbox, cxpb, mutpb, ngen,
     if nbrindsmodel == -1:
         nbrindsmodel = max(2000, len(population))
 
+    kernel = numpy.array([0.1, 0.2, 0.4, 0.2, 0.1])
+
     logbook = tools.Logbook()
-    logbook.header = ['gen', 'nevals'] + (stats.fields if stats else [])
+    logbook.header = ['gen', 'nevals', 'modelling', 'evaluation'] + \
+                     (stats.fields if stats else [])
 
-    # Evaluate the individuals with an invalid fitness
-    invalid_ind = [ind for ind in population if not ind.fitness.valid]
-    fitnesses = toolbox.map(toolbox.evaluate, invalid_ind)
-    for ind, fit in zip(invalid_ind, fitnesses):
-        ind.fitness.values = fit
+    # Resume the evolution from the last checkpoint, if any
+    state = None
+    if checkpoint is not None:
+        state = checkpoint.restore(halloffame=halloffame)
 
-    if halloffame is not None:
-        halloffame.update(population)
+    if state is None:
+        # Evaluate the individuals with an invalid fitness
+        start = time.time()
+        invalid_ind = [ind for ind in population if not ind.fitness.valid]
+        fitnesses = toolbox.map(toolbox.evaluate, invalid_ind)
+        for ind, fit in zip(invalid_ind, fitnesses):
+            ind.fitness.values = fit
+        evaluation = time.time() - start
 
-    record = stats.compile(population) if stats else {}
-    logbook.record(gen=0, nevals=len(invalid_ind), **record)
-    if verbose:
-        print logbook.stream
+        if halloffame is not None:
+            halloffame.update(population)
+
+        record = stats.compile(population) if stats else {}
+        logbook.record(gen=0, nevals=len(invalid_ind), modelling=0.0,
+                       evaluation=evaluation, **record)
+        if verbose:
+            print logbook.stream
+        if checkpoint is not None:
+            checkpoint.update(0, population, logbook, halloffame=halloffame)
+        start_gen = 1
+    else:
+        population[:] = state["population"]
+        logbook = state["logbook"]
+        start_gen = state["generation"] + 1
 
     # Begin the generational process
-    for gen in range(1, ngen + 1):
+    for gen in range(start_gen, ngen + 1):
+        start = time.time()
         # Estimation population natural distribution of sizes
-        naturalpop, naturalpopsizes = _genpop(nbrindsmodel, producesizes=True)
-
-        naturalhist = [0] * (max(naturalpopsizes) + 3)
-        for indsize in naturalpopsizes:
-            # Kernel density estimation application
-            naturalhist[indsize] += 0.4
-            naturalhist[indsize - 1] += 0.2
-            naturalhist[indsize + 1] += 0.2
-            naturalhist[indsize + 2] += 0.1
-            if indsize - 2 >= 0:
-                naturalhist[indsize - 2] += 0.1
+        naturalpop = _natural(nbrindsmodel)
+        naturalsizes = _sizes(naturalpop)
+
+        # Kernel density estimation of the histogram of sizes
+        counts = numpy.bincount(naturalsizes, minlength=naturalsizes.max() + 3)
+        naturalhist = numpy.convolve(counts, kernel)[2:len(counts) + 2]
 
         # Normalization
-        naturalhist = [val * len(population) / nbrindsmodel for val in naturalhist]
+        naturalhist = naturalhist * len(population) / float(nbrindsmodel)
 
         # Cutoff point selection
-        sortednatural = sorted(naturalpop, key=lambda ind: ind.fitness)
+        sortednatural = sorted(range(len(naturalpop)), key=lambda i: naturalpop[i].fitness)
         cutoffcandidates = sortednatural[int(len(population) * rho - 1):]
         # Select the cutoff point, with an absolute minimum applied
         # to avoid weird cases in the first generations
-        cutoffsize = max(mincutoff, len(min(cutoffcandidates, key=len)))
+        cutoffsize = max(mincutoff, naturalsizes[cutoffcandidates].min())
 
         # Compute the target distribution
         def targetfunc(x):
             return (gamma * len(population) * math.log(2) /
-                    halflifefunc(x)) * math.exp(-math.log(2) *
-                                                (x - cutoffsize) / halflifefunc(x))
+                    halflifefunc(x)) * numpy.exp(-math.log(2) *
+                                                 (x - cutoffsize) / halflifefunc(x))
 
-        targethist = [naturalhist[binidx] if binidx <= cutoffsize else
-                      targetfunc(binidx) for binidx in range(len(naturalhist))]
+        bins = numpy.arange(len(naturalhist))
+        targethist = numpy.where(bins <= cutoffsize, naturalhist, targetfunc(bins))
 
         # Compute the probabilities distribution
-        probhist = [t / n if n > 0 else t for n, t in zip(naturalhist, targethist)]
-
-        def probfunc(s):
-            return probhist[s] if s < len(probhist) else targetfunc(s)
-
-        def acceptfunc(s):
-            return random.random() <= probfunc(s)
-
-        # Generate offspring using the acceptance probabilities
-        # previously computed
-        offspring = _genpop(len(population), pickfrom=naturalpop,
-                            acceptfunc=acceptfunc, producesizes=False)
+        probhist = numpy.divide(targethist, naturalhist, out=targethist.copy(),
+                                where=naturalhist > 0)
+
+        def probfunc(sizes):
+            inside = numpy.minimum(sizes, len(probhist) - 1)
+            return numpy.where(sizes < len(probhist), probhist[inside], targetfunc(sizes))
+
+        # Generate offspring using the acceptance probabilities previously
+        # computed, starting with the natural population, and generate new
+        # batches of aspirants as long as the offspring is incomplete
+        offspring = []
+        aspirants, sizes = naturalpop, naturalsizes
+        while True:
+            draws = numpy.array([random.random() for _ in aspirants])
+            accepted = draws <= probfunc(sizes)
+            offspring.extend(ind for ind, accept in zip(aspirants, accepted) if accept)
+            missing = len(population) - len(offspring)
+            if missing <= 0:
+                del offspring[len(population):]
+                break
+            rate = accepted.mean()
+            nbraspirants = min(nbrindsmodel, int(math.ceil(missing / rate))) if rate > 0 else nbrindsmodel
+            aspirants = _natural(nbraspirants)
+            sizes = _sizes(aspirants)
+        modelling = time.time() - start
 
         # Evaluate the individuals with an invalid fitness
+        start = time.time()
         invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
         fitnesses = toolbox.map(toolbox.evaluate, invalid_ind)
         for ind, fit in zip(invalid_ind, fitnesses):
             ind.fitness.values = fit
+        evaluation = time.time() - start
 
         # Update the hall of fame with the generated individuals
         if halloffame is not None:
@@ -1123,10 +2049,14 @@ def harm(population, toolbox, cxpb, mutpb, ngen,
 
         # Append the current generation statistics to the logbook
         record = stats.compile(population) if stats else {}
-        logbook.record(gen=gen, nevals=len(invalid_ind), **record)
+        logbook.record(gen=gen, nevals=len(invalid_ind), modelling=modelling,
+                       evaluation=evaluation, **record)
         if verbose:
             print logbook.stream
 
+        if checkpoint is not None:
+            checkpoint.update(gen, population, logbook, halloffame=halloffame)
+
     return population, logbook
 
 
@@ -1207,7 +2137,168 @@ def graph(expr):
 # GSGP Mutation                      #
 ######################################
 
-def mutSemantic(individual, gen_func=genGrow, pset=None, ms=None, min=2, max=6):
+class LineageStore(object):
+    """Store of the semantics and the lineage of the individuals evolved by
+    the geometric semantic operators :func:`mutSemantic` and
+    :func:`cxSemantic`. The semantics of an individual, its output vector on
+    the fitness cases, is computed from the semantics of its parents and of
+    the random trees of the operator, so that the offspring expressions,
+    which grow with every application, are never evaluated. Given a store,
+    the operators record the offspring in it instead of growing the trees,
+    the full expression being materialized only when exported with
+    :meth:`expression`. ::
+
+        store = gp.LineageStore(pset, (samples,))
+        toolbox.register("mutate", gp.mutSemantic, pset=pset, store=store)
+        toolbox.register("mate", gp.cxSemantic, pset=pset, store=store)
+
+        def evalSemantics(individual):
+            return numpy.mean((store.semantics(individual) - values)**2),
+
+        hof = tools.HallOfFame(1, similar=store.similar)
+        for gen in range(NGEN):
+            ...
+            hof.update(population)
+            store.prune(population, keep=hof)
+
+    :param pset: Primitive set of the trees, containing the ``lf``, ``add``,
+                 ``sub`` and ``mul`` primitives required by the operators.
+    :param args: The sequence of the arguments of the trees, the
+                 :mod:`numpy` arrays of the fitness cases.
+
+    An individual enters the store with its current tree the first time it
+    is given to the store, its identifier in the store is kept in its
+    :attr:`lineage` attribute and copied with it by the clone. The primitives
+    of *pset* must work on :mod:`numpy` arrays. The records of the
+    individuals that are no longer part of the population are dropped by
+    :meth:`prune`, which should be called once per generation with the
+    individuals kept elsewhere, such as in a hall of fame, given as *keep*.
+
+    The operators leave the trees unchanged when given a store, the trees of
+    the descendants of an individual are therefore all equal. The hall of
+    fame and other containers comparing individuals must use
+    :meth:`similar`, which compares the lineages, instead of the equality of
+    the trees.
+    """
+
+    def __init__(self, pset, args):
+        self.pset = pset
+        self.args = tuple(args)
+        self.shape = numpy.broadcast(*self.args).shape if len(self.args) > 0 else ()
+        self.records = dict()
+        self._semantics = dict()
+        self._next = 0
+
+    def _evaluate(self, tree):
+        func = interpret(tree, self.pset)
+        if len(self.pset.arguments) > 0:
+            func = func(*self.args)
+        return numpy.asarray(func, dtype=float) * numpy.ones(self.shape)
+
+    def _record(self, parts, semantics):
+        size = sum(self.records[part][0] if isinstance(part, int) else len(part)
+                   for part in parts)
+        lineage = self._next
+        self._next += 1
+        self.records[lineage] = (size, parts)
+        self._semantics[lineage] = semantics
+        return lineage
+
+    def add(self, tree):
+        """Record the *tree* and return its lineage identifier."""
+        return self._record([list(tree)], self._evaluate(tree))
+
+    def lineage(self, individual):
+        """Return the lineage identifier of *individual*, recording its tree
+        if it is not in the store yet.
+        """
+        lineage = getattr(individual, "lineage", None)
+        if lineage is None:
+            lineage = individual.lineage = self.add(individual)
+        return lineage
+
+    def mutation(self, parent, tr1, tr2, ms):
+        """Record the semantic mutation of the lineage *parent* by the trees
+        *tr1* and *tr2*, wrapped in a logistic function, and the mutation
+        step *ms*. Return the lineage identifier of the offspring.
+        """
+        context = self.pset.context
+        diff = context["sub"](self._evaluate(tr1), self._evaluate(tr2))
+        semantics = context["add"](self._semantics[parent], context["mul"](ms, diff))
+        mapping = self.pset.mapping
+        return self._record([[mapping["add"]], parent,
+                             [mapping["mul"], Terminal(ms, False, object), mapping["sub"]] + tr1 + tr2],
+                            semantics)
+
+    def crossover(self, parent1, parent2, tr):
+        """Record the semantic crossovers of the lineages *parent1* and
+        *parent2* by the tree *tr*, wrapped in a logistic function. Return
+        the lineage identifiers of the two offspring.
+        """
+        context = self.pset.context
+        mapping = self.pset.mapping
+        str_ = self._evaluate(tr)
+        complement = context["sub"](1.0, str_)
+        middle = tr + [mapping["mul"], mapping["sub"], Terminal(1.0, False, object)] + tr
+
+        offspring = []
+        for first, second in ((parent1, parent2), (parent2, parent1)):
+            semantics = context["add"](context["mul"](self._semantics[first], str_),
+                                       context["mul"](complement, self._semantics[second]))
+            offspring.append(self._record([[mapping["add"], mapping["mul"]], first,
+                                           middle, second], semantics))
+        return tuple(offspring)
+
+    def semantics(self, individual):
+        """Return the output vector of *individual* on the fitness cases."""
+        return self._semantics[self.lineage(individual)]
+
+    def size(self, individual):
+        """Return the number of nodes of the expression of *individual*."""
+        return self.records[self.lineage(individual)][0]
+
+    def expression(self, individual):
+        """Return the full expression of *individual* as a
+        :class:`PrimitiveTree`.
+        """
+        nodes = []
+        parts = [self.lineage(individual)]
+        while len(parts) > 0:
+            part = parts.pop()
+            if isinstance(part, int):
+                parts.extend(reversed(self.records[part][1]))
+            else:
+                nodes.extend(part)
+        return PrimitiveTree(nodes)
+
+    def similar(self, ind1, ind2):
+        """Return whether *ind1* and *ind2* have the same lineage, the
+        similarity to give to a :class:`~deap.tools.HallOfFame`.
+        """
+        return self.lineage(ind1) == self.lineage(ind2)
+
+    def prune(self, population, keep=()):
+        """Drop the records that are not in the lineage of the individuals of
+        *population* and *keep*, and the semantics of the other individuals.
+
+        :param population: The individuals of the current population.
+        :param keep: Other individuals to keep, such as the members of a
+                     hall of fame, optional.
+        """
+        alive = set(self.lineage(ind) for ind in chain(population, keep))
+        reachable = set()
+        stack = list(alive)
+        while len(stack) > 0:
+            lineage = stack.pop()
+            if lineage not in reachable:
+                reachable.add(lineage)
+                stack.extend(part for part in self.records[lineage][1]
+                             if isinstance(part, int))
+        self.records = dict((lineage, self.records[lineage]) for lineage in reachable)
+        self._semantics = dict((lineage, self._semantics[lineage]) for lineage in alive)
+
+
+def mutSemantic(individual, gen_func=genGrow, pset=None, ms=None, min=2, max=6, store=None):
     """
     Implementation of the Semantic Mutation operator. [Geometric semantic genetic programming, Moraglio et al., 2012]
     mutated_individual = individual + logistic * (random_tree1 - random_tree2)
@@ -1218,8 +2309,12 @@ def mutSemantic(individual, gen_func=genGrow, pset=None, ms=None, min=2, max=6):
     :param ms: Mutation Step
     :param min: min depth of the random tree
     :param max: max depth of the random tree
+    :param store: :class:`LineageStore` recording the mutation instead of growing the tree, optional
     :return: mutated individual
 
+    With a *store*, the tree of the individual is left unchanged, use
+    :meth:`LineageStore.similar` to compare the individuals.
+
     The mutated contains the original individual
 
         >>> import operator
@@ -1246,6 +2341,9 @@ def mutSemantic(individual, gen_func=genGrow, pset=None, ms=None, min=2, max=6):
     tr2.insert(0, pset.mapping['lf'])
     if ms is None:
         ms = random.uniform(0, 2)
+    if store is not None:
+        individual.lineage = store.mutation(store.lineage(individual), tr1, tr2, ms)
+        return individual,
     mutation_step = Terminal(ms, False, object)
     # Create the root
 
@@ -1262,7 +2360,7 @@ def mutSemantic(individual, gen_func=genGrow, pset=None, ms=None, min=2, max=6):
     return new_ind,
 
 
-def cxSemantic(ind1, ind2, gen_func=genGrow, pset=None, min=2, max=6):
+def cxSemantic(ind1, ind2, gen_func=genGrow, pset=None, min=2, max=6, store=None):
     """
     Implementation of the Semantic Crossover operator [Geometric semantic genetic programming, Moraglio et al., 2012]
     offspring1 = random_tree1 * ind1 + (1 - random_tree1) * ind2
@@ -1274,8 +2372,12 @@ def cxSemantic(ind1, ind2, gen_func=genGrow, pset=None, min=2, max=6):
     :param pset: Primitive Set, which contains terminal and operands to be used during the evolution
     :param min: min depth of the random tree
     :param max: max depth of the random tree
+    :param store: :class:`LineageStore` recording the crossover instead of growing the trees, optional
     :return: offsprings
 
+    With a *store*, the trees of the individuals are left unchanged, use
+    :meth:`LineageStore.similar` to compare the individuals.
+
     The mutated offspring contains parents
 
         >>> import operator
@@ -1301,6 +2403,10 @@ def cxSemantic(ind1, ind2, gen_func=genGrow, pset=None, min=2, max=6):
 
     tr = gen_func(pset, min, max)
     tr.insert(0, pset.mapping['lf'])
+    if store is not None:
+        ind1.lineage, ind2.lineage = store.crossover(store.lineage(ind1), store.lineage(ind2), tr)
+        return ind1, ind2
+
     new_ind1 = ind1
     new_ind1.insert(0, pset.mapping["mul"])
     new_ind1.insert(0, pset.mapping["add"])
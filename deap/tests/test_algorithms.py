@@ -14,7 +14,12 @@
 #    License along with DEAP. If not, see <http://www.gnu.org/licenses/>.
 
 from nose import with_setup
+from nose.plugins.skip import SkipTest
+import multiprocessing
+import os
 import random
+import shutil
+import tempfile
 
 import numpy
 
@@ -231,3 +236,246 @@ def test_nsga3():
 
     for ind in pop:
         assert not (any(numpy.asarray(ind) < BOUND_LOW) or any(numpy.asarray(ind) > BOUND_UP))
+
+@with_setup(setup_func_single_obj, teardown_func)
+def test_evaluation_cache():
+    NDIM = 10
+    evaluations = []
+
+    def evaluate(individual):
+        evaluations.append(1)
+        return sum(individual),
+
+    toolbox = base.Toolbox()
+    toolbox.register("attr_bool", random.randint, 0, 1)
+    toolbox.register("individual", tools.initRepeat, creator.__dict__[INDCLSNAME], toolbox.attr_bool, NDIM)
+    toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+    toolbox.register("evaluate", evaluate)
+    toolbox.register("mate", tools.cxTwoPoint)
+    toolbox.register("mutate", tools.mutFlipBit, indpb=0.05)
+    toolbox.register("select", tools.selTournament, tournsize=3)
+
+    random.seed(64)
+    pop = toolbox.population(n=50)
+    pop, logbook = algorithms.eaSimple(pop, toolbox, 0.5, 0.2, 10, verbose=False)
+    expected = [ind.fitness.values for ind in pop]
+
+    del evaluations[:]
+    cache = tools.EvaluationCache(maxsize=100)
+    random.seed(64)
+    pop = toolbox.population(n=50)
+    pop, logbook = algorithms.eaSimple(pop, toolbox, 0.5, 0.2, 10, verbose=False, cache=cache)
+
+    assert [ind.fitness.values for ind in pop] == expected
+    assert len(evaluations) == cache.misses
+    assert cache.hits > 0
+    assert len(cache) <= 100
+    assert logbook.select("nevals") == [h + m for h, m in zip(*logbook.select("hits", "misses"))]
+
+@with_setup(setup_func_single_obj, teardown_func)
+def test_checkpoint_resume():
+    NDIM = 10
+    tmpdir = tempfile.mkdtemp()
+
+    toolbox = base.Toolbox()
+    toolbox.register("attr_float", random.uniform, -1.0, 1.0)
+    toolbox.register("individual", tools.initRepeat, creator.__dict__[INDCLSNAME], toolbox.attr_float, NDIM)
+    toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+    toolbox.register("evaluate", benchmarks.sphere)
+    toolbox.register("mate", tools.cxBlend, alpha=0.5)
+    toolbox.register("mutate", tools.mutGaussian, mu=0.0, sigma=0.1, indpb=0.2)
+    toolbox.register("select", tools.selTournament, tournsize=3)
+
+    def run(ngen, checkpoint=None, seed=42):
+        random.seed(seed)
+        pop = toolbox.population(n=30)
+        hof = tools.HallOfFame(3)
+        pop, logbook = algorithms.eaMuPlusLambda(pop, toolbox, 30, 60, 0.5, 0.3, ngen, halloffame=hof,
+                                                 verbose=False, checkpoint=checkpoint)
+        return pop, hof, logbook
+
+    try:
+        pop, hof, logbook = run(12)
+
+        checkpoint = tools.Checkpoint(os.path.join(tmpdir, "cp.pkl.gz"), freq=4)
+        run(6, checkpoint)
+        assert checkpoint.load()["generation"] == 4
+        # A different seed shows that the random state is restored
+        pop2, hof2, logbook2 = run(12, checkpoint, seed=0)
+
+        assert [ind.fitness.values for ind in pop2] == [ind.fitness.values for ind in pop]
+        assert [list(ind) for ind in hof2] == [list(ind) for ind in hof]
+        assert logbook2.select("nevals") == logbook.select("nevals")
+    finally:
+        shutil.rmtree(tmpdir)
+
+class _Slotted(object):
+    # Object without a __dict__ whose state can not be restored in place
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+def test_checkpoint_restore_slots():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        checkpoint = tools.Checkpoint(os.path.join(tmpdir, "cp.pkl"), slotted=_Slotted(1))
+        checkpoint.save(0, [], tools.Logbook())
+        try:
+            checkpoint.restore()
+        except TypeError:
+            pass
+        else:
+            assert False, "Restoring an object without __dict__ did not fail."
+    finally:
+        shutil.rmtree(tmpdir)
+
+@with_setup(setup_func_single_obj, teardown_func)
+def test_checkpoint_resume_strategy():
+    NDIM = 5
+    tmpdir = tempfile.mkdtemp()
+
+    def run(ngen, checkpoint=None):
+        numpy.random.seed(42)
+        strategy = cma.Strategy(centroid=[5.0]*NDIM, sigma=1.0)
+        toolbox = base.Toolbox()
+        toolbox.register("evaluate", benchmarks.sphere)
+        toolbox.register("generate", strategy.generate, creator.__dict__[INDCLSNAME])
+        toolbox.register("update", strategy.update)
+        if checkpoint is not None:
+            checkpoint.objects["strategy"] = strategy
+        pop, logbook = algorithms.eaGenerateUpdate(toolbox, ngen, verbose=False, checkpoint=checkpoint)
+        return pop, strategy
+
+    try:
+        pop, strategy = run(20)
+
+        checkpoint = tools.Checkpoint(os.path.join(tmpdir, "cp.pkl"), freq=5)
+        run(13, checkpoint)
+        pop2, strategy2 = run(20, checkpoint)
+
+        assert [ind.fitness.values for ind in pop2] == [ind.fitness.values for ind in pop]
+        assert numpy.all(strategy2.centroid == strategy.centroid)
+        assert strategy2.sigma == strategy.sigma
+    finally:
+        shutil.rmtree(tmpdir)
+
+class _Future(object):
+    # Minimal future of an already completed call
+    def __init__(self, result):
+        self._result = result
+
+    def result(self):
+        return self._result
+
+    def add_done_callback(self, callback):
+        callback(self)
+
+class _SynchronousExecutor(object):
+    # Minimal executor running each call on submission
+    def __init__(self):
+        self.calls = 0
+
+    def submit(self, func, *args):
+        self.calls += 1
+        return _Future(func(*args))
+
+def run_steady_state(executor):
+    NDIM = 5
+    MU = 20
+    NEVALS = 2000
+
+    toolbox = base.Toolbox()
+    toolbox.register("attr_float", random.uniform, -5.0, 5.0)
+    toolbox.register("individual", tools.initRepeat, creator.__dict__[INDCLSNAME], toolbox.attr_float, NDIM)
+    toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+    toolbox.register("evaluate", benchmarks.sphere)
+    toolbox.register("mate", tools.cxBlend, alpha=0.5)
+    toolbox.register("mutate", tools.mutGaussian, mu=0.0, sigma=0.3, indpb=0.5)
+    toolbox.register("select", tools.selBest)
+
+    pop = toolbox.population(n=MU)
+    pop, logbook = algorithms.eaSteadyState(pop, toolbox, 0.5, 0.5, NEVALS, executor, 4, verbose=False)
+
+    assert len(pop) == MU
+    assert sum(logbook.select("nevals")) == MU + NEVALS
+    assert all(0.0 <= u <= 1.0 for u in logbook.select("utilization"))
+    best, = tools.selBest(pop, k=1)
+    assert best.fitness.values < (1e-2,), "Steady-state algorithm did not converge properly."
+    return MU + NEVALS
+
+@with_setup(setup_func_single_obj, teardown_func)
+def test_steady_state():
+    executor = _SynchronousExecutor()
+    nevals = run_steady_state(executor)
+    assert executor.calls == nevals
+
+@with_setup(setup_func_single_obj, teardown_func)
+def test_steady_state_threads():
+    try:
+        from concurrent.futures import ThreadPoolExecutor
+    except ImportError:
+        raise SkipTest("concurrent.futures is not available")
+
+    # The evaluations complete in worker threads, in any order
+    executor = ThreadPoolExecutor(max_workers=4)
+    try:
+        run_steady_state(executor)
+    finally:
+        executor.shutdown()
+
+
+def _type_name(individual):
+    return type(individual).__name__
+
+@with_setup(setup_func_single_obj, teardown_func)
+def test_parallel_evaluator():
+    NDIM = 5
+
+    toolbox = base.Toolbox()
+    toolbox.register("attr_float", random.uniform, -5.0, 5.0)
+    toolbox.register("individual", tools.initRepeat, creator.__dict__[INDCLSNAME], toolbox.attr_float, NDIM)
+    toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+    toolbox.register("evaluate", benchmarks.sphere)
+
+    pop = toolbox.population(n=101)
+    pool = multiprocessing.Pool(processes=2)
+    try:
+        evaluator = tools.ParallelEvaluator(pool.map, workers=2)
+        assert evaluator(_type_name, pop) == ["list"] * len(pop)
+
+        evaluator.evaluate(toolbox.evaluate, pop)
+        assert [ind.fitness.values for ind in pop] == map(toolbox.evaluate, pop)
+        assert evaluator.latency is not None
+
+        evaluator.chunksize = 7
+        assert evaluator(toolbox.evaluate, pop) == map(toolbox.evaluate, pop)
+    finally:
+        pool.close()
+        pool.join()
+
+def test_ea_simple_batch():
+    NDIM = 100
+    numpy.random.seed(64)
+    pop = tools.MatrixPopulation(numpy.random.randint(0, 2, (300, NDIM)), weights=(1.0,))
+
+    toolbox = base.Toolbox()
+    toolbox.register("evaluate", numpy.sum, axis=1, keepdims=True)
+    toolbox.register("mate", tools.cxTwoPointBatch)
+    toolbox.register("mutate", tools.mutFlipBitBatch, indpb=0.05)
+    toolbox.register("select", tools.selTournamentBatch, tournsize=3)
+
+    hof = tools.HallOfFame(1, similar=numpy.array_equal)
+    pop, logbook = algorithms.eaSimpleBatch(pop, toolbox, 0.5, 0.2, 40, halloffame=hof, verbose=False)
+
+    assert numpy.all(pop.valid)
+    assert numpy.all(pop.fitnesses[:, 0] == pop.genotypes.sum(axis=1))
+    best = hof[0]
+    assert best.fitness.values == (sum(best),)
+    assert best.fitness.values > (NDIM * 0.9,), "Batched algorithm did not converge properly."
+
+    # Row views write through to the matrices
+    ind = pop[0]
+    ind[:] = 0
+    del ind.fitness.values
+    assert not pop.valid[0] and pop.genotypes[0].sum() == 0
@@ -0,0 +1,133 @@
+#    This file is part of DEAP.
+#
+#    DEAP is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as
+#    published by the Free Software Foundation, either version 3 of
+#    the License, or (at your option) any later version.
+#
+#    DEAP is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public
+#    License along with DEAP. If not, see <http://www.gnu.org/licenses/>.
+
+from nose import with_setup
+import random
+import threading
+
+import numpy
+
+from deap import base
+from deap import creator
+from deap import tools
+
+FITCLSNAME = "FIT_TYPE"
+INDCLSNAME = "IND_TYPE"
+
+
+def setup_func():
+    creator.create(FITCLSNAME, base.Fitness, weights=(-1.0, 1.0, -1.0))
+    creator.create(INDCLSNAME, list, fitness=creator.__dict__[FITCLSNAME])
+
+def teardown_func():
+    # Messy way to remove a class from the creator
+    del creator.__dict__[FITCLSNAME]
+    del creator.__dict__[INDCLSNAME]
+
+def random_population(n, nobj=3, levels=5):
+    # Few distinct values per objective to get duplicated fitnesses
+    population = []
+    for _ in range(n):
+        ind = creator.__dict__[INDCLSNAME]()
+        ind.fitness.values = tuple(random.randint(0, levels) for _ in range(nobj))
+        population.append(ind)
+    return population
+
+def front_ids(fronts):
+    return [sorted(id(ind) for ind in front) for front in fronts]
+
+@with_setup(setup_func, teardown_func)
+def test_sort_array_nondominated():
+    random.seed(42)
+    old_block_size = tools.emo.ND_BLOCK_SIZE
+    try:
+        for block_size in (old_block_size, 16):
+            tools.emo.ND_BLOCK_SIZE = block_size
+            for n, k in ((100, 100), (100, 50), (57, 57), (1, 1)):
+                pop = random_population(n)
+                expected = tools.sortNondominated(pop, k)
+                result = tools.sortArrayNondominated(pop, k)
+                assert front_ids(result) == front_ids(expected)
+
+                expected = tools.sortNondominated(pop, k, first_front_only=True)
+                result = tools.sortArrayNondominated(pop, k, first_front_only=True)
+                assert front_ids(result) == front_ids(expected)
+    finally:
+        tools.emo.ND_BLOCK_SIZE = old_block_size
+
+    assert tools.sortArrayNondominated(random_population(10), 0) == []
+
+@with_setup(setup_func, teardown_func)
+def test_array_crowding_dist():
+    random.seed(42)
+    pop = random_population(100)
+    fronts = tools.sortNondominated(pop, len(pop))
+    distances = tools.arrayCrowdingDist(fronts)
+
+    for front in fronts:
+        tools.emo.assignCrowdingDist(front)
+    expected = [ind.fitness.crowding_dist for front in fronts for ind in front]
+    assert distances.tolist() == expected
+
+    chosen = tools.selTournamentDCD(pop, 40, crowding_dist=[0.0] * len(pop))
+    assert len(chosen) == 40
+
+@with_setup(setup_func, teardown_func)
+def test_hypervolume_contributions():
+    random.seed(42)
+    pop = random_population(30)
+    ref = numpy.array([6.0, 1.0, 6.0])
+    wobj = numpy.array([ind.fitness.wvalues for ind in pop]) * -1
+    total = tools.indicator.hv.hypervolume(wobj.copy(), ref)
+
+    contribs = tools.hypervolume_contributions(pop, ref=ref)
+    for i, contrib in enumerate(contribs):
+        others = numpy.delete(wobj, i, axis=0)
+        expected = total - tools.indicator.hv.hypervolume(others, ref)
+        assert abs(contrib - expected) < 1e-9
+
+def test_hypervolume_threads():
+    numpy.random.seed(42)
+    points = numpy.random.rand(50, 3)
+    ref = numpy.ones(3)
+    expected = tools.indicator.hv.hypervolume(points.copy(), ref)
+
+    results = []
+    def compute():
+        results.append(tools.indicator.hv.hypervolume(points.copy(), ref))
+
+    threads = [threading.Thread(target=compute) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(abs(r - expected) < 1e-12 for r in results)
+    assert len(results) == 4
+
+@with_setup(setup_func, teardown_func)
+def test_hypervolume_approximation():
+    from deap.benchmarks.tools import hypervolume
+    random.seed(42)
+    pop = random_population(30)
+    ref = numpy.array([6.0, 1.0, 6.0])
+
+    exact = hypervolume(pop, ref)
+    approx = hypervolume(pop, ref, samples=200000, seed=1)
+    assert abs(approx - exact) < 0.01 * exact
+    assert approx == hypervolume(pop, ref, samples=200000, seed=1)
+
+    contribs = tools.hypervolume_contributions(pop, ref=ref)
+    approx = tools.hypervolume_contributions(pop, ref=ref, samples=200000, seed=1)
+    assert numpy.all(numpy.abs(approx - contribs) < 0.01 * exact)
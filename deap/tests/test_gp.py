@@ -0,0 +1,363 @@
+#    This file is part of DEAP.
+#
+#    DEAP is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as
+#    published by the Free Software Foundation, either version 3 of
+#    the License, or (at your option) any later version.
+#
+#    DEAP is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public
+#    License along with DEAP. If not, see <http://www.gnu.org/licenses/>.
+
+import copy
+import operator
+import pickle
+import random
+import threading
+import unittest
+
+import numpy
+
+from deap import base
+from deap import creator
+from deap import gp
+from deap import tools
+
+
+def rand101():
+    return random.randint(-1, 1)
+
+def make_pset():
+    pset = gp.PrimitiveSet("MAIN", 1)
+    pset.addPrimitive(operator.add, 2)
+    pset.addPrimitive(operator.sub, 2)
+    pset.addPrimitive(operator.mul, 2)
+    pset.addPrimitive(operator.neg, 1)
+    pset.addEphemeralConstant("test_gp_rand101", rand101)
+    pset.renameArguments(ARG0="x")
+    return pset
+
+
+class GPTest(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)
+        self.pset = make_pset()
+
+    def test_compile_cache(self):
+        trees = [gp.PrimitiveTree(gp.genHalfAndHalf(self.pset, 1, 5)) for _ in range(50)]
+        expected = [gp.compile(tree, self.pset)(3) for tree in trees]
+
+        self.pset.compile_cache = gp.CompileCache(maxsize=20)
+        for _ in range(3):
+            for tree, value in zip(trees, expected):
+                self.assertEqual(gp.compile(tree, self.pset)(3), value)
+                # A copy of the tree shares the compiled function
+                self.assertEqual(gp.compile(gp.PrimitiveTree(tree), self.pset)(3), value)
+
+        cache = self.pset.compile_cache
+        self.assertTrue(len(cache) <= 20)
+        self.assertEqual(cache.hits + cache.misses, 300)
+        self.assertTrue(cache.hit_rate >= 0.5)
+
+        self.pset.renameArguments(x="y")
+        self.assertEqual(len(cache), 0)
+
+        # A cached None is a hit
+        cache.lookup("none", lambda: None)
+        self.assertIsNone(cache.lookup("none", lambda: 1))
+        self.assertEqual(cache.hits, 1)
+
+    def test_compile_cache_no_arguments(self):
+        # The trees of a primitive set without arguments are evaluated by
+        # the compilation, each compilation must evaluate them again
+        calls = []
+        def count(x):
+            calls.append(x)
+            return len(calls)
+
+        pset = gp.PrimitiveSet("NOARGS", 0)
+        pset.addPrimitive(count, 1)
+        pset.addTerminal(0)
+        pset.compile_cache = gp.CompileCache()
+        tree = gp.PrimitiveTree.from_string("count(count(0))", pset)
+        self.assertEqual(gp.compile(tree, pset), 2)
+        self.assertEqual(gp.compile(tree, pset), 4)
+        self.assertEqual(len(pset.compile_cache), 0)
+        self.assertEqual(gp.compileADF([tree], [pset]), 6)
+
+    def test_interpret(self):
+        samples = numpy.linspace(-1, 1, 50)
+        for _ in range(50):
+            tree = gp.PrimitiveTree(gp.genHalfAndHalf(self.pset, 1, 6))
+            expected = gp.compile(tree, self.pset)(samples)
+            self.assertTrue(numpy.all(gp.interpret(tree, self.pset)(samples) == expected))
+
+        # Trees too high for the Python parser are interpreted
+        neg = self.pset.mapping["neg"]
+        tree = gp.PrimitiveTree([neg] * 1001 + [self.pset.mapping["x"]])
+        self.assertTrue(numpy.all(gp.interpret(tree, self.pset)(samples) == -samples))
+
+    def test_evaluate_population(self):
+        samples = numpy.linspace(-1, 1, 50)
+        population = [gp.PrimitiveTree(gp.genHalfAndHalf(self.pset, 1, 6)) for _ in range(50)]
+        population.extend(population[:10])
+        expected = [gp.compile(tree, self.pset)(samples) for tree in population]
+
+        # A cap smaller than a single result forces the recomputations
+        for maxbytes in (None, 0):
+            outputs = gp.evaluatePopulation(population, self.pset, (samples,), maxbytes)
+            self.assertEqual(len(outputs), len(population))
+            for output, value in zip(outputs, expected):
+                self.assertTrue(numpy.all(output == value))
+
+    def test_compact_tree(self):
+        random.seed(42)
+        trees = [gp.PrimitiveTree(gp.genHalfAndHalf(self.pset, 1, 5)) for _ in range(20)]
+        compacts = [gp.CompactTree(tree, self.pset) for tree in trees]
+        expr = lambda pset, type_: gp.genFull(pset, 0, 2, type_)
+
+        # The operators give the same trees on both representations
+        for i in range(10):
+            state = random.getstate()
+            for tree in (trees, compacts):
+                random.setstate(state)
+                for j in range(0, len(tree), 2):
+                    gp.cxOnePoint(tree[j], tree[j + 1])
+                for ind in tree:
+                    gp.mutUniform(ind, expr, self.pset)
+                    gp.mutInsert(ind, self.pset)
+                    gp.mutShrink(ind)
+
+        for tree, compact in zip(trees, compacts):
+            self.assertEqual(str(tree), str(compact))
+            self.assertEqual(tree.height, compact.height)
+            self.assertEqual(gp.PrimitiveTree(compact), tree)
+            for i in range(len(tree)):
+                self.assertEqual(tree.searchSubtree(i), compact.searchSubtree(i))
+
+        clone = copy.deepcopy(compacts[0])
+        clone[clone.searchSubtree(0)] = [self.pset.mapping["x"]]
+        self.assertNotEqual(clone, compacts[0])
+        self.assertEqual(pickle.loads(pickle.dumps(compacts, 2)), compacts)
+
+    def test_compact_tree_pickle(self):
+        creator.create("CompactIndividual", gp.CompactTree, pset=self.pset)
+        try:
+            random.seed(42)
+            size = len(self.pset.node_table)
+            trees = [gp.PrimitiveTree(gp.genHalfAndHalf(self.pset, 2, 6)) for _ in range(500)]
+            compacts = [creator.CompactIndividual(tree) for tree in trees]
+            # The ephemeral constants are not interned
+            self.assertLessEqual(len(self.pset.node_table), size + 5)
+
+            for tree, compact in zip(trees, compacts):
+                self.assertLessEqual(len(pickle.dumps(compact, 2)), 2 * len(pickle.dumps(tree, 2)))
+            self.assertLess(len(pickle.dumps(compacts, 2)), len(pickle.dumps(trees, 2)))
+
+            loaded = pickle.loads(pickle.dumps(compacts, 2))
+            self.assertEqual(loaded, compacts)
+            self.assertTrue(all(tree.table is self.pset.node_table for tree in loaded))
+
+            # Without a class primitive set, the tree goes to the last table
+            # of the same name
+            plain = pickle.loads(pickle.dumps(gp.CompactTree(trees[0], self.pset), 2))
+            self.assertIs(plain.table, self.pset.node_table)
+        finally:
+            del creator.CompactIndividual
+
+    def test_deepcopy_tree(self):
+        class Fitness(base.Fitness):
+            weights = (-1.0,)
+
+        tree = gp.PrimitiveTree(gp.genFull(self.pset, 2, 3))
+        tree.fitness = Fitness((1.0,))
+        tree.history = [1, 2]
+        clone = copy.deepcopy(tree)
+        self.assertEqual(clone, tree)
+        self.assertTrue(all(a is b for a, b in zip(clone, tree)))
+        self.assertEqual(clone.fitness.values, (1.0,))
+        self.assertIsInstance(clone.fitness, Fitness)
+
+        del clone.fitness.values
+        clone.history.append(3)
+        self.assertTrue(tree.fitness.valid)
+        self.assertEqual(tree.history, [1, 2])
+
+        # The instance attributes of a creator fitness are initialized
+        creator.create("ExtraFitness", base.Fitness, weights=(1.0,), extra=list)
+        try:
+            tree.fitness = creator.ExtraFitness((1.0,))
+            clone = copy.deepcopy(tree)
+            self.assertEqual(clone.fitness.extra, [])
+            self.assertIsNot(clone.fitness.extra, tree.fitness.extra)
+            self.assertEqual(clone.fitness.values, (1.0,))
+        finally:
+            del creator.ExtraFitness
+
+    def test_simplify(self):
+        self.pset.addRewriteRule("sub(X, X)", "0")
+        self.pset.addRewriteRule("mul(X, 1)", "X")
+        self.pset.addRewriteRule("neg(neg(X))", "X")
+        self.assertRaises(ValueError, self.pset.addRewriteRule, "mul(X, 0)", "Y")
+
+        tree = gp.PrimitiveTree.from_string("add(mul(neg(neg(x)), add(1, 0)), sub(x, x))", self.pset)
+        self.assertEqual(str(gp.simplify(tree, self.pset)), "add(x, 0)")
+        self.assertEqual(str(gp.simplify(tree, self.pset, fold=False)), "add(mul(x, add(1, 0)), 0)")
+        self.assertEqual(len(tree), 11)
+
+        random.seed(42)
+        for _ in range(50):
+            tree = gp.PrimitiveTree(gp.genHalfAndHalf(self.pset, 2, 6))
+            simplified = gp.simplify(tree, self.pset)
+            self.assertLessEqual(len(simplified), len(tree))
+            for x in (-2, 0, 3):
+                self.assertEqual(gp.compile(tree, self.pset)(x),
+                                 gp.compile(simplified, self.pset)(x))
+            gp.mutSimplify(tree, self.pset)
+            self.assertEqual(tree, simplified)
+
+    def test_lineage_store(self):
+        pset = gp.PrimitiveSet("MAIN", 1)
+        pset.addPrimitive(operator.add, 2)
+        pset.addPrimitive(operator.sub, 2)
+        pset.addPrimitive(operator.mul, 2)
+        pset.addPrimitive(lambda x: 1 / (1 + numpy.exp(-x)), 1, name="lf")
+        pset.addTerminal(1.0)
+        samples = numpy.linspace(-1, 1, 20)
+        store = gp.LineageStore(pset, (samples,))
+
+        random.seed(42)
+        population = [gp.PrimitiveTree(gp.genGrow(pset, 1, 3)) for _ in range(4)]
+        for _ in range(3):
+            population = [copy.deepcopy(ind) for ind in population]
+            gp.cxSemantic(population[0], population[1], pset=pset, max=2, store=store)
+            gp.mutSemantic(population[2], pset=pset, max=2, store=store)
+            store.prune(population)
+
+        for ind in population:
+            expr = store.expression(ind)
+            self.assertEqual(len(expr), store.size(ind))
+            self.assertTrue(numpy.allclose(gp.compile(expr, pset)(samples), store.semantics(ind)))
+        self.assertEqual(len(store._semantics), len(set(ind.lineage for ind in population)))
+
+        # The members of a hall of fame are kept by the pruning
+        class Fitness(base.Fitness):
+            weights = (-1.0,)
+
+        hof = tools.HallOfFame(3, similar=store.similar)
+        for gen in range(5):
+            population = [copy.deepcopy(ind) for ind in population]
+            for ind in population:
+                gp.mutSemantic(ind, pset=pset, max=2, store=store)
+                ind.fitness = Fitness((numpy.mean(store.semantics(ind) ** 2),))
+            hof.update(population)
+            store.prune(population, keep=hof)
+
+        self.assertEqual(len(hof), 3)
+        self.assertEqual(len(set(ind.lineage for ind in hof)), 3)
+        for ind in hof:
+            expr = store.expression(ind)
+            self.assertTrue(numpy.allclose(gp.compile(expr, pset)(samples), store.semantics(ind)))
+
+    def test_typed_feasibility(self):
+        class Boolean(object):
+            pass
+
+        # The Boolean type has no terminal, it takes one level to complete
+        pset = gp.PrimitiveSetTyped("MAIN", [float], Boolean)
+        pset.addPrimitive(operator.lt, [float, float], Boolean)
+        pset.addPrimitive(operator.and_, [Boolean, Boolean], Boolean)
+        pset.addPrimitive(operator.add, [float, float], float)
+        self.assertEqual(pset.minHeight(Boolean), 1)
+        self.assertEqual(pset.minHeight(float), 0)
+        self.assertEqual([p.name for p in pset.feasiblePrimitives(Boolean, 1)], ["lt"])
+        self.assertEqual(len(pset.feasiblePrimitives(Boolean, 10)), 2)
+
+        random.seed(42)
+        for _ in range(200):
+            for gen in (gp.genFull, gp.genGrow):
+                tree = gp.PrimitiveTree(gen(pset, 0, 3))
+                self.assertLessEqual(tree.height, 3)
+                self.assertGreaterEqual(tree.height, 1)
+                self.assertEqual(tree.root.ret, Boolean)
+
+        # No tree of an unknown type can be generated
+        self.assertRaises(IndexError, gp.genFull, pset, 1, 2, type_=int)
+
+    def test_harm(self):
+        creator.create("HarmFitness", base.Fitness, weights=(-1.0,))
+        creator.create("HarmTree", gp.PrimitiveTree, fitness=creator.HarmFitness)
+        try:
+            samples = numpy.linspace(-1, 1, 20)
+
+            def evaluate(individual):
+                func = gp.compile(individual, self.pset)
+                return numpy.mean([(func(x) - x**2)**2 for x in samples]),
+
+            toolbox = base.Toolbox()
+            toolbox.register("expr", gp.genHalfAndHalf, pset=self.pset, min_=1, max_=2)
+            toolbox.register("individual", tools.initIterate, creator.HarmTree, toolbox.expr)
+            toolbox.register("evaluate", evaluate)
+            toolbox.register("select", tools.selTournament, tournsize=3)
+            toolbox.register("mate", gp.cxOnePoint)
+            toolbox.register("expr_mut", gp.genFull, min_=0, max_=2)
+            toolbox.register("mutate", gp.mutUniform, expr=toolbox.expr_mut, pset=self.pset)
+
+            # The run is reproducible by seeding the random module only
+            runs = []
+            for seed in range(2):
+                numpy.random.seed(seed)
+                random.seed(42)
+                population = [toolbox.individual() for _ in range(50)]
+                population, logbook = gp.harm(population, toolbox, 0.5, 0.1, 5, alpha=0.05,
+                                              beta=10, gamma=0.25, rho=0.9, nbrindsmodel=200,
+                                              mincutoff=5, verbose=False)
+                runs.append([str(ind) for ind in population])
+
+            self.assertEqual(runs[0], runs[1])
+            self.assertEqual(len(population), 50)
+            self.assertTrue(all(ind.fitness.valid for ind in population))
+            self.assertEqual(len(logbook), 6)
+            self.assertTrue(all(record["modelling"] >= 0 for record in logbook))
+            self.assertTrue(all(record["evaluation"] >= 0 for record in logbook))
+        finally:
+            del creator.HarmFitness
+            del creator.HarmTree
+
+    def test_compile_adf(self):
+        adfset = gp.PrimitiveSet("ADF0", 2)
+        adfset.addPrimitive(operator.add, 2)
+        adfset.addPrimitive(operator.mul, 2)
+        pset = make_pset()
+        pset.addADF(adfset)
+        psets = (pset, adfset)
+        context = dict(pset.context)
+
+        individuals = [[gp.PrimitiveTree(gp.genFull(pset, 1, 3)),
+                        gp.PrimitiveTree(gp.genFull(adfset, 1, 2))] for _ in range(20)]
+        expected = [gp.compileADF(ind, psets)(3) for ind in individuals]
+        self.assertEqual(pset.context, context)
+
+        for p in psets:
+            p.compile_cache = gp.CompileCache()
+        results = []
+        def compileAll():
+            results.append([gp.compileADF(ind, psets)(3) for ind in individuals])
+        threads = [threading.Thread(target=compileAll) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [expected] * 4)
+        self.assertEqual(len(adfset.compile_cache), len(set(str(ind[1]) for ind in individuals)))
+        self.assertTrue(adfset.compile_cache.hits > 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,202 @@
+#    This file is part of DEAP.
+#
+#    DEAP is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as
+#    published by the Free Software Foundation, either version 3 of
+#    the License, or (at your option) any later version.
+#
+#    DEAP is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public
+#    License along with DEAP. If not, see <http://www.gnu.org/licenses/>.
+
+from nose import with_setup
+from operator import attrgetter
+import random
+
+import numpy
+
+from deap import base
+from deap import creator
+from deap import tools
+
+FITCLSNAME = "FIT_TYPE"
+INDCLSNAME = "IND_TYPE"
+
+
+def setup_func():
+    creator.create(FITCLSNAME, base.Fitness, weights=(-1.0, 1.0))
+    creator.create(INDCLSNAME, list, fitness=creator.__dict__[FITCLSNAME])
+
+def teardown_func():
+    # Messy way to remove a class from the creator
+    del creator.__dict__[FITCLSNAME]
+    del creator.__dict__[INDCLSNAME]
+
+def random_population(n, nobj=2, levels=3):
+    # Few distinct values per objective to get ties
+    population = []
+    for i in range(n):
+        ind = creator.__dict__[INDCLSNAME]([i])
+        ind.fitness.values = tuple(random.randint(0, levels) for _ in range(nobj))
+        population.append(ind)
+    return population
+
+@with_setup(setup_func, teardown_func)
+def test_tournament_vectorized():
+    random.seed(42)
+    pop = random_population(200)
+    k, tournsize = 500, 4
+
+    numpy.random.seed(42)
+    selected = tools.selTournamentVectorized(pop, k, tournsize)
+    numpy.random.seed(42)
+    aspirants = numpy.random.randint(0, len(pop), (k, tournsize))
+
+    assert len(selected) == k
+    for ind, indices in zip(selected, aspirants):
+        # Same winner, tie included, as a sequential tournament
+        expected = max([pop[i] for i in indices], key=attrgetter("fitness"))
+        assert ind is expected
+
+def roulette_reference(individuals, k):
+    # Linear scan of the sorted individuals for each spin
+    s_inds = sorted(individuals, key=attrgetter("fitness"), reverse=True)
+    sum_fits = sum(ind.fitness.values[0] for ind in individuals)
+    chosen = []
+    for i in range(k):
+        u = random.random() * sum_fits
+        sum_ = 0
+        for ind in s_inds:
+            sum_ += ind.fitness.values[0]
+            if sum_ > u:
+                chosen.append(ind)
+                break
+    return chosen
+
+def sus_reference(individuals, k):
+    s_inds = sorted(individuals, key=attrgetter("fitness"), reverse=True)
+    sum_fits = sum(ind.fitness.values[0] for ind in individuals)
+    distance = sum_fits / float(k)
+    start = random.uniform(0, distance)
+    chosen = []
+    for p in [start + i * distance for i in range(k)]:
+        i = 0
+        sum_ = s_inds[i].fitness.values[0]
+        while sum_ < p:
+            i += 1
+            sum_ += s_inds[i].fitness.values[0]
+        chosen.append(s_inds[i])
+    return chosen
+
+@with_setup(setup_func, teardown_func)
+def test_roulette():
+    random.seed(42)
+    pop = random_population(300, levels=10)
+    for ind in pop:
+        ind.fitness.values = (random.uniform(0.1, 10.0), 0.0)
+
+    for selection, reference in ((tools.selRoulette, roulette_reference),
+                                 (tools.selStochasticUniversalSampling, sus_reference)):
+        random.seed(64)
+        selected = selection(pop, 200)
+        random.seed(64)
+        expected = reference(pop, 200)
+        assert [id(ind) for ind in selected] == [id(ind) for ind in expected]
+
+@with_setup(setup_func, teardown_func)
+def test_alias_table():
+    random.seed(42)
+    pop = random_population(4)
+    for ind, fit in zip(pop, (1.0, 2.0, 3.0, 4.0)):
+        ind.fitness.values = (fit, 0.0)
+
+    table = tools.AliasTable(pop)
+    selected = table.select(20000)
+    assert len(selected) == 20000
+    for ind, fit in zip(pop, (1.0, 2.0, 3.0, 4.0)):
+        frequency = sum(1 for sel in selected if sel is ind) / 20000.0
+        assert abs(frequency - fit / 10.0) < 0.02, (fit, frequency)
+
+def lexicase_reference(individuals, k, epsilon):
+    # One case at a time on lists of candidates, epsilon is a function
+    # giving the tolerance of a case
+    fit_weights = individuals[0].fitness.weights
+    chosen = []
+    for i in range(k):
+        candidates = individuals
+        cases = list(range(len(fit_weights)))
+        random.shuffle(cases)
+        while len(cases) > 0 and len(candidates) > 1:
+            case = cases.pop(0)
+            values = [ind.fitness.values[case] for ind in candidates]
+            if fit_weights[case] > 0:
+                best = max(values) - epsilon(case)
+                candidates = [ind for ind, v in zip(candidates, values) if v >= best]
+            else:
+                best = min(values) + epsilon(case)
+                candidates = [ind for ind, v in zip(candidates, values) if v <= best]
+        chosen.append(random.choice(candidates))
+    return chosen
+
+def lexicase_population(n, ncases):
+    creator.create("LEX_FIT", base.Fitness, weights=(-1.0, 1.0) * (ncases // 2))
+    population = []
+    for i in range(n):
+        ind = creator.__dict__[INDCLSNAME]([i])
+        ind.fitness = creator.LEX_FIT()
+        ind.fitness.values = tuple(random.randint(0, 20) / 4.0 for _ in range(ncases))
+        population.append(ind)
+    del creator.LEX_FIT
+    return population
+
+@with_setup(setup_func, teardown_func)
+def test_lexicase():
+    random.seed(42)
+    pop = lexicase_population(100, 20)
+    values = numpy.array([ind.fitness.values for ind in pop])
+    mad = numpy.median(numpy.abs(values - numpy.median(values, axis=0)), axis=0)
+
+    for selection, epsilon in ((tools.selLexicase, lambda case: 0),
+                               (lambda p, k: tools.selEpsilonLexicase(p, k, 0.5), lambda case: 0.5),
+                               (tools.selAutomaticEpsilonLexicase, lambda case: mad[case])):
+        random.seed(64)
+        selected = selection(pop, 50)
+        random.seed(64)
+        expected = lexicase_reference(pop, 50, epsilon)
+        assert [id(ind) for ind in selected] == [id(ind) for ind in expected]
+
+@with_setup(setup_func, teardown_func)
+def test_lexicase_downsample():
+    random.seed(42)
+    pop = lexicase_population(100, 20)
+    values = numpy.array([ind.fitness.values for ind in pop])
+    best = numpy.where(numpy.array(pop[0].fitness.weights) > 0,
+                       values.max(axis=0), values.min(axis=0))
+
+    selected = tools.selLexicase(pop, 50, downsample=0.25)
+    assert len(selected) == 50
+    for ind in selected:
+        # The winners are the best on their first case at least
+        assert (numpy.array(ind.fitness.values) == best).any()
+
+def test_tournament_batch_ties():
+    # Few distinct values to get ties among the aspirants
+    numpy.random.seed(42)
+    fitnesses = numpy.random.randint(0, 3, (200, 2)).astype(float)
+    pop = tools.MatrixPopulation(numpy.arange(200)[:, None], (-1.0, 1.0), fitnesses)
+    k, tournsize = 500, 4
+
+    numpy.random.seed(64)
+    selected = tools.selTournamentBatch(pop, k, tournsize)
+    numpy.random.seed(64)
+    aspirants = numpy.random.randint(0, len(pop), (k, tournsize))
+
+    wvalues = [tuple(w) for w in pop.wvalues]
+    for index, indices in zip(selected.genotypes[:, 0], aspirants):
+        # The first of the best aspirants wins, as in selTournament
+        expected = max(indices, key=lambda i: wvalues[i])
+        assert index == expected
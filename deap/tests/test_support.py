@@ -0,0 +1,110 @@
+#    This file is part of DEAP.
+#
+#    DEAP is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as
+#    published by the Free Software Foundation, either version 3 of
+#    the License, or (at your option) any later version.
+#
+#    DEAP is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public
+#    License along with DEAP. If not, see <http://www.gnu.org/licenses/>.
+
+from nose import with_setup
+import random
+
+from deap import base
+from deap import creator
+from deap import tools
+
+FITCLSNAME = "FIT_TYPE"
+INDCLSNAME = "IND_TYPE"
+
+
+def setup_func():
+    creator.create(FITCLSNAME, base.Fitness, weights=(-1.0, 1.0))
+    creator.create(INDCLSNAME, list, fitness=creator.__dict__[FITCLSNAME])
+
+def teardown_func():
+    # Messy way to remove a class from the creator
+    del creator.__dict__[FITCLSNAME]
+    del creator.__dict__[INDCLSNAME]
+
+def random_population(n, levels=10):
+    # Few distinct genotypes to get duplicates, the fitness depends on the
+    # genotype only
+    population = []
+    for _ in range(n):
+        ind = creator.__dict__[INDCLSNAME](random.randint(0, levels) for _ in range(3))
+        ind.fitness.values = (sum(ind), ind[0])
+        population.append(ind)
+    return population
+
+@with_setup(setup_func, teardown_func)
+def test_indexed_hall_of_fame():
+    random.seed(42)
+    for maxsize in (1, 20, 200):
+        hof = tools.HallOfFame(maxsize)
+        indexed = tools.IndexedHallOfFame(maxsize)
+        hashed = tools.IndexedHallOfFame(maxsize, key=tuple)
+        for gen in range(10):
+            pop = random_population(100)
+            for hall in (hof, indexed, hashed):
+                hall.update(pop)
+            expected = [(list(ind), ind.fitness.values) for ind in hof]
+            for hall in (indexed, hashed):
+                assert [(list(ind), ind.fitness.values) for ind in hall] == expected
+                assert hall.keys == hof.keys
+                assert hall.wvalues == [fit.wvalues for fit in hof.keys]
+        assert sum(len(bucket) for bucket in hashed.index.values()) == len(hashed)
+
+    hashed.clear()
+    assert len(hashed) == 0 and len(hashed.index) == 0
+
+    empty = tools.IndexedHallOfFame(0, key=tuple)
+    empty.update(random_population(10))
+    assert len(empty) == 0
+
+def front_population(n, weights, levels=50):
+    creator.create("FRONT_FIT", base.Fitness, weights=weights)
+    population = []
+    for _ in range(n):
+        ind = creator.__dict__[INDCLSNAME](random.randint(0, levels) for _ in range(len(weights)))
+        ind.fitness = creator.FRONT_FIT(tuple(ind))
+        population.append(ind)
+    del creator.FRONT_FIT
+    return population
+
+@with_setup(setup_func, teardown_func)
+def test_indexed_pareto_front():
+    random.seed(42)
+    for weights in ((-1.0, 1.0), (1.0, -1.0, 1.0), (-1.0, -1.0, 1.0, 1.0)):
+        front = tools.ParetoFront()
+        indexed = tools.IndexedParetoFront(leafsize=4)
+        for gen in range(20):
+            pop = front_population(100, weights)
+            front.update(pop)
+            indexed.update(pop)
+            assert [(list(ind), ind.fitness.values) for ind in indexed] == \
+                   [(list(ind), ind.fitness.values) for ind in front]
+            if len(weights) > 2:
+                assert sorted(id(ind) for ind in indexed.tree) == sorted(id(ind) for ind in indexed)
+
+        indexed.remove(0)
+        indexed.clear()
+        assert len(indexed) == 0 and len(list(indexed.tree)) == 0
+
+@with_setup(setup_func, teardown_func)
+def test_bounded_pareto_front():
+    random.seed(42)
+    for weights in ((1.0, 1.0), (1.0, 1.0, 1.0)):
+        indexed = tools.IndexedParetoFront(maxsize=10)
+        for gen in range(10):
+            pop = front_population(100, weights, levels=1000)
+            indexed.update(pop)
+            assert len(indexed) <= 10
+            for ind in indexed:
+                assert not any(other.fitness.dominates(ind.fitness) for other in indexed)
@@ -20,6 +20,7 @@ also contains utility tools to enhance the basic algorithms with
 :class:`Statistics`, :class:`HallOfFame`, and :class:`History`.
 """
 
+from .batch import *
 from .constraint import *
 from .crossover import *
 from .emo import *
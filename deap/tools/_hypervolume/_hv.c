@@ -537,7 +537,15 @@ typedef struct dlnode {
 #endif
 } dlnode_t;
 
-static avl_tree_t *tree;
+/* The tree is thread local so that the hypervolume can be computed
+   concurrently from multiple threads (the GIL is released by hv.cpp). */
+#if defined(_MSC_VER)
+#define HV_THREAD_LOCAL __declspec(thread)
+#else
+#define HV_THREAD_LOCAL __thread
+#endif
+
+static HV_THREAD_LOCAL avl_tree_t *tree;
 #if VARIANT < 4
 int stop_dimension = 1; /* default: stop on dimension 2 */
 #else
@@ -21,71 +21,117 @@
 #define PY3K
 #endif
 
+#include <algorithm>
 #include <cstdlib>
 #include <iostream>
+#include <vector>
 
 #include "_hv.h"
 
-static PyObject* hypervolume(PyObject *self, PyObject *args){
-    // Args[0]: Point list
-    // Args[1]: Reference point
-    // Return: The hypervolume as a double
+static double* parsePointSet(PyObject *lPyPointSet, int *lNumPoints, int *lDim){
+    // Return: A newly allocated row major array of the points, NULL on error
 
-    PyObject *lPyPointSet = PyTuple_GetItem(args, 0);
-    PyObject *lPyReference = PyTuple_GetItem(args, 1);
-
-    int lNumPoints = 0;
-    int lDim = -1;
     double *lPointSet = NULL;
+    *lNumPoints = 0;
+    *lDim = -1;
 
     if(PySequence_Check(lPyPointSet)){
-        lNumPoints = PySequence_Size(lPyPointSet);
+        *lNumPoints = PySequence_Size(lPyPointSet);
         unsigned int lPointCount = 0;
 
-        for(int i = 0; i < lNumPoints; ++i){
+        for(int i = 0; i < *lNumPoints; ++i){
             PyObject *lPyPoint = PySequence_GetItem(lPyPointSet, i);
-            
+
             if(PySequence_Check(lPyPoint)){
-                if(lDim < 0){
-                    lDim = PySequence_Size(lPyPoint);
-                    lPointSet = new double[lNumPoints*lDim];
+                if(*lDim < 0){
+                    *lDim = PySequence_Size(lPyPoint);
+                    lPointSet = new double[*lNumPoints * *lDim];
                 }
-                
-                for(int j = 0; j < lDim; ++j){
+
+                for(int j = 0; j < *lDim; ++j){
                     PyObject *lPyCoord = PySequence_GetItem(lPyPoint, j);
                     lPointSet[lPointCount++] = PyFloat_AsDouble(lPyCoord);
                     Py_DECREF(lPyCoord);
                     lPyCoord = NULL;
-                    
+
                     if(PyErr_Occurred()){
                         PyErr_SetString(PyExc_TypeError,"Points must contain double type values");
+                        Py_DECREF(lPyPoint);
                         delete[] lPointSet;
                         return NULL;
                     }
                 }
-                
+
                 Py_DECREF(lPyPoint);
                 lPyPoint = NULL;
             } else {
                 Py_DECREF(lPyPoint);
                 lPyPoint = NULL;
                 PyErr_SetString(PyExc_TypeError,"First argument must contain only points");
-                free(lPointSet);
+                delete[] lPointSet;
                 return NULL;
             }
         }
 
-        
-
     } else {
         PyErr_SetString(PyExc_TypeError,"First argument must be a list of points");
         return NULL;
     }
 
+    if(lPointSet == NULL){
+        // Empty point set, allocate anyway so the caller can free it
+        lPointSet = new double[1];
+    }
+
+    return lPointSet;
+}
+
+static double* getPointSet(PyObject *lPyPointSet, Py_buffer *lView, int *lNumPoints, int *lDim){
+    // Return: A pointer to the row major points. When the point set exposes
+    //         a C contiguous 2-D buffer of doubles (e.g. a float64 numpy
+    //         array) the buffer is used directly without copy and lView->obj
+    //         is set, the caller must then release the view instead of
+    //         deleting the points. NULL on error.
+
+    lView->obj = NULL;
+    if(PyObject_CheckBuffer(lPyPointSet)){
+        if(PyObject_GetBuffer(lPyPointSet, lView, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) == 0){
+            const char *lFormat = lView->format;
+            if(lFormat != NULL && (lFormat[0] == '@' || lFormat[0] == '=' || lFormat[0] == '<'))
+                ++lFormat;
+            if(lView->ndim == 2 && lView->itemsize == sizeof(double) &&
+                    lFormat != NULL && lFormat[0] == 'd' && lFormat[1] == '\0'){
+                *lNumPoints = (int) lView->shape[0];
+                *lDim = (int) lView->shape[1];
+                return (double *) lView->buf;
+            }
+            PyBuffer_Release(lView);
+            lView->obj = NULL;
+        } else {
+            // Not a suitable buffer, fall back on the sequence protocol
+            PyErr_Clear();
+        }
+    }
+
+    return parsePointSet(lPyPointSet, lNumPoints, lDim);
+}
+
+static void releasePointSet(double *lPointSet, Py_buffer *lView){
+    if(lView->obj != NULL){
+        PyBuffer_Release(lView);
+    } else {
+        delete[] lPointSet;
+    }
+}
+
+static double* parseReference(PyObject *lPyReference, int lDim){
+    // Return: A newly allocated array of the reference point, NULL on error
+
     double *lReference = NULL;
 
     if(PySequence_Check(lPyReference)){
-        if(PySequence_Size(lPyReference) == lDim){
+        if(lDim < 0 || PySequence_Size(lPyReference) == lDim){
+            lDim = PySequence_Size(lPyReference);
             lReference = new double[lDim];
 
             for(int i = 0; i < lDim; ++i){
@@ -93,7 +139,7 @@ static PyObject* hypervolume(PyObject *self, PyObject *args){
                 lReference[i] = PyFloat_AsDouble(lPyCoord);
                 Py_DECREF(lPyCoord);
                 lPyCoord = NULL;
-                    
+
                 if(PyErr_Occurred()){
                     PyErr_SetString(PyExc_TypeError,"Reference point must contain double type values");
                     delete[] lReference;
@@ -111,18 +157,259 @@ static PyObject* hypervolume(PyObject *self, PyObject *args){
         return NULL;
     }
 
+    return lReference;
+}
+
+static PyObject* hypervolume(PyObject *self, PyObject *args){
+    // Args[0]: Point list
+    // Args[1]: Reference point
+    // Return: The hypervolume as a double
+
+    PyObject *lPyPointSet = PyTuple_GetItem(args, 0);
+    PyObject *lPyReference = PyTuple_GetItem(args, 1);
+
+    int lNumPoints = 0;
+    int lDim = -1;
+    Py_buffer lView;
+    double *lPointSet = getPointSet(lPyPointSet, &lView, &lNumPoints, &lDim);
+    if(lPointSet == NULL)
+        return NULL;
 
-    double lHypervolume = fpli_hv(lPointSet, lDim, lNumPoints, lReference);
-    
-    delete[] lPointSet;
+    double *lReference = parseReference(lPyReference, lDim);
+    if(lReference == NULL){
+        releasePointSet(lPointSet, &lView);
+        return NULL;
+    }
+
+    double lHypervolume = 0.0;
+    if(lNumPoints > 0){
+        Py_BEGIN_ALLOW_THREADS
+        lHypervolume = fpli_hv(lPointSet, lDim, lNumPoints, lReference);
+        Py_END_ALLOW_THREADS
+    }
+
+    releasePointSet(lPointSet, &lView);
     delete[] lReference;
 
     return PyFloat_FromDouble(lHypervolume);
 }
 
+/*
+ * Exclusive hypervolume contributions
+ *
+ * The contribution of a point is the volume dominated by this point only,
+ * that is the hypervolume of the set minus the hypervolume of the set
+ * without this point. Points that do not strictly dominate the reference
+ * point have a null contribution.
+ */
+
+struct XYLess {
+    const double *mPoints;
+    int mDim;
+
+    XYLess(const double *inPoints, int inDim) : mPoints(inPoints), mDim(inDim) {}
+
+    bool operator()(int inA, int inB) const {
+        const double *lA = mPoints + inA * mDim;
+        const double *lB = mPoints + inB * mDim;
+        return lA[0] < lB[0] || (lA[0] == lB[0] && lA[1] < lB[1]);
+    }
+};
+
+struct ZLess {
+    const double *mPoints;
+    int mDim;
+
+    ZLess(const double *inPoints, int inDim) : mPoints(inPoints), mDim(inDim) {}
+
+    bool operator()(int inA, int inB) const {
+        return mPoints[inA * mDim + 2] < mPoints[inB * mDim + 2];
+    }
+};
+
+static void sweepContributions2D(const double *inPoints, int inDim, const std::vector<int> &inSorted,
+                                 const double *inRef, double inWeight, double *outContribs){
+    // Add the 2-D exclusive contributions (on the first two coordinates) of
+    // the points whose indices are given in lexicographic (x, y) order,
+    // multiplied by inWeight. A weakly dominated point may only cut into the
+    // exclusive region of the last non-dominated point preceding it.
+    int lCurrent = -1;
+    double lUpperY = inRef[1];      // y of the previous non-dominated point
+    double lGroupMinY = 0.0;        // lowest y among the current group
+    double lGroupHV = 0.0;          // area of the group inside the region
+    std::vector<int> lGroup;
+
+    for(size_t i = 0; i <= inSorted.size(); ++i){
+        const double *lPoint = i < inSorted.size() ? inPoints + inSorted[i] * inDim : NULL;
+        bool lDominated = lPoint != NULL && lCurrent >= 0 && lPoint[1] >= inPoints[lCurrent * inDim + 1];
+
+        if(lDominated){
+            if(lPoint[1] < lGroupMinY){
+                lGroup.push_back(inSorted[i]);
+                lGroupMinY = lPoint[1];
+            }
+            continue;
+        }
+
+        // Close the region of the current non-dominated point
+        if(lCurrent >= 0){
+            const double *lCur = inPoints + lCurrent * inDim;
+            double lUpperX = lPoint != NULL ? lPoint[0] : inRef[0];
+            double lMinY = lUpperY;
+            lGroupHV = 0.0;
+            for(size_t j = 0; j < lGroup.size(); ++j){
+                const double *lQ = inPoints + lGroup[j] * inDim;
+                lGroupHV += (lUpperX - lQ[0]) * (lMinY - lQ[1]);
+                lMinY = lQ[1];
+            }
+            outContribs[lCurrent] += inWeight * ((lUpperX - lCur[0]) * (lUpperY - lCur[1]) - lGroupHV);
+            lUpperY = lCur[1];
+        }
+
+        if(lPoint != NULL){
+            lCurrent = inSorted[i];
+            lGroup.clear();
+            lGroupMinY = lUpperY;
+        }
+    }
+}
+
+static void contributions2D(const double *inPoints, int inDim, const std::vector<int> &inValid,
+                            const double *inRef, double *outContribs){
+    std::vector<int> lSorted(inValid);
+    std::sort(lSorted.begin(), lSorted.end(), XYLess(inPoints, inDim));
+    sweepContributions2D(inPoints, inDim, lSorted, inRef, 1.0, outContribs);
+}
+
+static void contributions3D(const double *inPoints, int inDim, const std::vector<int> &inValid,
+                            const double *inRef, double *outContribs){
+    // Sweep along the third objective, the active points are kept sorted on
+    // the first two objectives and the 2-D contributions of each slab are
+    // weighted by the slab height.
+    std::vector<int> lByZ(inValid);
+    std::sort(lByZ.begin(), lByZ.end(), ZLess(inPoints, inDim));
+
+    std::vector<int> lActive;
+    XYLess lXYLess(inPoints, inDim);
+    size_t i = 0;
+    while(i < lByZ.size()){
+        double lZ = inPoints[lByZ[i] * inDim + 2];
+        while(i < lByZ.size() && inPoints[lByZ[i] * inDim + 2] == lZ){
+            lActive.insert(std::upper_bound(lActive.begin(), lActive.end(), lByZ[i], lXYLess), lByZ[i]);
+            ++i;
+        }
+        double lNextZ = i < lByZ.size() ? inPoints[lByZ[i] * inDim + 2] : inRef[2];
+        sweepContributions2D(inPoints, inDim, lActive, inRef, lNextZ - lZ, outContribs);
+    }
+}
+
+static void contributionsND(double *inPoints, int inDim, const std::vector<int> &inValid,
+                            const double *inRef, double *outContribs){
+    // The contribution of a point is the volume of its box minus the
+    // hypervolume of the other points limited to this box.
+    int lNumValid = inValid.size();
+    double *lLimited = new double[lNumValid * inDim];
+
+    for(int i = 0; i < lNumValid; ++i){
+        const double *lPoint = inPoints + inValid[i] * inDim;
+        double lVolume = 1.0;
+        for(int k = 0; k < inDim; ++k)
+            lVolume *= inRef[k] - lPoint[k];
+
+        int lCount = 0;
+        for(int j = 0; j < lNumValid; ++j){
+            if(j == i)
+                continue;
+            const double *lOther = inPoints + inValid[j] * inDim;
+            for(int k = 0; k < inDim; ++k)
+                lLimited[lCount * inDim + k] = std::max(lPoint[k], lOther[k]);
+            ++lCount;
+        }
+
+        if(lCount > 0)
+            lVolume -= fpli_hv(lLimited, inDim, lCount, inRef);
+        outContribs[inValid[i]] = lVolume;
+    }
+
+    delete[] lLimited;
+}
+
+static PyObject* contributions(PyObject *self, PyObject *args){
+    // Args[0]: Point list
+    // Args[1]: Reference point
+    // Return: A list of the exclusive contribution of each point
+
+    PyObject *lPyPointSet = PyTuple_GetItem(args, 0);
+    PyObject *lPyReference = PyTuple_GetItem(args, 1);
+
+    int lNumPoints = 0;
+    int lDim = -1;
+    Py_buffer lView;
+    double *lPointSet = getPointSet(lPyPointSet, &lView, &lNumPoints, &lDim);
+    if(lPointSet == NULL)
+        return NULL;
+
+    double *lReference = parseReference(lPyReference, lDim);
+    if(lReference == NULL){
+        releasePointSet(lPointSet, &lView);
+        return NULL;
+    }
+
+    std::vector<double> lContribs(lNumPoints, 0.0);
+    std::vector<int> lValid;
+
+    Py_BEGIN_ALLOW_THREADS
+
+    // Only the points strictly dominating the reference point contribute
+    for(int i = 0; i < lNumPoints; ++i){
+        bool lInside = true;
+        for(int k = 0; k < lDim && lInside; ++k)
+            lInside = lPointSet[i * lDim + k] < lReference[k];
+        if(lInside)
+            lValid.push_back(i);
+    }
+
+    if(lValid.size() > 0){
+        if(lDim == 1){
+            // Only the best point contributes, up to the second best
+            int lBest = lValid[0];
+            double lSecond = lReference[0];
+            for(size_t i = 1; i < lValid.size(); ++i){
+                double lValue = lPointSet[lValid[i]];
+                if(lValue < lPointSet[lBest]){
+                    lSecond = lPointSet[lBest];
+                    lBest = lValid[i];
+                } else if(lValue < lSecond){
+                    lSecond = lValue;
+                }
+            }
+            lContribs[lBest] = lSecond - lPointSet[lBest];
+        } else if(lDim == 2){
+            contributions2D(lPointSet, lDim, lValid, lReference, &lContribs[0]);
+        } else if(lDim == 3){
+            contributions3D(lPointSet, lDim, lValid, lReference, &lContribs[0]);
+        } else {
+            contributionsND(lPointSet, lDim, lValid, lReference, &lContribs[0]);
+        }
+    }
+
+    Py_END_ALLOW_THREADS
+
+    releasePointSet(lPointSet, &lView);
+    delete[] lReference;
+
+    PyObject *lPyContribs = PyList_New(lNumPoints);
+    for(int i = 0; i < lNumPoints; ++i)
+        PyList_SET_ITEM(lPyContribs, i, PyFloat_FromDouble(lContribs[i]));
+
+    return lPyContribs;
+}
+
 static PyMethodDef hvMethods[] = {
     {"hypervolume", hypervolume, METH_VARARGS,
         "Hypervolume Computation"},
+    {"contributions", contributions, METH_VARARGS,
+        "Exclusive Hypervolume Contribution of Each Point"},
     {NULL, NULL, 0, NULL}        /* Sentinel (?!?) */
 };
 
@@ -151,9 +438,9 @@ inithv(void)
     PyObject *lModule = PyModule_Create(&moduledef);
     if(lModule == NULL)
         return NULL;
-    
+
     return lModule;
-#else    
+#else
     (void) Py_InitModule("hv", hvMethods);
 #endif
-}
\ No newline at end of file
+}
@@ -22,7 +22,8 @@
 #    You should have received a copy of the GNU Lesser General Public
 #    License along with DEAP. If not, see <http://www.gnu.org/licenses/>.
 
-from math import log, floor
+from itertools import chain
+from math import log, floor, sqrt
 import random
 import warnings
 
@@ -37,6 +38,194 @@ def hypervolume(pointset, ref):
     hv = _HyperVolume(ref)
     return hv.compute(pointset)
 
+def contributions(pointset, ref):
+    """Compute the exclusive hypervolume contribution of every point of
+    *pointset* according to the reference point *ref*. The contribution of a
+    point is the volume dominated by this point only, that is the
+    hypervolume of the set minus the hypervolume of the set without this
+    point. Points that do not strictly dominate *ref* contribute nothing.
+
+    The contributions are computed with a dimension-sweep, the volume of
+    each slab along the last objective is given by the contributions in the
+    remaining objectives, down to a two objective sweep.
+    """
+    warnings.warn("Falling back to the python version of hypervolume "
+        "module. Expect this to be very slow.", RuntimeWarning)
+    points = numpy.array(pointset, dtype=numpy.float64)
+    ref = numpy.array(ref, dtype=numpy.float64)
+    contribs = [0.0] * len(points)
+    if len(points) == 0:
+        return contribs
+
+    valid = [i for i in xrange(len(points)) if numpy.all(points[i] < ref)]
+    if len(valid) == 0:
+        return contribs
+
+    if points.shape[1] == 1:
+        # Only the best point contributes, up to the second best
+        values = sorted((points[i, 0], i) for i in valid)
+        second = values[1][0] if len(values) > 1 else ref[0]
+        contribs[values[0][1]] = second - values[0][0]
+    else:
+        _sweepContributions(points, valid, ref, points.shape[1], 1.0, contribs)
+    return contribs
+
+def _sweepContributions(points, indices, ref, dim, weight, contribs):
+    """Add the exclusive contributions on the first *dim* objectives of the
+    *points* at *indices*, multiplied by *weight*, to *contribs*.
+    """
+    if dim == 2:
+        active = sorted((points[i, 0], points[i, 1], i) for i in indices)
+        _sweepContributions2D(active, ref, weight, contribs)
+        return
+
+    by_last = sorted(indices, key=lambda i: points[i, dim-1])
+    active = []
+    j = 0
+    while j < len(by_last):
+        z = points[by_last[j], dim-1]
+        while j < len(by_last) and points[by_last[j], dim-1] == z:
+            active.append(by_last[j])
+            j += 1
+        next_z = points[by_last[j], dim-1] if j < len(by_last) else ref[dim-1]
+        _sweepContributions(points, active, ref, dim - 1, weight * (next_z - z), contribs)
+
+def _sweepContributions2D(active, ref, weight, contribs):
+    """Add the 2-D exclusive contributions of the *active* points, a list
+    of (x, y, index) tuples sorted lexicographically, multiplied by *weight*
+    to *contribs*. A weakly dominated point may only cut into the exclusive
+    region of the last non-dominated point preceding it.
+    """
+    current = None
+    upper_y = ref[1]
+    group = []
+    group_min_y = upper_y
+    for point in chain(active, [None]):
+        if point is not None and current is not None and point[1] >= current[1]:
+            if point[1] < group_min_y:
+                group.append(point)
+                group_min_y = point[1]
+            continue
+
+        # Close the region of the current non-dominated point
+        if current is not None:
+            upper_x = point[0] if point is not None else ref[0]
+            min_y = upper_y
+            group_hv = 0.0
+            for q in group:
+                group_hv += (upper_x - q[0]) * (min_y - q[1])
+                min_y = q[1]
+            contribs[current[2]] += weight * ((upper_x - current[0]) * (upper_y - current[1]) - group_hv)
+            upper_y = current[1]
+
+        current = point
+        group = []
+        group_min_y = upper_y
+
+# Number of boolean cells (samples x points x objectives) evaluated at once
+# by the Monte Carlo estimators, this bounds their memory usage.
+MC_BLOCK_SIZE = 2 ** 22
+
+def _samplingBox(pointset, ref):
+    """Return the points of *pointset* that strictly dominate *ref* and the
+    lower corner of their bounding box.
+    """
+    points = numpy.array(pointset, dtype=numpy.float64)
+    ref = numpy.array(ref, dtype=numpy.float64)
+    if len(points) == 0:
+        return points.reshape(0, len(ref)), ref, ref, numpy.zeros(0, dtype=bool)
+    valid = numpy.all(points < ref, axis=1)
+    if not numpy.any(valid):
+        return points, ref, ref, valid
+    lower = numpy.min(points[valid], axis=0)
+    return points, lower, ref, valid
+
+def _randomState(seed):
+    if isinstance(seed, numpy.random.RandomState):
+        return seed
+    return numpy.random.RandomState(seed)
+
+def _dominationBlocks(points, lower, upper, samples, random_state):
+    """Generate the Monte Carlo samples uniformly in the box [*lower*,
+    *upper*] by blocks of at most :data:`MC_BLOCK_SIZE` cells and yield, for
+    each block, the boolean matrix telling which points weakly dominate each
+    sample.
+    """
+    block = max(1, MC_BLOCK_SIZE // (points.shape[0] * points.shape[1]))
+    drawn = 0
+    while drawn < samples:
+        size = min(block, samples - drawn)
+        sample = random_state.uniform(lower, upper, (size, len(lower)))
+        yield numpy.all(points[numpy.newaxis, :, :] <= sample[:, numpy.newaxis, :], axis=2)
+        drawn += size
+
+def hypervolume_approximation(pointset, ref, samples=100000, seed=None, error=None):
+    """Estimate the hypervolume of a *pointset* according to the reference
+    point *ref* by Monte Carlo sampling. The samples are drawn uniformly in
+    the bounding box of the points dominating *ref* and the hypervolume is
+    the volume of this box times the fraction of dominated samples. The cost
+    is linear in the number of objectives, which makes it usable where the
+    exact algorithms are not.
+
+    :param pointset: The points (minimization is assumed).
+    :param ref: The reference point.
+    :param samples: The maximum number of samples drawn.
+    :param seed: The seed of the :class:`numpy.random.RandomState` used for
+                 sampling, or a :class:`~numpy.random.RandomState` instance.
+    :param error: An optional bound on the standard error of the estimate,
+                  sampling stops as soon as it is reached.
+    :returns: The estimated hypervolume.
+    """
+    points, lower, upper, valid = _samplingBox(pointset, ref)
+    if not numpy.any(valid):
+        return 0.0
+    points = points[valid]
+    volume = numpy.prod(upper - lower)
+    random_state = _randomState(seed)
+
+    drawn = hits = 0
+    for dominated in _dominationBlocks(points, lower, upper, samples, random_state):
+        drawn += dominated.shape[0]
+        hits += numpy.count_nonzero(numpy.any(dominated, axis=1))
+        if error is not None:
+            ratio = float(hits) / drawn
+            if volume * sqrt(ratio * (1.0 - ratio) / drawn) <= error:
+                break
+
+    return volume * hits / float(drawn)
+
+def contributions_approximation(pointset, ref, samples=100000, seed=None):
+    """Estimate the exclusive hypervolume contribution of every point of
+    *pointset* according to the reference point *ref* by Monte Carlo
+    sampling. Each sample dominated by a single point is credited to that
+    point, duplicated points thus never receive any contribution, as with
+    :func:`contributions`.
+
+    :param pointset: The points (minimization is assumed).
+    :param ref: The reference point.
+    :param samples: The number of samples drawn.
+    :param seed: The seed of the :class:`numpy.random.RandomState` used for
+                 sampling, or a :class:`~numpy.random.RandomState` instance.
+    :returns: A list of the estimated contribution of each point.
+    """
+    points, lower, upper, valid = _samplingBox(pointset, ref)
+    contribs = numpy.zeros(len(points))
+    if not numpy.any(valid):
+        return contribs.tolist()
+    indices = numpy.flatnonzero(valid)
+    points = points[valid]
+    volume = numpy.prod(upper - lower)
+    random_state = _randomState(seed)
+
+    hits = numpy.zeros(len(points))
+    for dominated in _dominationBlocks(points, lower, upper, samples, random_state):
+        single = numpy.sum(dominated, axis=1) == 1
+        owner = numpy.argmax(dominated[single], axis=1)
+        hits += numpy.bincount(owner, minlength=len(points))
+
+    contribs[indices] = volume * hits / float(samples)
+    return contribs.tolist()
+
 
 class _HyperVolume:
     """
@@ -135,7 +324,7 @@ class _HyperVolume:
             hvRecursive = self.hvRecursive
             p = sentinel
             q = p.prev[dimIndex]
-            while q.cargo != None:
+            while q.cargo is not None:
                 if q.ignore < dimIndex:
                     q.ignore = 0
                 q = q.prev[dimIndex]
@@ -315,7 +504,8 @@ class _MultiList:
             if bounds[i] > node.cargo[i]:
                 bounds[i] = node.cargo[i]
             
-__all__ = ["hypervolume_kmax", "hypervolume"]
+__all__ = ["hypervolume_kmax", "hypervolume", "contributions",
+           "hypervolume_approximation", "contributions_approximation"]
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,239 @@
+from __future__ import division
+from copy import deepcopy
+
+import numpy
+
+from ..base import Fitness
+from .selection import _wvaluesRanks
+
+######################################
+# Matrix population                  #
+######################################
+
+class _RowFitness(Fitness):
+    """Fitness stored in a row of the fitness matrix of a
+    :class:`MatrixPopulation`, an invalid fitness is a row of NaN.
+    """
+    def __init__(self, values, weights):
+        self._values = values
+        self.weights = weights
+
+    def getValues(self):
+        if numpy.isnan(self._values).any():
+            return ()
+        return tuple(self._values.tolist())
+
+    def setValues(self, values):
+        assert len(values) == len(self.weights), "Assigned values have not the same length than fitness weights"
+        self._values[:] = values
+
+    def delValues(self):
+        self._values[:] = numpy.nan
+
+    values = property(getValues, setValues, delValues)
+
+    @property
+    def wvalues(self):
+        return tuple(v * w for v, w in zip(self.values, self.weights))
+
+    def __deepcopy__(self, memo):
+        return self.__class__(self._values.copy(), self.weights)
+
+
+class _RowIndividual(numpy.ndarray):
+    """View on a row of the genotype matrix of a :class:`MatrixPopulation`
+    having a :attr:`fitness` attribute.
+    """
+    def __deepcopy__(self, memo):
+        copy_ = numpy.ndarray.copy(self)
+        copy_.__dict__.update(deepcopy(self.__dict__, memo))
+        return copy_
+
+
+class MatrixPopulation(object):
+    """Population stored in a single 2-D :class:`numpy.ndarray` of genotypes,
+    one individual per row, along with a matrix of fitness values, one
+    objective per column. The invalid fitnesses are rows of NaN.
+
+    :param genotypes: A 2-D array of the genotypes of the individuals.
+    :param weights: The weights of the objectives, as for a
+                    :class:`~deap.base.Fitness`.
+    :param fitnesses: A 2-D array of the fitness values, optional. All the
+                      fitnesses are invalid if not provided.
+
+    Indexing the population with an integer returns a view on that row that
+    behaves like an individual, with a :attr:`fitness` attribute, so that
+    the population can be used with the regular operators, statistics and
+    halls of fame. Modifying the view modifies the population. Indexing with
+    a slice, an array of indices or a boolean mask returns a new population
+    with copies of the selected rows. ::
+
+        >>> import numpy
+        >>> pop = MatrixPopulation(numpy.zeros((3, 2)), weights=(-1.0,))
+        >>> pop.fitnesses[:] = [[1.0], [2.0], [3.0]]
+        >>> pop[1].fitness.values
+        (2.0,)
+        >>> len(pop[[0, 0, 2]])
+        3
+
+    The batched operators and algorithms, such as :func:`cxTwoPointBatch`
+    and :func:`~deap.algorithms.eaSimpleBatch`, work on the whole matrices at
+    once.
+    """
+    def __init__(self, genotypes, weights, fitnesses=None):
+        self.genotypes = numpy.asarray(genotypes)
+        self.weights = tuple(weights)
+        if fitnesses is None:
+            fitnesses = numpy.full((len(self.genotypes), len(self.weights)), numpy.nan)
+        self.fitnesses = numpy.asarray(fitnesses, dtype=numpy.float64)
+
+    @property
+    def valid(self):
+        """Boolean array telling which individuals have a valid fitness."""
+        return ~numpy.isnan(self.fitnesses).any(axis=1)
+
+    @property
+    def wvalues(self):
+        """Matrix of the weighted fitness values."""
+        return self.fitnesses * self.weights
+
+    def invalidate(self, indices=slice(None)):
+        """Invalidate the fitness of the individuals at *indices*, all of
+        them by default.
+        """
+        self.fitnesses[indices] = numpy.nan
+
+    def take(self, indices):
+        """Return a new population with copies of the individuals at
+        *indices*.
+        """
+        return self.__class__(numpy.array(self.genotypes[indices]), self.weights,
+                              numpy.array(self.fitnesses[indices]))
+
+    def copy(self):
+        """Return a copy of the population."""
+        return self.take(slice(None))
+
+    def __len__(self):
+        return len(self.genotypes)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, long, numpy.integer)):
+            individual = self.genotypes[index].view(_RowIndividual)
+            individual.fitness = _RowFitness(self.fitnesses[index], self.weights)
+            return individual
+        return self.take(index)
+
+    def __iter__(self):
+        for i in xrange(len(self)):
+            yield self[i]
+
+######################################
+# Batched operators                  #
+######################################
+
+def cxTwoPointBatch(ind1, ind2):
+    """Execute a two points crossover between each row of the 2-D arrays
+    *ind1* and *ind2*, as :func:`~deap.tools.cxTwoPoint` does for a pair of
+    individuals. The arrays are modified in place.
+
+    :param ind1: The first array of genotypes participating in the crossover.
+    :param ind2: The second array of genotypes participating in the crossover.
+    :returns: A tuple of two arrays.
+
+    This function uses the :func:`~numpy.random.randint` function from the
+    :mod:`numpy.random` module.
+    """
+    n, size = ind1.shape
+    cxpoint1 = numpy.random.randint(1, size + 1, n)
+    cxpoint2 = numpy.random.randint(1, size, n)
+    cxpoint2 = numpy.where(cxpoint2 >= cxpoint1, cxpoint2 + 1, cxpoint2)
+    cxpoint1, cxpoint2 = numpy.minimum(cxpoint1, cxpoint2), numpy.maximum(cxpoint1, cxpoint2)
+
+    columns = numpy.arange(size)
+    mask = (columns >= cxpoint1[:, None]) & (columns < cxpoint2[:, None])
+    swapped = ind1[mask]
+    ind1[mask] = ind2[mask]
+    ind2[mask] = swapped
+    return ind1, ind2
+
+def cxUniformBatch(ind1, ind2, indpb):
+    """Execute a uniform crossover between each row of the 2-D arrays *ind1*
+    and *ind2*, each attribute is swapped with probability *indpb*. The
+    arrays are modified in place.
+
+    :param ind1: The first array of genotypes participating in the crossover.
+    :param ind2: The second array of genotypes participating in the crossover.
+    :param indpb: Independent probability for each attribute to be exchanged.
+    :returns: A tuple of two arrays.
+
+    This function uses the :func:`~numpy.random.random` function from the
+    :mod:`numpy.random` module.
+    """
+    mask = numpy.random.random(ind1.shape) < indpb
+    swapped = ind1[mask]
+    ind1[mask] = ind2[mask]
+    ind2[mask] = swapped
+    return ind1, ind2
+
+def mutGaussianBatch(individuals, mu, sigma, indpb):
+    """Apply a gaussian mutation of mean *mu* and standard deviation *sigma*
+    on each row of the 2-D array *individuals*, as
+    :func:`~deap.tools.mutGaussian` does for a single individual. The array
+    is modified in place.
+
+    :param individuals: The array of genotypes to be mutated.
+    :param mu: Mean or sequence of means for the gaussian addition mutation.
+    :param sigma: Standard deviation or sequence of standard deviations for
+                  the gaussian addition mutation.
+    :param indpb: Independent probability for each attribute to be mutated.
+    :returns: A tuple of one array.
+
+    This function uses the :func:`~numpy.random.random` and
+    :func:`~numpy.random.normal` functions from the :mod:`numpy.random`
+    module.
+    """
+    mask = numpy.random.random(individuals.shape) < indpb
+    noise = numpy.random.normal(mu, sigma, individuals.shape)
+    individuals[mask] += noise[mask]
+    return individuals,
+
+def mutFlipBitBatch(individuals, indpb):
+    """Flip the value of the attributes of each row of the 2-D array
+    *individuals*, as :func:`~deap.tools.mutFlipBit` does for a single
+    individual. The array is modified in place.
+
+    :param individuals: The array of genotypes to be mutated.
+    :param indpb: Independent probability for each attribute to be flipped.
+    :returns: A tuple of one array.
+
+    This function uses the :func:`~numpy.random.random` function from the
+    :mod:`numpy.random` module.
+    """
+    mask = numpy.random.random(individuals.shape) < indpb
+    individuals[mask] = numpy.logical_not(individuals[mask])
+    return individuals,
+
+def selTournamentBatch(population, k, tournsize):
+    """Select the best individual among *tournsize* randomly chosen
+    individuals, *k* times, from a :class:`MatrixPopulation`. The fitnesses
+    are compared lexicographically on their weighted values and the first
+    aspirant drawn wins among equally fit aspirants, as for
+    :func:`~deap.tools.selTournament`.
+
+    :param population: A :class:`MatrixPopulation` to select from.
+    :param k: The number of individuals to select.
+    :param tournsize: The number of individuals participating in each
+                      tournament.
+    :returns: A :class:`MatrixPopulation` of the selected individuals.
+
+    This function uses the :func:`~numpy.random.randint` function from the
+    :mod:`numpy.random` module.
+    """
+    ranks = _wvaluesRanks(population.wvalues)
+    aspirants = numpy.random.randint(0, len(population), (k, tournsize))
+    winners = aspirants[numpy.arange(k), numpy.argmax(ranks[aspirants], axis=1)]
+    return population.take(winners)
+
+__all__ = ['MatrixPopulation', 'cxTwoPointBatch', 'cxUniformBatch',
+           'mutGaussianBatch', 'mutFlipBitBatch', 'selTournamentBatch']
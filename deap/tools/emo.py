@@ -23,7 +23,8 @@ def selNSGA2(individuals, k, nd='standard'):
 
     :param individuals: A list of individuals to select from.
     :param k: The number of individuals to select.
-    :param nd: Specify the non-dominated algorithm to use: 'standard' or 'log'.
+    :param nd: Specify the non-dominated algorithm to use: 'standard', 'log'
+               or 'array'.
     :returns: A list of selected individuals.
 
     .. [Deb2002] Deb, Pratab, Agarwal, and Meyarivan, "A fast elitist
@@ -34,18 +35,25 @@ def selNSGA2(individuals, k, nd='standard'):
         pareto_fronts = sortNondominated(individuals, k)
     elif nd == 'log':
         pareto_fronts = sortLogNondominated(individuals, k)
+    elif nd == 'array':
+        pareto_fronts = sortArrayNondominated(individuals, k)
     else:
         raise Exception('selNSGA2: The choice of non-dominated sorting '
                         'method "{0}" is invalid.'.format(nd))
 
-    for front in pareto_fronts:
-        assignCrowdingDist(front)
+    # Compute the crowding distances of every front in a single pass
+    distances = arrayCrowdingDist(pareto_fronts)
+    for ind, dist in zip(chain(*pareto_fronts), distances.tolist()):
+        ind.fitness.crowding_dist = dist
 
     chosen = list(chain(*pareto_fronts[:-1]))
     k = k - len(chosen)
     if k > 0:
-        sorted_front = sorted(pareto_fronts[-1], key=attrgetter("fitness.crowding_dist"), reverse=True)
-        chosen.extend(sorted_front[:k])
+        last_front = pareto_fronts[-1]
+        last_dist = distances[len(chosen):]
+        # Stable sort to keep the same order as sorted(..., reverse=True)
+        sorted_idx = numpy.argsort(-last_dist, kind="mergesort")
+        chosen.extend(last_front[i] for i in sorted_idx[:k])
 
     return chosen
 
@@ -142,7 +150,59 @@ def assignCrowdingDist(individuals):
     for i, dist in enumerate(distances):
         individuals[i].fitness.crowding_dist = dist
 
-def selTournamentDCD(individuals, k):
+def arrayCrowdingDist(fronts):
+    """Compute the crowding distance of every individual of the *fronts* at
+    once. The fitness values of all fronts are gathered in a single
+    :math:`N \\times M` array which is sorted once per objective (by front
+    and value), the distances of all fronts are then accumulated using
+    vectorized operations. The distances are the same as the ones assigned by
+    :func:`assignCrowdingDist` on each front, but they are returned instead
+    of being assigned to the individuals' fitness.
+
+    :param fronts: A list of fronts (lists of individuals), as returned by
+                   the non-dominated sorting functions.
+    :returns: An array of crowding distances aligned with the individuals of
+              the concatenated *fronts*.
+    """
+    sizes = numpy.array([len(front) for front in fronts], dtype=numpy.intp)
+    n = int(sizes.sum())
+    distances = numpy.zeros(n)
+    if n == 0:
+        return distances
+
+    fits = numpy.array([ind.fitness.values for front in fronts for ind in front],
+                       dtype=numpy.float64)
+    nobj = fits.shape[1]
+    front_idx = numpy.repeat(numpy.arange(len(fronts)), sizes)
+    ends = numpy.cumsum(sizes)
+    starts = ends - sizes
+    nonempty = sizes > 0
+    starts, ends = starts[nonempty], ends[nonempty] - 1
+
+    # The order is sorted in place objective after objective (using a stable
+    # sort) to break ties exactly as assignCrowdingDist does
+    order = numpy.arange(n)
+    for i in xrange(nobj):
+        order = order[numpy.lexsort((fits[order, i], front_idx[order]))]
+        values = fits[order, i]
+        distances[order[starts]] = numpy.inf
+        distances[order[ends]] = numpy.inf
+
+        if n < 3:
+            continue
+
+        # Interior points are the ones with both neighbours in their front
+        spread = numpy.zeros(len(fronts))
+        spread[nonempty] = nobj * (values[ends] - values[starts])
+        fidx = front_idx[1:-1]
+        interior = (front_idx[:-2] == fidx) & (front_idx[2:] == fidx)
+        interior &= spread[fidx] != 0
+        cur = numpy.flatnonzero(interior) + 1
+        distances[order[cur]] += (values[cur + 1] - values[cur - 1]) / spread[front_idx[cur]]
+
+    return distances
+
+def selTournamentDCD(individuals, k, crowding_dist=None):
     """Tournament selection based on dominance (D) between two individuals, if
     the two individuals do not interdominate the selection is made
     based on crowding distance (CD). The *individuals* sequence length has to
@@ -153,11 +213,15 @@ def selTournamentDCD(individuals, k):
     than twice.
 
     This selection requires the individuals to have a :attr:`crowding_dist`
-    attribute, which can be set by the :func:`assignCrowdingDist` function.
+    attribute, which can be set by the :func:`assignCrowdingDist` function,
+    unless the distances are given directly in the *crowding_dist* argument,
+    for example as computed by :func:`arrayCrowdingDist`.
 
     :param individuals: A list of individuals to select from.
     :param k: The number of individuals to select. Must be less than or equal 
               to len(individuals).
+    :param crowding_dist: A sequence of crowding distances aligned with
+                          *individuals*, optional.
     :returns: A list of selected individuals.
     """
     
@@ -167,32 +231,34 @@ def selTournamentDCD(individuals, k):
     if k == len(individuals) and k % 4 != 0:
         raise ValueError("selTournamentDCD: k must be divisible by four if k == len(individuals)")
 
-    def tourn(ind1, ind2):
-        if ind1.fitness.dominates(ind2.fitness):
-            return ind1
-        elif ind2.fitness.dominates(ind1.fitness):
-            return ind2
+    if crowding_dist is None:
+        crowding_dist = [ind.fitness.crowding_dist for ind in individuals]
+    crowding_dist = numpy.asarray(crowding_dist, dtype=numpy.float64)
+    wvalues = numpy.array([ind.fitness.wvalues for ind in individuals])
 
-        if ind1.fitness.crowding_dist < ind2.fitness.crowding_dist:
-            return ind2
-        elif ind1.fitness.crowding_dist > ind2.fitness.crowding_dist:
-            return ind1
+    indices_1 = numpy.array(random.sample(xrange(len(individuals)), len(individuals)), dtype=numpy.intp)
+    indices_2 = numpy.array(random.sample(xrange(len(individuals)), len(individuals)), dtype=numpy.intp)
 
-        if random.random() <= 0.5:
-            return ind1
-        return ind2
+    # Contestants of every tournament, in the order they are chosen
+    i = numpy.arange(0, k, 4)
+    first = numpy.column_stack((indices_1[i], indices_1[i+2], indices_2[i], indices_2[i+2])).ravel()
+    second = numpy.column_stack((indices_1[i+1], indices_1[i+3], indices_2[i+1], indices_2[i+3])).ravel()
 
-    individuals_1 = random.sample(individuals, len(individuals))
-    individuals_2 = random.sample(individuals, len(individuals))
+    wfirst, wsecond = wvalues[first], wvalues[second]
+    first_dom = numpy.all(wfirst >= wsecond, axis=1) & numpy.any(wfirst > wsecond, axis=1)
+    second_dom = numpy.all(wsecond >= wfirst, axis=1) & numpy.any(wsecond > wfirst, axis=1)
+    dfirst, dsecond = crowding_dist[first], crowding_dist[second]
 
-    chosen = []
-    for i in xrange(0, k, 4):
-        chosen.append(tourn(individuals_1[i],   individuals_1[i+1]))
-        chosen.append(tourn(individuals_1[i+2], individuals_1[i+3]))
-        chosen.append(tourn(individuals_2[i],   individuals_2[i+1]))
-        chosen.append(tourn(individuals_2[i+2], individuals_2[i+3]))
+    winners = numpy.where(first_dom, first,
+              numpy.where(second_dom, second,
+              numpy.where(dfirst > dsecond, first,
+              numpy.where(dfirst < dsecond, second, -1))))
 
-    return chosen
+    # Remaining ties are broken at random, in tournament order
+    for j in numpy.flatnonzero(winners == -1):
+        winners[j] = first[j] if random.random() <= 0.5 else second[j]
+
+    return [individuals[j] for j in winners]
 
 #######################################
 # Generalized Reduced runtime ND sort #
@@ -440,6 +506,89 @@ def sweepB(best, worst, front):
             fstair = max(fstairs[:idx], key=front.__getitem__)
             front[h] = max(front[h], front[fstair]+1)
 
+#######################################
+# Array based ND sort                 #
+#######################################
+
+ND_BLOCK_SIZE = 2 ** 22
+"""Maximum number of objective comparisons made at once by
+:func:`sortArrayNondominated`, it bounds the memory used by each block of
+the domination computation."""
+
+def sortArrayNondominated(individuals, k, first_front_only=False):
+    """Sort the first *k* *individuals* into different nondomination levels
+    using the same "Fast Nondominated Sorting Approach" as
+    :func:`sortNondominated`, see [Deb2002]_. The weighted fitnesses are
+    extracted once into a contiguous array and the domination relation is
+    computed using vectorized comparisons on blocks of rows, the size of
+    each block being bounded by :data:`ND_BLOCK_SIZE` comparisons. The
+    relation itself is kept as a bit matrix. The time complexity is still
+    :math:`O(MN^2)`, but most of the work is done by numpy, which makes this
+    function much faster than :func:`sortNondominated` on large
+    populations.
+
+    :param individuals: A list of individuals to select from.
+    :param k: The number of individuals to select.
+    :param first_front_only: If :obj:`True` sort only the first front and
+                             exit.
+    :returns: A list of Pareto fronts (lists), the first list includes
+              nondominated individuals.
+    """
+    if k == 0:
+        return []
+    if len(individuals) == 0:
+        return [[]]
+
+    # Group the individuals sharing the same fitness, keeping the unique
+    # fitnesses in order of first appearance
+    wvalues = numpy.array([ind.fitness.wvalues for ind in individuals],
+                          dtype=numpy.float64)
+    fits, first, inverse = numpy.unique(wvalues, axis=0, return_index=True,
+                                        return_inverse=True)
+    order = numpy.argsort(first, kind="mergesort")
+    fits = fits[order]
+    position = numpy.empty_like(order)
+    position[order] = numpy.arange(len(order))
+    map_fit_ind = [[] for _ in xrange(len(fits))]
+    for ind, i in zip(individuals, position[inverse.ravel()]):
+        map_fit_ind[i].append(ind)
+
+    nfits, nobj = fits.shape
+
+    # Compute the domination relation by blocks of rows, row i of the bit
+    # matrix tells which fitnesses are dominated by fitness i
+    block = max(1, ND_BLOCK_SIZE // (nfits * nobj))
+    dominated_fits = numpy.empty((nfits, (nfits + 7) // 8), dtype=numpy.uint8)
+    dominating_fits = numpy.zeros(nfits, dtype=numpy.intp)
+    for start in xrange(0, nfits, block):
+        fits_block = fits[start:start+block, numpy.newaxis, :]
+        dom = numpy.all(fits_block >= fits, axis=2)
+        dom &= numpy.any(fits_block > fits, axis=2)
+        dominating_fits += dom.sum(axis=0, dtype=numpy.intp)
+        dominated_fits[start:start+block] = numpy.packbits(dom, axis=1)
+
+    current_front = numpy.flatnonzero(dominating_fits == 0)
+    fronts = [list(chain.from_iterable(map_fit_ind[i] for i in current_front))]
+    pareto_sorted = len(fronts[-1])
+
+    # Rank the next front until all individuals are sorted or
+    # the given number of individual are sorted.
+    if not first_front_only:
+        N = min(len(individuals), k)
+        block = max(1, ND_BLOCK_SIZE // nfits)
+        while pareto_sorted < N:
+            # Sorted fitnesses must never be considered again
+            dominating_fits[current_front] = -1
+            for start in xrange(0, len(current_front), block):
+                rows = dominated_fits[current_front[start:start+block]]
+                dom = numpy.unpackbits(rows, axis=1)[:, :nfits]
+                dominating_fits -= dom.sum(axis=0, dtype=numpy.intp)
+            current_front = numpy.flatnonzero(dominating_fits == 0)
+            fronts.append(list(chain.from_iterable(map_fit_ind[i] for i in current_front)))
+            pareto_sorted += len(fronts[-1])
+
+    return fronts
+
 ######################################
 # Non-Dominated Sorting  (NSGA-III)  #
 ######################################
@@ -490,7 +639,8 @@ def selNSGA3(individuals, k, ref_points, nd="log", best_point=None,
     :param individuals: A list of individuals to select from.
     :param k: The number of individuals to select.
     :param ref_points: Reference points to use for niching.
-    :param nd: Specify the non-dominated algorithm to use: 'standard' or 'log'.
+    :param nd: Specify the non-dominated algorithm to use: 'standard', 'log'
+               or 'array'.
     :param best_point: Best point found at previous generation. If not provided
         find the best point only from current individuals.
     :param worst_point: Worst point found at previous generation. If not provided
@@ -519,6 +669,8 @@ def selNSGA3(individuals, k, ref_points, nd="log", best_point=None,
         pareto_fronts = sortNondominated(individuals, k)
     elif nd == "log":
         pareto_fronts = sortLogNondominated(individuals, k)
+    elif nd == "array":
+        pareto_fronts = sortArrayNondominated(individuals, k)
     else:
         raise Exception("selNSGA3: The choice of non-dominated sorting "
                         "method '{0}' is invalid.".format(nd))
@@ -840,4 +992,4 @@ def _partition(array, begin, end):
 
 
 __all__ = ['selNSGA2', 'selNSGA3', 'selNSGA3WithMemory', 'selSPEA2', 'sortNondominated', 'sortLogNondominated',
-           'selTournamentDCD', 'uniform_reference_points']
+           'sortArrayNondominated', 'arrayCrowdingDist', 'selTournamentDCD', 'uniform_reference_points']
@@ -23,28 +23,52 @@ except ImportError:
     # fallback on python version
     from ._hypervolume import pyhv as hv
 
+from ._hypervolume.pyhv import contributions_approximation
+
 def hypervolume(front, **kargs):
     """Returns the index of the individual with the least the hypervolume
     contribution. The provided *front* should be a set of non-dominated
-    individuals having each a :attr:`fitness` attribute.
+    individuals having each a :attr:`fitness` attribute. When a number of
+    *samples* is given, the contributions are estimated by Monte Carlo
+    sampling, see :func:`hypervolume_contributions`.
+    """
+    contrib_values = hypervolume_contributions(front, kargs.get("ref", None),
+                                               kargs.get("samples", None),
+                                               kargs.get("seed", None))
+
+    # Select the minimum contribution value
+    return numpy.argmin(contrib_values)
+
+def hypervolume_contributions(front, ref=None, samples=None, seed=None):
+    """Returns the exclusive hypervolume contribution of every individual of
+    the *front*, that is the hypervolume of the front minus the hypervolume
+    of the front without that individual. All contributions are computed in
+    a single call using sweep algorithms for two and three objectives and a
+    dimension-sweep for more objectives. If the *ref* point is not given,
+    the worst value for each objective +1 is used.
+
+    The exact computation grows exponentially with the number of objectives.
+    When *samples* is given, the contributions are instead estimated from
+    that many points sampled uniformly in the bounding box of the front, a
+    sample dominated by a single individual being credited to it.
+
+    :param front: A list of individuals having each a :attr:`fitness`
+                  attribute.
+    :param ref: A point of the same dimensionality as the individuals in
+                *front*, optional.
+    :param samples: The number of Monte Carlo samples, optional.
+    :param seed: The seed of the sampling, optional.
+    :returns: An array of the contribution of each individual.
     """
     # Must use wvalues * -1 since hypervolume use implicit minimization
     # And minimization in deap use max on -obj
     wobj = numpy.array([ind.fitness.wvalues for ind in front]) * -1
-    ref = kargs.get("ref", None)
     if ref is None:
         ref = numpy.max(wobj, axis=0) + 1
 
-    def contribution(i):
-        # The contribution of point p_i in point set P
-        # is the hypervolume of P without p_i
-        return hv.hypervolume(numpy.concatenate((wobj[:i], wobj[i+1:])), ref)
-
-    # Parallelization note: Cannot pickle local function
-    contrib_values = map(contribution, range(len(front)))
-
-    # Select the maximum hypervolume value (correspond to the minimum difference)
-    return numpy.argmax(contrib_values)
+    if samples is not None:
+        return numpy.array(contributions_approximation(wobj, ref, samples, seed))
+    return numpy.array(hv.contributions(wobj, ref))
 
 def additive_epsilon(front, **kargs):
     """Returns the index of the individual with the least the additive epsilon
@@ -91,4 +115,4 @@ def multiplicative_epsilon(front, **kargs):
 
 
 
-__all__ = ["hypervolume", "additive_epsilon", "multiplicative_epsilon"]
\ No newline at end of file
+__all__ = ["hypervolume", "hypervolume_contributions", "additive_epsilon", "multiplicative_epsilon"]
\ No newline at end of file
@@ -2,6 +2,7 @@ from __future__ import division
 import random
 import numpy as np
 
+from bisect import bisect_right
 from functools import partial
 from operator import attrgetter
 
@@ -68,6 +69,49 @@ def selTournament(individuals, k, tournsize, fit_attr="fitness"):
         chosen.append(max(aspirants, key=attrgetter(fit_attr)))
     return chosen
 
+def _fitnessRanks(individuals, fit_attr="fitness"):
+    """Return an array of the rank of each individual of *individuals*, the
+    better the fitness the higher the rank. The weighted values are compared
+    lexicographically and equal fitnesses share the same rank.
+    """
+    return _wvaluesRanks(np.array([getattr(ind, fit_attr).wvalues for ind in individuals]))
+
+def _wvaluesRanks(wvalues):
+    """Return an array of the rank of each row of the 2-D array of weighted
+    values *wvalues*, as :func:`_fitnessRanks` does.
+    """
+    if wvalues.shape[1] == 1:
+        return wvalues[:, 0]
+    order = np.lexsort(wvalues.T[::-1])
+    sorted_ = wvalues[order]
+    ranks = np.empty(len(wvalues), dtype=np.intp)
+    ranks[order] = np.concatenate(([0], np.cumsum(np.any(sorted_[1:] != sorted_[:-1], axis=1))))
+    return ranks
+
+def selTournamentVectorized(individuals, k, tournsize, fit_attr="fitness"):
+    """Select the best individual among *tournsize* randomly chosen
+    individuals, *k* times, as :func:`selTournament` does. The weighted
+    fitnesses are gathered once in an array and all the tournaments are
+    resolved at once, which is much faster on large populations. The list
+    returned contains references to the input *individuals*.
+
+    :param individuals: A list of individuals to select from.
+    :param k: The number of individuals to select.
+    :param tournsize: The number of individuals participating in each tournament.
+    :param fit_attr: The attribute of individuals to use as selection criterion
+    :returns: A list of selected individuals.
+
+    As for :func:`selTournament`, the fitnesses are compared lexicographically
+    and the first aspirant drawn wins among equally fit aspirants.
+
+    This function uses the :func:`~numpy.random.randint` function from the
+    :mod:`numpy.random` module.
+    """
+    ranks = _fitnessRanks(individuals, fit_attr)
+    aspirants = np.random.randint(0, len(individuals), (k, tournsize))
+    winners = aspirants[np.arange(k), np.argmax(ranks[aspirants], axis=1)]
+    return [individuals[i] for i in winners]
+
 def selRoulette(individuals, k, fit_attr="fitness"):
     """Select *k* individuals from the input *individuals* using *k*
     spins of a roulette. The selection is made by looking only at the first
@@ -89,18 +133,91 @@ def selRoulette(individuals, k, fit_attr="fitness"):
 
     s_inds = sorted(individuals, key=attrgetter(fit_attr), reverse=True)
     sum_fits = sum(getattr(ind, fit_attr).values[0] for ind in individuals)
+    cumfits = _cumulativeFitness(s_inds, fit_attr)
+    last = len(s_inds) - 1
     chosen = []
     for i in xrange(k):
         u = random.random() * sum_fits
-        sum_ = 0
-        for ind in s_inds:
-            sum_ += getattr(ind, fit_attr).values[0]
-            if sum_ > u:
-                chosen.append(ind)
-                break
+        chosen.append(s_inds[min(bisect_right(cumfits, u), last)])
 
     return chosen
 
+def _cumulativeFitness(individuals, fit_attr="fitness"):
+    """Return the running sums of the first objective of *individuals*."""
+    cumfits = []
+    sum_ = 0
+    for ind in individuals:
+        sum_ += getattr(ind, fit_attr).values[0]
+        cumfits.append(sum_)
+    return cumfits
+
+
+class AliasTable(object):
+    """Walker's alias table of the input *individuals* to spin a roulette,
+    as :func:`selRoulette` does, many times on the same population. Building
+    the table is linear in the number of individuals, then each spin costs
+    a single random number and a constant time lookup.
+
+    :param individuals: A list of individuals to select from.
+    :param fit_attr: The attribute of individuals to use as selection criterion
+
+    The table does not follow the later changes of the fitnesses, it must be
+    rebuilt when the population is modified. ::
+
+        >>> table = AliasTable(population)        # doctest: +SKIP
+        >>> parents = table.select(10000)         # doctest: +SKIP
+
+    This class uses the :func:`~random.random` function from the python base
+    :mod:`random` module.
+
+    .. warning::
+       The roulette selection by definition cannot be used for minimization
+       or when the fitness can be smaller or equal to 0.
+    """
+    def __init__(self, individuals, fit_attr="fitness"):
+        self.individuals = list(individuals)
+        n = len(self.individuals)
+        fits = [getattr(ind, fit_attr).values[0] for ind in self.individuals]
+        sum_fits = sum(fits)
+
+        self.prob = [fit * n / sum_fits for fit in fits]
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(self.prob) if p < 1.0]
+        large = [i for i, p in enumerate(self.prob) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.alias[s] = l
+            self.prob[l] -= 1.0 - self.prob[s]
+            if self.prob[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+
+        # What remains is full, up to rounding errors
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def __len__(self):
+        return len(self.individuals)
+
+    def select(self, k):
+        """Select *k* individuals by spinning the roulette *k* times. The
+        list returned contains references to the individuals of the table.
+
+        :param k: The number of individuals to select.
+        :returns: A list of selected individuals.
+        """
+        n = len(self.individuals)
+        chosen = []
+        for i in xrange(k):
+            u = random.random() * n
+            j = int(u)
+            if u - j < self.prob[j]:
+                chosen.append(self.individuals[j])
+            else:
+                chosen.append(self.individuals[self.alias[j]])
+        return chosen
+
 
 def selDoubleTournament(individuals, k, fitness_size, parsimony_size, fitness_first, fit_attr="fitness"):
     """Tournament selection which use the size of the individuals in order
@@ -198,53 +315,73 @@ def selStochasticUniversalSampling(individuals, k, fit_attr="fitness"):
 
     distance = sum_fits / float(k)
     start = random.uniform(0, distance)
-    points = [start + i*distance for i in xrange(k)]
+    points = start + np.arange(k) * distance
 
-    chosen = []
-    for p in points:
-        i = 0
-        sum_ = getattr(s_inds[i], fit_attr).values[0]
-        while sum_ < p:
-            i += 1
-            sum_ += getattr(s_inds[i], fit_attr).values[0]
-        chosen.append(s_inds[i])
+    indices = np.searchsorted(_cumulativeFitness(s_inds, fit_attr), points)
+    return [s_inds[i] for i in np.minimum(indices, len(s_inds) - 1)]
 
-    return chosen
+def _lexicase(individuals, k, epsilon=None, downsample=None):
+    """Lexicase selection engine shared by the lexicase selections. The
+    fitness values are gathered once in an error matrix with one row per
+    individual and one column per case, negated for the maximized cases.
+    *epsilon* is either None or a function returning the tolerance of each
+    case given that matrix.
+    """
+    fit_weights = np.array(individuals[0].fitness.weights)
+    errors = np.array([ind.fitness.values for ind in individuals], dtype=np.float64)
+    errors *= np.where(fit_weights > 0, -1.0, 1.0)
 
-def selLexicase(individuals, k):
+    cases = list(range(errors.shape[1]))
+    if downsample is not None:
+        cases = sorted(random.sample(cases, max(1, int(round(downsample * len(cases))))))
+
+    if epsilon is None:
+        tolerances = np.zeros(errors.shape[1])
+    else:
+        tolerances = epsilon(errors)
+    thresholds = errors.min(axis=0) + tolerances
+
+    # The first case filters the whole population, its survivors are
+    # computed once per case
+    survivors = {}
+    selected_individuals = []
+    for i in xrange(k):
+        order = list(cases)
+        random.shuffle(order)
+
+        candidates = None
+        for case in order:
+            if candidates is None:
+                if case not in survivors:
+                    survivors[case] = np.flatnonzero(errors[:, case] <= thresholds[case])
+                candidates = survivors[case]
+            else:
+                column = errors[candidates, case]
+                candidates = candidates[column <= column.min() + tolerances[case]]
+            if len(candidates) == 1:
+                break
+
+        if candidates is None:
+            candidates = range(len(individuals))
+        selected_individuals.append(individuals[random.choice(candidates)])
+
+    return selected_individuals
+
+def selLexicase(individuals, k, downsample=None):
     """Returns an individual that does the best on the fitness cases when
     considered one at a time in random order.
     http://faculty.hampshire.edu/lspector/pubs/lexicase-IEEE-TEC.pdf
 
     :param individuals: A list of individuals to select from.
     :param k: The number of individuals to select.
+    :param downsample: The fraction of the fitness cases, drawn at random
+                       once per call, used for all the selections, optional.
     :returns: A list of selected individuals.
     """
-    selected_individuals = []
-
-    for i in range(k):
-        fit_weights = individuals[0].fitness.weights
-
-        candidates = individuals
-        cases = list(range(len(individuals[0].fitness.values)))
-        random.shuffle(cases)
-
-        while len(cases) > 0 and len(candidates) > 1:
-            f = min
-            if fit_weights[cases[0]] > 0:
-                f = max
-
-            best_val_for_case = f(map(lambda x: x.fitness.values[cases[0]], candidates))
-
-            candidates = list(filter(lambda x: x.fitness.values[cases[0]] == best_val_for_case, candidates))
-            cases.pop(0)
-
-        selected_individuals.append(random.choice(candidates))
-
-    return selected_individuals
+    return _lexicase(individuals, k, downsample=downsample)
 
 
-def selEpsilonLexicase(individuals, k, epsilon):
+def selEpsilonLexicase(individuals, k, epsilon, downsample=None):
     """
     Returns an individual that does the best on the fitness cases when
     considered one at a time in random order. Requires a epsilon parameter.
@@ -253,74 +390,37 @@ def selEpsilonLexicase(individuals, k, epsilon):
 
     :param individuals: A list of individuals to select from.
     :param k: The number of individuals to select.
+    :param epsilon: The tolerance on the best value of each case.
+    :param downsample: The fraction of the fitness cases, drawn at random
+                       once per call, used for all the selections, optional.
     :returns: A list of selected individuals.
     """
-    selected_individuals = []
-
-    for i in range(k):
-        fit_weights = individuals[0].fitness.weights
-
-        candidates = individuals
-        cases = list(range(len(individuals[0].fitness.values)))
-        random.shuffle(cases)
-
-        while len(cases) > 0 and len(candidates) > 1:
-            if fit_weights[cases[0]] > 0:
-                best_val_for_case = max(map(lambda x: x.fitness.values[cases[0]], candidates))
-                min_val_to_survive_case = best_val_for_case - epsilon
-                candidates = list(filter(lambda x: x.fitness.values[cases[0]] >= min_val_to_survive_case, candidates))
-            else :
-                best_val_for_case = min(map(lambda x: x.fitness.values[cases[0]], candidates))
-                max_val_to_survive_case = best_val_for_case + epsilon
-                candidates = list(filter(lambda x: x.fitness.values[cases[0]] <= max_val_to_survive_case, candidates))
-
-            cases.pop(0)
-
-        selected_individuals.append(random.choice(candidates))
-
-    return selected_individuals
+    return _lexicase(individuals, k, lambda errors: np.full(errors.shape[1], epsilon),
+                     downsample)
 
-def selAutomaticEpsilonLexicase(individuals, k):
+def selAutomaticEpsilonLexicase(individuals, k, downsample=None):
     """
     Returns an individual that does the best on the fitness cases when considered one at a
     time in random order.
     https://push-language.hampshire.edu/uploads/default/original/1X/35c30e47ef6323a0a949402914453f277fb1b5b0.pdf
     Implemented lambda_epsilon_y implementation.
 
+    The tolerance of each case is the median absolute deviation of its
+    values over the whole *individuals*, computed once per call.
+
     :param individuals: A list of individuals to select from.
     :param k: The number of individuals to select.
+    :param downsample: The fraction of the fitness cases, drawn at random
+                       once per call, used for all the selections, optional.
     :returns: A list of selected individuals.
     """
-    selected_individuals = []
-
-    for i in range(k):
-        fit_weights = individuals[0].fitness.weights
-
-        candidates = individuals
-        cases = list(range(len(individuals[0].fitness.values)))
-        random.shuffle(cases)
-
-        while len(cases) > 0 and len(candidates) > 1:
-            errors_for_this_case = [x.fitness.values[cases[0]] for x in candidates]
-            median_val = np.median(errors_for_this_case)
-            median_absolute_deviation = np.median([abs(x - median_val) for x in errors_for_this_case])
-            if fit_weights[cases[0]] > 0:
-                best_val_for_case = max(errors_for_this_case)
-                min_val_to_survive = best_val_for_case - median_absolute_deviation
-                candidates = list(filter(lambda x: x.fitness.values[cases[0]] >= min_val_to_survive, candidates))
-            else :
-                best_val_for_case = min(errors_for_this_case)
-                max_val_to_survive = best_val_for_case + median_absolute_deviation
-                candidates = list(filter(lambda x: x.fitness.values[cases[0]] <= max_val_to_survive, candidates))
-
-            cases.pop(0)
-
-        selected_individuals.append(random.choice(candidates))
-
-    return selected_individuals
+    def mad(errors):
+        return np.median(np.abs(errors - np.median(errors, axis=0)), axis=0)
+    return _lexicase(individuals, k, mad, downsample)
 
 
-__all__ = ['selRandom', 'selBest', 'selWorst', 'selRoulette',
-           'selTournament', 'selDoubleTournament', 'selStochasticUniversalSampling',
+__all__ = ['selRandom', 'selBest', 'selWorst', 'selRoulette', 'AliasTable',
+           'selTournament', 'selTournamentVectorized', 'selDoubleTournament',
+           'selStochasticUniversalSampling',
            'selLexicase', 'selEpsilonLexicase', 'selAutomaticEpsilonLexicase']
 
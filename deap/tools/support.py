@@ -5,13 +5,27 @@ try:
 except ImportError:
     import pickle
 
-from bisect import bisect_right
-from collections import defaultdict
+import array
+import gzip
+import math
+import os
+import random
+import time
+
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, OrderedDict
 from copy import deepcopy
 from functools import partial
 from itertools import chain
 from operator import eq
 
+try:
+    import numpy
+except ImportError:
+    numpy = False
+
+from .emo import arrayCrowdingDist, sortLogNondominated
+
 
 def identity(obj):
     """Returns directly the argument *obj*.
@@ -588,6 +602,96 @@ class HallOfFame(object):
         return str(self.items)
 
 
+class IndexedHallOfFame(HallOfFame):
+    """Hall of fame keeping the same individuals as :class:`HallOfFame`,
+    indexed for large sizes. The weighted fitness values are kept sorted
+    beside the fitnesses, an individual that is not better than the worst of
+    a full hall of fame is rejected on them without being copied nor
+    compared to the members, and the duplicates can be looked up by
+    genotype.
+
+    :param maxsize: The maximum number of individual to keep in the hall of
+                    fame.
+    :param similar: An equivalence operator between two individuals, optional.
+                    It defaults to operator :func:`operator.eq`.
+    :param key: A function returning a hashable representation of the
+                genotype of an individual, optional. When provided, an
+                individual is compared with *similar* only to the members
+                having the same key, :func:`tuple` is suited for list
+                individuals and :func:`str` for
+                :class:`~deap.gp.PrimitiveTree`. Otherwise it is compared to
+                every member, as in :class:`HallOfFame`.
+
+    The key must agree with *similar*, that is similar individuals must have
+    equal keys.
+    """
+    def __init__(self, maxsize, similar=eq, key=None):
+        HallOfFame.__init__(self, maxsize, similar)
+        self.key = key
+        self.wvalues = list()
+        self.index = defaultdict(list)
+
+    def update(self, population):
+        """Update the hall of fame with the *population* by replacing the
+        worst individuals in it by the best individuals present in
+        *population* (if they are better). The size of the hall of fame is
+        kept constant.
+
+        :param population: A list of individual with a fitness attribute to
+                           update the hall of fame with.
+        """
+        for ind in population:
+            if len(self) >= self.maxsize:
+                if self.maxsize == 0 or ind.fitness.wvalues <= self.wvalues[0]:
+                    continue
+            if self.key is None:
+                members = self.items
+            else:
+                members = self.index.get(self.key(ind), ())
+            if not any(self.similar(ind, hofer) for hofer in members):
+                if len(self) >= self.maxsize:
+                    self.remove(-1)
+                self.insert(ind)
+
+    def insert(self, item):
+        """Insert a new individual in the hall of fame using the
+        :func:`~bisect.bisect_right` function on the weighted fitness values,
+        as :meth:`HallOfFame.insert` does. This method **does not** check for
+        the size of the hall of fame.
+
+        :param item: The individual with a fitness attribute to insert in the
+                     hall of fame.
+        """
+        item = deepcopy(item)
+        i = bisect_right(self.wvalues, item.fitness.wvalues)
+        self.items.insert(len(self) - i, item)
+        self.keys.insert(i, item.fitness)
+        self.wvalues.insert(i, item.fitness.wvalues)
+        if self.key is not None:
+            self.index[self.key(item)].append(item)
+
+    def remove(self, index):
+        """Remove the specified *index* from the hall of fame.
+
+        :param index: An integer giving which item to remove.
+        """
+        item = self.items[index]
+        del self.wvalues[len(self) - (index % len(self) + 1)]
+        HallOfFame.remove(self, index)
+        if self.key is not None:
+            k = self.key(item)
+            bucket = self.index[k]
+            del bucket[next(i for i, hofer in enumerate(bucket) if hofer is item)]
+            if not bucket:
+                del self.index[k]
+
+    def clear(self):
+        """Clear the hall of fame."""
+        HallOfFame.clear(self)
+        del self.wvalues[:]
+        self.index.clear()
+
+
 class ParetoFront(HallOfFame):
     """The Pareto front hall of fame contains all the non-dominated individuals
     that ever lived in the population. That means that the Pareto front hall of
@@ -639,7 +743,596 @@ class ParetoFront(HallOfFame):
             if not is_dominated and not has_twin:
                 self.insert(ind)
 
-__all__ = ['HallOfFame', 'ParetoFront', 'History', 'Statistics', 'MultiStatistics', 'Logbook']
+def _dominates(wvalues1, wvalues2):
+    """Return whether the weighted values *wvalues1* dominate *wvalues2*."""
+    not_equal = False
+    for self_wvalue, other_wvalue in zip(wvalues1, wvalues2):
+        if self_wvalue > other_wvalue:
+            not_equal = True
+        elif self_wvalue < other_wvalue:
+            return False
+    return not_equal
+
+class _NDNode(object):
+    """Node of an :class:`_NDTree`, a leaf holds individuals and an internal
+    node holds children. The ideal and nadir points are the component-wise
+    maximum and minimum of the weighted values below the node.
+    """
+    def __init__(self, points=None, children=None):
+        self.points = points
+        self.children = children
+        self.bound()
+
+    def bound(self):
+        if self.children is None:
+            wvalues = [item.fitness.wvalues for item in self.points]
+            self.ideal = tuple(map(max, zip(*wvalues)))
+            self.nadir = tuple(map(min, zip(*wvalues)))
+        else:
+            self.ideal = tuple(map(max, zip(*(child.ideal for child in self.children))))
+            self.nadir = tuple(map(min, zip(*(child.nadir for child in self.children))))
+
+    def extend(self, wvalues):
+        self.ideal = tuple(map(max, self.ideal, wvalues))
+        self.nadir = tuple(map(min, self.nadir, wvalues))
+
+    def distance(self, wvalues):
+        """Squared distance from *wvalues* to the middle of the node."""
+        return sum((v - (i + n) / 2) ** 2 for v, i, n in zip(wvalues, self.ideal, self.nadir))
+
+    def empty(self):
+        return not (self.points if self.children is None else self.children)
+
+    def collapse(self):
+        """Take the place of the single child of the node, if any."""
+        if self.children is not None and len(self.children) == 1:
+            child = self.children[0]
+            self.points, self.children = child.points, child.children
+
+    def iterPoints(self):
+        if self.children is None:
+            return iter(self.points)
+        return chain.from_iterable(child.iterPoints() for child in self.children)
+
+class _NDTree(object):
+    """ND-tree of mutually non-dominated individuals, after Jaszkiewicz and
+    Lust (2018). The ideal and nadir points of the nodes prune the branches
+    that cannot dominate, or be dominated by, a given point.
+    """
+    def __init__(self, leafsize=20):
+        self.leafsize = leafsize
+        self.root = None
+
+    def dominated(self, wvalues):
+        """Return whether an individual of the tree dominates *wvalues*."""
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            if any(i < v for i, v in zip(node.ideal, wvalues)):
+                # Each point below is worse than wvalues on an objective
+                continue
+            if node.nadir != wvalues and all(n >= v for n, v in zip(node.nadir, wvalues)):
+                return True
+            if node.children is None:
+                if any(_dominates(item.fitness.wvalues, wvalues) for item in node.points):
+                    return True
+            else:
+                stack.extend(node.children)
+        return False
+
+    def removeDominated(self, wvalues):
+        """Remove the individuals dominated by *wvalues* from the tree and
+        return them.
+        """
+        removed = []
+        if self.root is not None:
+            self._removeDominated(self.root, wvalues, removed)
+            if self.root.empty():
+                self.root = None
+        return removed
+
+    def _removeDominated(self, node, wvalues, removed):
+        if any(v < n for v, n in zip(wvalues, node.nadir)):
+            # Each point below is better than wvalues on an objective
+            return
+        if node.ideal != wvalues and all(v >= i for v, i in zip(wvalues, node.ideal)):
+            removed.extend(node.iterPoints())
+            node.points, node.children = [], None
+            return
+
+        count = len(removed)
+        if node.children is None:
+            kept = []
+            for item in node.points:
+                if _dominates(wvalues, item.fitness.wvalues):
+                    removed.append(item)
+                else:
+                    kept.append(item)
+            node.points = kept
+        else:
+            for child in node.children:
+                self._removeDominated(child, wvalues, removed)
+            node.children = [child for child in node.children if not child.empty()]
+            node.collapse()
+        if len(removed) > count and not node.empty():
+            node.bound()
+
+    def insert(self, item):
+        """Insert the individual *item*, which must not be dominated by the
+        individuals of the tree nor dominate any of them.
+        """
+        wvalues = item.fitness.wvalues
+        if self.root is None:
+            self.root = _NDNode([item])
+            return
+
+        node = self.root
+        while node.children is not None:
+            node.extend(wvalues)
+            node = min(node.children, key=lambda child: child.distance(wvalues))
+        node.points.append(item)
+        node.extend(wvalues)
+        if len(node.points) > self.leafsize:
+            self._split(node)
+
+    def _split(self, node):
+        # The seeds of the children are spread apart, starting with the point
+        # farthest on average from the others
+        wvalues = [item.fitness.wvalues for item in node.points]
+        def dist(i, j):
+            return math.sqrt(sum((a - b) ** 2 for a, b in zip(wvalues[i], wvalues[j])))
+
+        indices = range(len(wvalues))
+        seeds = [max(indices, key=lambda i: sum(dist(i, j) for j in indices))]
+        while len(seeds) < min(len(wvalues[0]) + 1, len(wvalues)):
+            seeds.append(max((i for i in indices if i not in seeds),
+                             key=lambda i: sum(dist(i, s) for s in seeds)))
+
+        children = [_NDNode([node.points[s]]) for s in seeds]
+        for i in indices:
+            if i not in seeds:
+                child = min(children, key=lambda child: child.distance(wvalues[i]))
+                child.points.append(node.points[i])
+                child.extend(wvalues[i])
+        node.points, node.children = None, children
+
+    def discard(self, item):
+        """Remove the individual *item* from the tree."""
+        if self.root is not None and self._discard(self.root, item, item.fitness.wvalues):
+            if self.root.empty():
+                self.root = None
+
+    def _discard(self, node, item, wvalues):
+        if any(v < n or v > i for v, n, i in zip(wvalues, node.nadir, node.ideal)):
+            return False
+        if node.children is None:
+            for i, point in enumerate(node.points):
+                if point is item:
+                    del node.points[i]
+                    break
+            else:
+                return False
+        else:
+            for i, child in enumerate(node.children):
+                if self._discard(child, item, wvalues):
+                    if child.empty():
+                        del node.children[i]
+                    break
+            else:
+                return False
+            node.collapse()
+        if not node.empty():
+            node.bound()
+        return True
+
+    def __iter__(self):
+        return self.root.iterPoints() if self.root is not None else iter(())
+
+
+class IndexedParetoFront(IndexedHallOfFame):
+    """Pareto front hall of fame keeping the same individuals as
+    :class:`ParetoFront`, indexed so that an individual is not compared to
+    every member of the front.
+
+    :param similar: A function that tells the Pareto front whether or not two
+                    individuals are similar, optional.
+    :param maxsize: The maximum number of individuals to keep in the front,
+                    optional. The front is unbounded by default.
+    :param leafsize: The maximum number of individuals in a leaf of the
+                     ND-tree, optional.
+
+    The update first keeps the non-dominated individuals of the whole
+    *population*, with :func:`sortLogNondominated`, and only those are
+    compared to the front. For two objectives, the members sorted on their
+    weighted values also have their second objective sorted in reverse
+    order, so the members dominating an individual or dominated by it are
+    found by bisection. For more objectives, the members are also stored in
+    an ND-tree [Jaszkiewicz2018]_ whose nodes bound the values below them.
+
+    When the front grows beyond *maxsize*, the member with the smallest
+    crowding distance (see :func:`arrayCrowdingDist`) is removed, one at a
+    time, until the size is back to *maxsize*. The individuals dominated by
+    a removed member may then enter the front again.
+
+    .. [Jaszkiewicz2018] Jaszkiewicz and Lust, "ND-Tree-Based Update: A Fast
+       Algorithm for the Dynamic Nondominance Problem", 2018.
+    """
+    def __init__(self, similar=eq, maxsize=None, leafsize=20):
+        IndexedHallOfFame.__init__(self, maxsize, similar)
+        self.tree = _NDTree(leafsize)
+
+    def update(self, population):
+        """Update the Pareto front hall of fame with the *population* by adding
+        the individuals from the population that are not dominated by the hall
+        of fame. If any individual in the hall of fame is dominated it is
+        removed.
+
+        :param population: A list of individual with a fitness attribute to
+                           update the hall of fame with.
+        """
+        if len(population) == 0:
+            return
+        if len(population[0].fitness.wvalues) > 1:
+            front = set(id(ind) for ind in sortLogNondominated(population, len(population), True))
+            population = [ind for ind in population if id(ind) in front]
+
+        for ind in population:
+            wvalues = ind.fitness.wvalues
+            if self._dominated(wvalues):
+                continue
+            self._removeDominated(wvalues)
+
+            n = len(self)
+            twins = xrange(bisect_left(self.wvalues, wvalues), bisect_right(self.wvalues, wvalues))
+            if not any(self.similar(ind, self.items[n - 1 - i]) for i in twins):
+                self.insert(ind)
+
+        if self.maxsize is not None:
+            while len(self) > self.maxsize:
+                self.remove(int(numpy.argmin(arrayCrowdingDist([self.items]))))
+
+    def _dominated(self, wvalues):
+        if len(wvalues) == 2:
+            i = bisect_left(self.wvalues, wvalues)
+            return i < len(self) and self.wvalues[i] != wvalues and self.wvalues[i][1] >= wvalues[1]
+        return self.tree.dominated(wvalues)
+
+    def _removeDominated(self, wvalues):
+        if len(wvalues) == 2:
+            # The members before wvalues with a second objective not better
+            # form a contiguous run
+            end = bisect_left(self.wvalues, wvalues)
+            begin = end
+            while begin > 0 and self.wvalues[begin - 1][1] <= wvalues[1]:
+                begin -= 1
+            n = len(self)
+            del self.keys[begin:end], self.wvalues[begin:end], self.items[n - end:n - begin]
+        else:
+            for item in self.tree.removeDominated(wvalues):
+                i = bisect_left(self.wvalues, item.fitness.wvalues)
+                while self.keys[i] is not item.fitness:
+                    i += 1
+                del self.keys[i], self.wvalues[i], self.items[len(self) - 1 - i]
+
+    def insert(self, item):
+        """Insert a new individual in the hall of fame, as
+        :meth:`HallOfFame.insert` does, and in the ND-tree for more than two
+        objectives. This method **does not** check for the dominance.
+
+        :param item: The individual with a fitness attribute to insert in the
+                     hall of fame.
+        """
+        IndexedHallOfFame.insert(self, item)
+        if len(item.fitness.wvalues) != 2:
+            i = bisect_right(self.wvalues, item.fitness.wvalues) - 1
+            self.tree.insert(self.items[len(self) - 1 - i])
+
+    def remove(self, index):
+        """Remove the specified *index* from the hall of fame.
+
+        :param index: An integer giving which item to remove.
+        """
+        item = self.items[index]
+        IndexedHallOfFame.remove(self, index)
+        if len(item.fitness.wvalues) != 2:
+            self.tree.discard(item)
+
+    def clear(self):
+        """Clear the hall of fame."""
+        IndexedHallOfFame.clear(self)
+        self.tree = _NDTree(self.tree.leafsize)
+
+class EvaluationCache(object):
+    """Cache of the fitness values of already evaluated genotypes. The cache
+    sits in front of the evaluation function, the individuals whose genotype
+    is found in the cache receive the stored fitness values and only the
+    others are evaluated. Identical individuals among those to evaluate are
+    evaluated a single time.
+
+    :param maxsize: The maximum number of genotypes kept in the cache, the
+                    least recently used are discarded first, optional. The
+                    cache is unbounded if not provided.
+    :param key: A function returning a hashable representation of the
+                genotype of an individual, optional. It defaults to
+                :func:`tuple`; :func:`str` is suited for
+                :class:`~deap.gp.PrimitiveTree`.
+
+    The cache is given to the algorithms through their *cache* argument. It
+    is only accessed from the calling process, the evaluations themselves
+    are dispatched with :meth:`toolbox.map`, so a parallel map may be used.
+    The numbers of cache :attr:`hits` and :attr:`misses` are accumulated
+    across calls. ::
+
+        >>> cache = EvaluationCache(maxsize=1000)
+        >>> cache.map(map, lambda ind: (sum(ind),), [[1, 2], [3], [1, 2]])
+        [(3,), (3,), (3,)]
+        >>> cache.hits, cache.misses
+        (1, 2)
+    """
+    def __init__(self, maxsize=None, key=tuple):
+        self.maxsize = maxsize
+        self.key = key
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def map(self, mapper, evaluate, individuals):
+        """Return the fitness values of the *individuals*, calling *mapper*
+        with *evaluate* and the individuals whose genotype is not in the cache
+        yet. The new values are stored in the cache.
+
+        :param mapper: A map function, usually :meth:`toolbox.map`.
+        :param evaluate: The evaluation function.
+        :param individuals: A list of individuals to evaluate.
+        :returns: A list of fitness values in the order of *individuals*.
+        """
+        keys = [self.key(ind) for ind in individuals]
+        missing = OrderedDict()
+        for k, ind in zip(keys, individuals):
+            if k in self.entries:
+                # Refresh the entry position in the LRU order
+                self.entries[k] = self.entries.pop(k)
+            elif k not in missing:
+                missing[k] = ind
+        self.misses += len(missing)
+        self.hits += len(individuals) - len(missing)
+
+        results = dict(zip(missing.iterkeys(), mapper(evaluate, missing.values())))
+        values = [results[k] if k in results else self.entries[k] for k in keys]
+
+        for k, value in results.iteritems():
+            self.entries[k] = value
+        if self.maxsize is not None:
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return values
+
+    def clear(self):
+        """Remove all the entries of the cache and reset its counters."""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+def _genotype(individual):
+    """Return a copy of *individual* as an instance of the first type in its
+    hierarchy that was not made by the :mod:`~deap.creator`, which does not
+    carry the fitness nor any other attribute of the individual.
+    """
+    for cls in type(individual).__mro__:
+        if cls.__module__ != "deap.creator":
+            break
+    if issubclass(cls, array.array):
+        return array.array(individual.typecode, individual)
+    elif numpy and issubclass(cls, numpy.ndarray):
+        return numpy.array(individual)
+    return cls(individual)
+
+def _mapChunk(func, chunk):
+    """Apply *func* on each tuple of arguments of the *chunk* and return the
+    results along with the time spent.
+    """
+    start = time.time()
+    results = [func(*args) for args in chunk]
+    return results, time.time() - start
+
+class ParallelEvaluator(object):
+    """Order preserving map that sends the items to a parallel *map* by
+    chunks. It is meant to be registered as the :meth:`toolbox.map` used by
+    the algorithms to evaluate the individuals. ::
+
+        pool = multiprocessing.Pool(processes=4)
+        toolbox.register("map", ParallelEvaluator(pool.map, workers=4))
+
+    Instead of the individuals, only their genotype is sent to the workers,
+    that is a copy of the individual without its fitness (an instance of
+    the base type given to the :mod:`~deap.creator`, such as a
+    :class:`list`, an :class:`array.array` or a :class:`numpy.ndarray`). The
+    function to apply is sent once per chunk instead of once per item.
+
+    :param map: The parallel map function, for example
+                :meth:`multiprocessing.Pool.map` or :func:`scoop.futures.map`,
+                optional. It defaults to the builtin :func:`map`.
+    :param workers: The number of workers used by *map*, optional.
+    :param chunksize: The number of items per chunk, optional. When not
+                      given, it is tuned from the observed evaluation time so
+                      that each chunk lasts about *chunktime* seconds while
+                      leaving work for every worker.
+    :param chunktime: The target duration of a chunk in seconds, optional.
+    :param genotype: A function returning the part of an individual sent to
+                     the workers, optional.
+
+    The attribute :attr:`latency` holds the estimated evaluation time of a
+    single item, in seconds.
+    """
+    def __init__(self, map=map, workers=1, chunksize=None, chunktime=0.05,
+                 genotype=_genotype):
+        self.map = map
+        self.workers = workers
+        self.chunksize = chunksize
+        self.chunktime = chunktime
+        self.genotype = genotype
+        self.latency = None
+
+    def __call__(self, func, *iterables):
+        """Return the list of the results of *func* applied on the items of
+        the *iterables*, in order. Items having a :attr:`fitness` attribute
+        are replaced by their genotype.
+        """
+        items = [tuple(self.genotype(arg) if hasattr(arg, "fitness") else arg
+                       for arg in args) for args in zip(*iterables)]
+        if len(items) == 0:
+            return []
+
+        size = self._chunkSize(len(items))
+        chunks = [items[i:i+size] for i in xrange(0, len(items), size)]
+        outputs = list(self.map(partial(_mapChunk, func), chunks))
+
+        elapsed = sum(duration for _, duration in outputs)
+        latency = elapsed / len(items)
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency = 0.5 * (self.latency + latency)
+
+        return list(chain.from_iterable(results for results, _ in outputs))
+
+    def _chunkSize(self, nitems):
+        if self.chunksize is not None:
+            return self.chunksize
+        # Give a few chunks to every worker to balance the load
+        balanced = int(math.ceil(nitems / (4 * self.workers)))
+        if self.latency is None or self.latency == 0.0:
+            return max(1, balanced)
+        return max(1, min(balanced, int(self.chunktime / self.latency)))
+
+    def evaluate(self, evaluate, individuals):
+        """Evaluate the *individuals* with *evaluate* and set the results
+        to their :attr:`fitness.values`.
+        """
+        for ind, fit in zip(individuals, self(evaluate, individuals)):
+            ind.fitness.values = fit
+
+class Checkpoint(object):
+    """Periodic checkpoint of the state of an evolution. When given to an
+    algorithm through its *checkpoint* argument, the population, the
+    logbook, the hall of fame, the evaluation cache and the states of the
+    :mod:`random` and :mod:`numpy.random` generators are saved to the file
+    at *path* every *freq* generations. Additional objects holding a state
+    of the evolution, such as a :class:`~deap.cma.Strategy`, can be given
+    as keyword arguments.
+
+    Calling the algorithm again with a checkpoint whose file exists resumes
+    the evolution from the last saved generation instead of starting it
+    anew. The objects given to the algorithm and to the checkpoint have
+    their state restored in place, so that the evolution continues exactly
+    as if it had not been interrupted. ::
+
+        checkpoint = Checkpoint("evolution.pkl.gz", freq=10, strategy=strategy)
+        pop, logbook = algorithms.eaGenerateUpdate(toolbox, ngen=250,
+                                                   halloffame=hof,
+                                                   checkpoint=checkpoint)
+
+    :param path: The path of the checkpoint file, it is compressed with
+                 :mod:`gzip` when it ends with ``.gz``.
+    :param freq: The number of generations between two checkpoints,
+                 optional.
+    :param objects: Named objects whose state is saved with the checkpoint,
+                    optional.
+
+    All the saved objects must be picklable, a hall of fame using a lambda
+    function as *similar* operator can not be checkpointed for example.
+    """
+    def __init__(self, path, freq=1, **objects):
+        self.path = path
+        self.freq = freq
+        self.objects = objects
+
+    def _open(self, path, mode):
+        if self.path.endswith(".gz"):
+            return gzip.open(path, mode)
+        return open(path, mode)
+
+    def save(self, generation, population, logbook, **objects):
+        """Save the state of the evolution at *generation* with the
+        *population*, the *logbook* and the named *objects* in addition to
+        those given at initialization. The file is replaced atomically, an
+        interruption while saving leaves the previous checkpoint intact.
+        """
+        objects = dict(self.objects, **objects)
+        state = dict(generation=generation, population=population,
+                     logbook=logbook, rndstate=random.getstate(),
+                     objects=dict((name, obj) for name, obj in objects.iteritems()
+                                  if obj is not None))
+        if numpy:
+            state["nprndstate"] = numpy.random.get_state()
+
+        tmp_path = self.path + ".tmp"
+        cp_file = self._open(tmp_path, "wb")
+        try:
+            pickle.dump(state, cp_file, pickle.HIGHEST_PROTOCOL)
+        finally:
+            cp_file.close()
+        if os.name == "nt" and os.path.exists(self.path):
+            os.remove(self.path)
+        os.rename(tmp_path, self.path)
+
+    def update(self, generation, population, logbook, **objects):
+        """Save the state of the evolution if *generation* is a multiple of
+        the checkpoint frequency, see :meth:`save`.
+        """
+        if generation % self.freq == 0:
+            self.save(generation, population, logbook, **objects)
+
+    def load(self):
+        """Return the dictionary saved in the checkpoint file, or
+        :data:`None` if the file does not exist.
+        """
+        if not os.path.exists(self.path):
+            return None
+        cp_file = self._open(self.path, "rb")
+        try:
+            return pickle.load(cp_file)
+        finally:
+            cp_file.close()
+
+    def restore(self, **objects):
+        """Restore the state saved in the checkpoint file, if any. The state
+        of the named *objects* and of those given at initialization is
+        replaced in place by the saved one and the random generators states
+        are restored. Returns the saved dictionary, its ``"generation"``,
+        ``"population"`` and ``"logbook"`` entries are left for the caller
+        to use, or :data:`None` if there is no checkpoint.
+
+        The state of an object is restored through its :attr:`__dict__`, a
+        :exc:`TypeError` is raised for the objects that have none, such as
+        the instances of classes defining :attr:`__slots__`.
+        """
+        state = self.load()
+        if state is None:
+            return None
+
+        objects = dict(self.objects, **objects)
+        restored = [(objects[name], saved) for name, saved in state["objects"].iteritems()
+                    if objects.get(name) is not None]
+        for obj, saved in restored:
+            if not hasattr(obj, "__dict__") or not hasattr(saved, "__dict__"):
+                raise TypeError("The state of %s can not be restored in place"
+                                " from a checkpoint, it has no __dict__."
+                                % type(obj).__name__)
+
+        for obj, saved in restored:
+            obj.__dict__.clear()
+            obj.__dict__.update(saved.__dict__)
+
+        random.setstate(state["rndstate"])
+        if numpy and "nprndstate" in state:
+            numpy.random.set_state(state["nprndstate"])
+        return state
+
+__all__ = ['HallOfFame', 'IndexedHallOfFame', 'ParetoFront', 'IndexedParetoFront', 'History', 'Statistics', 'MultiStatistics', 'Logbook', 'EvaluationCache', 'ParallelEvaluator', 'Checkpoint']
 
 if __name__ == "__main__":
     import doctest
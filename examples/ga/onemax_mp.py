@@ -56,7 +56,7 @@ if __name__ == "__main__":
     
     # Process Pool of 4 workers
     pool = multiprocessing.Pool(processes=4)
-    toolbox.register("map", pool.map)
+    toolbox.register("map", tools.ParallelEvaluator(pool.map, workers=4))
     
     pop = toolbox.population(n=300)
     hof = tools.HallOfFame(1)
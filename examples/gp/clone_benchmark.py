@@ -0,0 +1,61 @@
+#    This file is part of DEAP.
+#
+#    DEAP is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as
+#    published by the Free Software Foundation, either version 3 of
+#    the License, or (at your option) any later version.
+#
+#    DEAP is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public
+#    License along with DEAP. If not, see <http://www.gnu.org/licenses/>.
+
+"""Measure the time spent per generation in the variations of the symbolic
+regression example, cloning the trees with their dedicated copy, which
+shares the nodes and copies the fitness values, or with a generic deep copy
+of the whole individual. The static limits decorating the operators copy the
+parents with the dedicated copy in both cases.
+"""
+
+import copy
+import random
+import time
+
+from deap import algorithms
+
+from symbreg import toolbox
+
+def genericClone(individual):
+    # Copy made by the generic deepcopy protocol, as before the trees and
+    # their fitness had a dedicated copy
+    new = individual.__class__(individual)
+    new.__dict__.update(copy.deepcopy(individual.__dict__))
+    return new
+
+def timeVariations(clone, pop, ngen):
+    toolbox.register("clone", clone)
+    random.seed(64)
+    begin = time.time()
+    for _ in range(ngen):
+        offspring = algorithms.varAnd(pop, toolbox, cxpb=0.5, mutpb=0.1)
+        for ind in offspring:
+            ind.fitness.values = 0.0,
+    return (time.time() - begin) / ngen
+
+def main(n=1000, ngen=20):
+    random.seed(318)
+    pop = toolbox.population(n=n)
+    for ind in pop:
+        ind.fitness.values = 0.0,
+
+    generic = timeVariations(genericClone, pop, ngen)
+    dedicated = timeVariations(copy.deepcopy, pop, ngen)
+    print("Generic deep copy  : %.2f ms per generation" % (generic * 1000))
+    print("Dedicated tree copy: %.2f ms per generation" % (dedicated * 1000))
+    return generic, dedicated
+
+if __name__ == "__main__":
+    main()
@@ -54,7 +54,7 @@ toolbox = base.Toolbox()
 toolbox.register("expr", gp.genHalfAndHalf, pset=pset, min_=1, max_=2)
 toolbox.register("individual", tools.initIterate, creator.Individual, toolbox.expr)
 toolbox.register("population", tools.initRepeat, list, toolbox.individual)
-toolbox.register("compile", gp.compile, pset=pset)
+toolbox.register("compile", gp.interpret, pset=pset)
 
 samples = numpy.linspace(-1, 1, 10000)
 values = samples**4 + samples**3 + samples**2 + samples